@@ -26,6 +26,7 @@ class DevToolsLauncher(tk.Tk):
             ("Juntar Arquivos", "juntar_arquivos.py", "Utilitário para combinar múltiplos arquivos em um só para análise."),
             ("Removedor de Docstrings", "removedor_docstrings.py", "Remove docstrings de arquivos Python preservando strings SQL."),
             ("Limpar Citações (CLI)", "limpar_citacoes.py", "Ferramenta de linha de comando para limpar citações em textos (Executa no terminal)."),
+            ("Cofre de Backups (CLI)", "backup_vault.py", "Lista e restaura execuções inteiras das ferramentas a partir do cofre em logs/backups (Executa no terminal)."),
         ]
 
         self.canvas_frame = ttk.Frame(self)
@@ -0,0 +1,229 @@
+import argparse
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+import secrets
+import sys
+import tempfile
+import zlib
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+VAULT_DIR = os.path.join(PROJECT_ROOT, 'logs', 'backups')
+COMPRESSION_LEVEL = 6
+DEFAULT_KEEP_RUNS = 30
+
+
+def _objects_dir(vault_dir):
+    return os.path.join(vault_dir, 'objects')
+
+
+def _runs_dir(vault_dir):
+    return os.path.join(vault_dir, 'runs')
+
+
+def object_path(vault_dir, digest):
+    return os.path.join(_objects_dir(vault_dir), digest[:2], digest + '.zz')
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        with open(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+
+def store_file(vault_dir, path):
+    """Store the current bytes of ``path`` once (content-addressed, zlib) and return its manifest entry."""
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    target = object_path(vault_dir, digest)
+    if not os.path.exists(target):
+        _write_atomic(target, zlib.compress(data, COMPRESSION_LEVEL))
+    return {
+        'path': os.path.abspath(path),
+        'digest': digest,
+        'size': len(data),
+        'mode': stat.st_mode & 0o7777,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+
+def load_object(vault_dir, digest):
+    try:
+        with open(object_path(vault_dir, digest), 'rb') as f:
+            data = zlib.decompress(f.read())
+    except (OSError, zlib.error) as e:
+        raise ValueError(f'objeto ilegível no cofre: {digest} ({e})') from None
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise ValueError(f'objeto corrompido no cofre: {digest}')
+    return data
+
+
+class BackupRun:
+    """Manifest of one tool run; objects are written by whoever calls ``store_file``."""
+
+    def __init__(self, tool, vault_dir=VAULT_DIR, source=None):
+        now = datetime.datetime.now()
+        self.vault_dir = vault_dir
+        self.id = f"{now:%Y%m%d-%H%M%S}-{tool}-{secrets.token_hex(2)}"
+        self.tool = tool
+        self.source = source
+        self.created = now.isoformat()
+        self.entries = []
+
+    def add(self, entry):
+        self.entries.append(entry)
+
+    def close(self):
+        """Write the manifest; a run that changed nothing leaves no trace."""
+        if not self.entries:
+            return None
+        manifest = {
+            'id': self.id,
+            'tool': self.tool,
+            'source': self.source,
+            'created': self.created,
+            'files': self.entries,
+        }
+        path = os.path.join(_runs_dir(self.vault_dir), self.id + '.json')
+        _write_atomic(path, json.dumps(manifest, ensure_ascii=False, indent=1).encode('utf-8'))
+        return path
+
+
+def list_runs(vault_dir=VAULT_DIR):
+    """Manifests, newest first."""
+    try:
+        names = [name for name in os.listdir(_runs_dir(vault_dir)) if name.endswith('.json')]
+    except OSError:
+        return []
+    runs = []
+    for name in names:
+        with contextlib.suppress(OSError, ValueError), open(os.path.join(_runs_dir(vault_dir), name), encoding='utf-8') as f:
+            runs.append(json.load(f))
+    runs.sort(key=lambda manifest: (manifest['created'], manifest['id']), reverse=True)
+    return runs
+
+
+def load_run(run_id, vault_dir=VAULT_DIR):
+    path = os.path.join(_runs_dir(vault_dir), os.path.basename(run_id) + '.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except OSError:
+        raise ValueError(f'execução não encontrada no cofre: {run_id}') from None
+
+
+def restore_run(run_id, vault_dir=VAULT_DIR, dry_run=False):
+    """Put every file of ``run_id`` back as it was before that run.
+
+    Every object is loaded and verified before any file is touched, so a
+    missing or corrupt object aborts the restore with nothing changed. The
+    current contents are stored as a new 'restauracao' run as files are
+    replaced, so a restore (even one that fails midway) can be rolled back.
+    Returns (restored paths, new run id).
+    """
+    manifest = load_run(run_id, vault_dir)
+    # The first entry of a path holds its content from before the run.
+    originals = {}
+    for entry in manifest['files']:
+        originals.setdefault(entry['path'], entry)
+    if dry_run:
+        return list(originals), None
+
+    contents = {path: load_object(vault_dir, entry['digest']) for path, entry in originals.items()}
+    undo = BackupRun('restauracao', vault_dir, source=run_id)
+    restored = []
+    try:
+        for path, entry in originals.items():
+            if os.path.exists(path):
+                undo.add(store_file(vault_dir, path))
+            _restore_file(path, contents[path], entry)
+            restored.append(path)
+    finally:
+        undo.close()
+    return restored, undo.id if undo.entries else None
+
+
+def _restore_file(path, data, entry):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=directory)
+    try:
+        with open(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, entry['mode'])
+        os.utime(temp_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+
+def prune(vault_dir=VAULT_DIR, keep=DEFAULT_KEEP_RUNS):
+    """Drop all but the newest ``keep`` runs and the objects no remaining run uses."""
+    runs = list_runs(vault_dir)
+    for manifest in runs[keep:]:
+        with contextlib.suppress(OSError):
+            os.unlink(os.path.join(_runs_dir(vault_dir), manifest['id'] + '.json'))
+    referenced = {entry['digest'] for manifest in runs[:keep] for entry in manifest['files']}
+    removed = 0
+    for root, _dirs, files in os.walk(_objects_dir(vault_dir)):
+        for name in files:
+            if name.endswith('.zz') and name[:-3] not in referenced:
+                with contextlib.suppress(OSError):
+                    os.unlink(os.path.join(root, name))
+                    removed += 1
+    return max(0, len(runs) - keep), removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Cofre de backups das ferramentas DevTools.')
+    parser.add_argument('--cofre', default=VAULT_DIR, help='Diretório do cofre.')
+    sub = parser.add_subparsers(dest='comando')
+    sub.add_parser('listar', help='Lista as execuções guardadas (padrão).')
+    restaurar = sub.add_parser('restaurar', help='Desfaz uma execução inteira.')
+    restaurar.add_argument('execucao', help='Id da execução (veja "listar").')
+    restaurar.add_argument('--simular', action='store_true', help='Só mostra os arquivos que seriam restaurados.')
+    podar = sub.add_parser('podar', help='Apaga execuções antigas e objetos sem uso.')
+    podar.add_argument('--manter', type=int, default=DEFAULT_KEEP_RUNS, help='Quantas execuções recentes manter.')
+    args = parser.parse_args(argv)
+
+    if args.comando == 'restaurar':
+        try:
+            paths, undo_id = restore_run(args.execucao, args.cofre, dry_run=args.simular)
+        except (OSError, ValueError) as e:
+            print(f'Erro: {e}')
+            return 1
+        for path in paths:
+            print(('Seria restaurado: ' if args.simular else 'Restaurado: ') + path)
+        if undo_id:
+            print(f'Estado anterior guardado em: {undo_id}')
+        return 0
+    if args.comando == 'podar':
+        runs, objects = prune(args.cofre, args.manter)
+        print(f'Execuções removidas: {runs}, objetos removidos: {objects}')
+        return 0
+
+    runs = list_runs(args.cofre)
+    if not runs:
+        print('Nenhuma execução no cofre.')
+    for manifest in runs:
+        source = f" em {manifest['source']}" if manifest.get('source') else ''
+        print(f"{manifest['id']}  {manifest['tool']}  {len(manifest['files'])} arquivos{source}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
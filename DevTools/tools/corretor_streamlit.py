@@ -7,6 +7,8 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import backup_vault
+import file_engine
 import gui_utils
 
 '\nScript com GUI (TTK) para refatorar scripts Streamlit, \ncorrigindo avisos de depreciação (DeprecationWarning) do \'use_container_width\'.\n\nLógica de Substituição:\n- \'use_container_width=True\' é SUBSTITUÍDO por \'width="stretch"\'.\n- \'use_container_width=False\' é SUBSTITUÍDO por \'width="content"\'.\n'
@@ -147,71 +149,67 @@ class RefactorGUI(tk.Tk):
         self.logger.info("Iniciando varredura para correção do 'use_container_width'...")
         self.logger.info(f"Pastas ignoradas: {', '.join(EXCLUDE_DIRS)}")
         
-        arquivos_modificados = 0
-        arquivos_verificados = 0
+        tasks = []
+        seen = set()
+        matcher = file_engine.extension_matcher({'.py': True})
         
-        paths_to_process = self.selected_paths.copy()
-        
-        for path in paths_to_process:
+        for path in sorted(self.selected_paths):
             if os.path.isfile(path):
                 if path.endswith('.py'):
-                    self.logger.info(f"Verificando arquivo: {path}")
-                    arquivos_verificados += 1
-                    if self.processar_arquivo_thread(path):
-                        arquivos_modificados += 1
+                    found = [file_engine.FileTask(path, path)]
                 else:
                     self.logger.info(f"[IGNORADO] Não é um arquivo .py: {path}")
-                    
+                    continue
             elif os.path.isdir(path):
-                self.logger.info(f"--- Varrendo diretório recursivamente: {path} ---")
-                for dirpath, dirnames, filenames in os.walk(path, topdown=True):
-                    dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS]
-                    for filename in filenames:
-                        if filename.endswith('.py'):
-                            file_path = os.path.join(dirpath, filename)
-                            self.logger.info(f"Verificando arquivo: {file_path}")
-                            arquivos_verificados += 1
-                            if self.processar_arquivo_thread(file_path):
-                                arquivos_modificados += 1
-                self.logger.info(f"--- Fim da varredura: {path} ---")
+                found = list(file_engine.iter_files(path, matcher, EXCLUDE_DIRS, skip_hidden=False))
+                self.logger.info(f"--- Diretório {path}: {len(found)} arquivos .py ---")
+            else:
+                continue
+            for task in found:
+                if task.path not in seen:
+                    seen.add(task.path)
+                    tasks.append(task)
+        
+        backup_run = backup_vault.BackupRun('corretor_streamlit')
+        totals = file_engine.process_files(
+            tasks,
+            corrigir_arquivo_task,
+            on_result=self.log_result,
+            cache=file_engine.CleanCache('corretor_streamlit'),
+            backup_run=backup_run,
+        )
+        file_engine.log_cached(self.logger, totals)
+        file_engine.log_backup_run(self.logger, backup_run)
+        arquivos_modificados = totals.modified
         
         self.logger.info("--- Concluído ---")
-        self.logger.info(f"Arquivos .py verificados: {arquivos_verificados}")
+        self.logger.info(f"Arquivos .py verificados: {totals.done}")
         self.logger.info(f"Arquivos .py modificados: {arquivos_modificados}")
-        self.status_label.config(text=f'Concluído. Modificados: {arquivos_modificados}')
         
+        self.after(0, lambda: self.status_label.config(text=f'Concluído. Modificados: {arquivos_modificados}'))
         self.after(0, lambda: self.toggle_controls(True))
         self.after(0, lambda: messagebox.showinfo("Fim", f"Processamento finalizado!\nModificados: {arquivos_modificados}"))
 
-    def processar_arquivo_thread(self, file_path: str) -> bool:
-        try:
-            with open(file_path, encoding='utf-8') as f:
-                content = f.read()
-            
-            modified_content = content
-            
-            matches_true = len(pattern_true.findall(content))
-            matches_false = len(pattern_false.findall(content))
-            
-            if matches_true > 0 or matches_false > 0:
-                gui_utils.create_backup(file_path, self.logger)
-                
-                modified_content = pattern_true.sub(replacement_true, modified_content)
-                modified_content = pattern_false.sub(replacement_false, modified_content)
-                
-                if modified_content != content:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(modified_content)
-                    
-                    self.logger.info(f"[MODIFICADO] {file_path}")
-                    if matches_true: self.logger.info(f"  - Substituído 'use_container_width=True' -> 'stretch' ({matches_true} vezes)")
-                    if matches_false: self.logger.info(f"  - Substituído 'use_container_width=False' -> 'content' ({matches_false} vezes)")
-                    return True
-            
-        except Exception as e:
-            self.logger.error(f"[ERRO] Falha ao processar {file_path}: {e}")
-            
-        return False
+    def log_result(self, result, totals):
+        file_engine.log_result(self.logger, result, totals)
+        if result.status == file_engine.STATUS_MODIFIED:
+            matches_true, matches_false = result.detail
+            if matches_true: self.logger.info(f"  - Substituído 'use_container_width=True' -> 'stretch' ({matches_true} vezes)")
+            if matches_false: self.logger.info(f"  - Substituído 'use_container_width=False' -> 'content' ({matches_false} vezes)")
+
+def corrigir_arquivo_task(task):
+    """Worker for file_engine; detail is (matches_true, matches_false) when the file changes."""
+    content, stamp = file_engine.read_text(task.path)
+
+    modified_content, matches_true = pattern_true.subn(replacement_true, content)
+    modified_content, matches_false = pattern_false.subn(replacement_false, modified_content)
+
+    if modified_content == content:
+        return file_engine.FileResult(task.path, task.rel, file_engine.STATUS_UNCHANGED, stamp=stamp)
+    backup = file_engine.write_with_backup(task.path, modified_content)
+    return file_engine.FileResult(
+        task.path, task.rel, file_engine.STATUS_MODIFIED, detail=(matches_true, matches_false), backup=backup
+    )
 
 if __name__ == '__main__':
     app = RefactorGUI()
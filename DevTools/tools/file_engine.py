@@ -0,0 +1,390 @@
+import contextlib
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import backup_vault
+
+DEFAULT_IGNORED_DIRS = frozenset({'__pycache__'})
+PARALLEL_MIN_FILES = 32
+IN_FLIGHT_PER_JOB = 4
+PROGRESS_EVERY = 200
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CLEAN_CACHE_DIR = os.path.join(PROJECT_ROOT, '.myagilekit-cache', 'devtools')
+CLEAN_CACHE_VERSION = 1
+
+STATUS_MODIFIED = 'modificado'
+STATUS_UNCHANGED = 'sem mudanças'
+STATUS_ERROR = 'erro'
+
+
+class FileTask:
+    """One file to process; ``option`` carries per-file data such as a comment strategy."""
+
+    __slots__ = ('path', 'rel', 'option')
+
+    def __init__(self, path, rel, option=None):
+        self.path = path
+        self.rel = rel
+        self.option = option
+
+
+class FileResult:
+    """``stamp`` is the (size, mtime_ns, digest) of the content a worker found clean."""
+
+    __slots__ = ('path', 'rel', 'status', 'detail', 'error', 'backup', 'stamp')
+
+    def __init__(self, path, rel, status, detail=None, error=None, backup=None, stamp=None):
+        self.path = path
+        self.rel = rel
+        self.status = status
+        self.detail = detail
+        self.error = error
+        self.backup = backup
+        self.stamp = stamp
+
+
+class Totals:
+    def __init__(self, total=0):
+        self.total = total
+        self.done = 0
+        self.modified = 0
+        self.unchanged = 0
+        self.errors = 0
+        self.cached = 0
+
+    def add(self, result):
+        self.done += 1
+        if result.status == STATUS_MODIFIED:
+            self.modified += 1
+        elif result.status == STATUS_ERROR:
+            self.errors += 1
+        else:
+            self.unchanged += 1
+
+
+def parse_ignored_dirs(text, base=DEFAULT_IGNORED_DIRS):
+    ignored = set(base)
+    if text:
+        ignored.update(name.strip() for name in text.split(',') if name.strip())
+    return frozenset(ignored)
+
+
+def extension_matcher(extensions, names=None):
+    """Build ``match(filename) -> option`` from ``{'.py': option}`` plus exact file names."""
+    by_extension = {ext.lower(): option for ext, option in extensions.items()}
+    by_name = dict(names or {})
+
+    def match(filename):
+        if filename in by_name:
+            return by_name[filename]
+        return by_extension.get(os.path.splitext(filename)[1].lower())
+
+    return match
+
+
+def iter_files(root_dir, match, ignored_dirs=DEFAULT_IGNORED_DIRS, skip_hidden=True):
+    """Walk ``root_dir`` with ``os.scandir`` in sorted order, yielding a FileTask per matching file.
+
+    ``match(filename)`` returns the task option, or ``None`` to skip the file.
+    """
+    stack = [root_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if entry.name in ignored_dirs or (skip_hidden and entry.name.startswith('.')):
+                    continue
+                subdirs.append(entry.path)
+                continue
+            option = match(entry.name)
+            if option is not None:
+                yield FileTask(entry.path, os.path.relpath(entry.path, root_dir), option)
+        stack.extend(reversed(subdirs))
+
+
+def resolve_jobs(jobs=None):
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def content_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def read_text(path, errors='strict', newline=None):
+    """Read ``path`` once as bytes; returns ``(text, stamp)`` for CleanCache.
+
+    ``newline=None`` translates line endings like ``open()`` in text mode; ``''`` keeps them.
+    """
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    text = data.decode('utf-8', errors=errors)
+    if newline is None:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text, (stat.st_size, stat.st_mtime_ns, content_digest(data))
+
+
+class CleanCache:
+    """Files a tool already left clean, stored in ``.myagilekit-cache/devtools/<tool>.json``.
+
+    An entry matches when the task option is the same and size + mtime are
+    unchanged. If only the mtime moved, the content digest decides, so touched
+    or restored files are not reprocessed needlessly. ``version`` must change
+    whenever the tool's transformation changes.
+    """
+
+    def __init__(self, tool, version=1, cache_dir=CLEAN_CACHE_DIR):
+        self.path = os.path.join(cache_dir, f'{tool}.json')
+        self.version = f'{CLEAN_CACHE_VERSION}:{version}'
+        self.entries = self._load()
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(raw, dict) or raw.get('version') != self.version:
+            return {}
+        entries = raw.get('files')
+        return entries if isinstance(entries, dict) else {}
+
+    def is_clean(self, task):
+        entry = self.entries.get(os.path.abspath(task.path))
+        if not isinstance(entry, list) or len(entry) != 4 or entry[3] != repr(task.option):
+            return False
+        try:
+            stat = os.stat(task.path)
+        except OSError:
+            return False
+        size, mtime_ns, digest, _option = entry
+        if stat.st_size != size:
+            return False
+        if stat.st_mtime_ns == mtime_ns:
+            return True
+        try:
+            with open(task.path, 'rb') as f:
+                same = content_digest(f.read()) == digest
+        except OSError:
+            return False
+        if same:
+            entry[1] = stat.st_mtime_ns
+            self._dirty = True
+        return same
+
+    def record(self, task, result):
+        key = os.path.abspath(task.path)
+        if result.status == STATUS_UNCHANGED and result.stamp is not None:
+            self.entries[key] = [*result.stamp, repr(task.option)]
+            self._dirty = True
+        elif self.entries.pop(key, None) is not None:
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        temp_path = self.path + '.tmp'
+        with contextlib.suppress(OSError):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'files': self.entries}, f)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+
+
+def _temp_sibling(path, suffix):
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix=suffix, dir=directory)
+    return fd, temp_path
+
+
+def _link_backup(path, backup_path):
+    """Make ``backup_path`` the original file: a hard link, or a copy where links are unsupported."""
+    fd, temp_path = _temp_sibling(path, '.bak.tmp')
+    os.close(fd)
+    os.unlink(temp_path)
+    try:
+        os.link(path, temp_path)
+    except OSError:
+        shutil.copy2(path, temp_path)
+    os.replace(temp_path, backup_path)
+
+
+def write_with_backup(path, content, newline=None):
+    """Replace ``path`` with ``content`` atomically, keeping the original.
+
+    The new text goes to a temp file in the same directory and is moved over
+    ``path`` with ``os.replace``, so a crash leaves either the old or the new
+    file, never half of one. Inside a vault run (see ``process_files``) the
+    original bytes go to the backup vault and the manifest entry is returned;
+    otherwise the original inode is hard-linked as ``path.bak`` and that path
+    is returned. A symlinked ``path`` is written through: the link stays and
+    the file it points to is replaced (its backup sits next to it).
+    """
+    path = os.path.realpath(path)
+    vault_dir = _active_vault_dir
+    backup = None
+    fd, temp_path = _temp_sibling(path, '.tmp')
+    try:
+        with open(fd, 'w', encoding='utf-8', newline=newline) as f:
+            f.write(content)
+        shutil.copymode(path, temp_path)
+        if vault_dir is not None:
+            backup = backup_vault.store_file(vault_dir, path)
+        else:
+            backup = path + '.bak'
+            _link_backup(path, backup)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+    return backup
+
+
+_active_vault_dir = None
+
+
+@contextlib.contextmanager
+def backups_to_vault(vault_dir):
+    """Make ``write_with_backup`` store originals in ``vault_dir`` inside the block."""
+    global _active_vault_dir
+    previous, _active_vault_dir = _active_vault_dir, vault_dir
+    try:
+        yield
+    finally:
+        _active_vault_dir = previous
+
+
+def _run_in_vault(worker, vault_dir, task):
+    with backups_to_vault(vault_dir):
+        return worker(task)
+
+
+def _run_task(worker, task):
+    try:
+        return worker(task)
+    except Exception as e:
+        return FileResult(task.path, task.rel, STATUS_ERROR, error=str(e))
+
+
+def map_tasks(worker, tasks, jobs=None, ordered=False):
+    """Yield ``worker(task)`` results, using a spawn process pool for large batches.
+
+    At most ``jobs * IN_FLIGHT_PER_JOB`` tasks are submitted at a time, so huge
+    trees never queue every file in memory. ``worker`` must be a module-level
+    function, because tasks are pickled to the worker processes.
+    """
+    tasks = list(tasks)
+    jobs = min(resolve_jobs(jobs), len(tasks))
+    if jobs <= 1 or len(tasks) < PARALLEL_MIN_FILES:
+        for task in tasks:
+            yield _run_task(worker, task)
+        return
+
+    max_in_flight = jobs * IN_FLIGHT_PER_JOB
+    pending_tasks = iter(tasks)
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        in_flight = deque()
+        for task in pending_tasks:
+            in_flight.append(pool.submit(_run_task, worker, task))
+            if len(in_flight) >= max_in_flight:
+                break
+
+        while in_flight:
+            if ordered:
+                done = [in_flight.popleft()]
+                results = [done[0].result()]
+            else:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                done = [future for future in in_flight if future in finished]
+                for future in done:
+                    in_flight.remove(future)
+                results = [future.result() for future in done]
+            for _ in done:
+                task = next(pending_tasks, None)
+                if task is not None:
+                    in_flight.append(pool.submit(_run_task, worker, task))
+            yield from results
+
+
+def process_files(tasks, worker, jobs=None, on_result=None, ordered=False, cache=None, backup_run=None):
+    """Run ``worker`` over ``tasks`` and return the Totals; ``on_result(result, totals)`` reports progress.
+
+    With a CleanCache, files known to be clean are skipped (counted in ``totals.cached``)
+    and clean results are remembered for the next run. With a ``backup_vault.BackupRun``,
+    originals go to the vault instead of ``.bak`` files and the run manifest is written
+    at the end, so the whole run can be restored at once.
+    """
+    tasks = list(tasks)
+    totals = Totals(len(tasks))
+    if cache is not None:
+        pending = [task for task in tasks if not cache.is_clean(task)]
+        totals.cached = len(tasks) - len(pending)
+        totals.total = len(pending)
+        tasks = pending
+    if backup_run is not None:
+        worker = functools.partial(_run_in_vault, worker, backup_run.vault_dir)
+    by_path = {task.path: task for task in tasks} if cache is not None else None
+    try:
+        for result in map_tasks(worker, tasks, jobs=jobs, ordered=ordered):
+            totals.add(result)
+            if backup_run is not None and isinstance(result.backup, dict):
+                backup_run.add(result.backup)
+            if cache is not None:
+                cache.record(by_path[result.path], result)
+            if on_result is not None:
+                on_result(result, totals)
+    finally:
+        if cache is not None:
+            cache.save()
+        if backup_run is not None:
+            backup_run.close()
+    return totals
+
+
+def log_result(logger, result, totals=None, show_unchanged=True):
+    """Standard log lines shared by the rewriting tools."""
+    if isinstance(result.backup, str):
+        logger.info(f"Backup criado: {os.path.basename(result.backup)}")
+    if result.status == STATUS_MODIFIED:
+        logger.info(f"[MODIFICADO] {result.rel}")
+    elif result.status == STATUS_ERROR:
+        logger.error(f"[ERRO] {result.rel}: {result.error}")
+    elif show_unchanged:
+        logger.info(f"[SEM MUDANÇAS] {result.rel}")
+    if totals is not None and totals.total and totals.done % PROGRESS_EVERY == 0:
+        logger.info(f"Progresso: {totals.done}/{totals.total} arquivos")
+
+
+def log_cached(logger, totals):
+    if totals.cached:
+        logger.info(f"{totals.cached} arquivos sem mudanças desde a última execução (cache)")
+
+
+def log_backup_run(logger, backup_run):
+    if backup_run is not None and backup_run.entries:
+        logger.info(f"Originais de {len(backup_run.entries)} arquivos guardados no cofre: {backup_run.id}")
+        logger.info(f"Para desfazer: python DevTools/tools/backup_vault.py restaurar {backup_run.id}")
@@ -2,8 +2,9 @@ import contextlib
 import datetime
 import logging
 import os
-import shutil
+import queue
 import sys
+import threading
 import tkinter as tk
 from pathlib import Path
 from tkinter import ttk
@@ -32,9 +33,23 @@ FONT_H2 = (FONT_FAMILY, 12, 'bold')
 FONT_BODY = (FONT_FAMILY, 10)
 FONT_CODE = (FONT_MONO, 9)
 
+GUI_LOG_INTERVAL_MS = 100
+GUI_LOG_MAX_LINES = 5000
+GUI_LOG_QUIET_PER_TICK = 20
+QUIET_MARKERS = {
+    '[SEM MUDANÇAS]': 'arquivos sem mudanças',
+    '[IGNORADO]': 'arquivos ignorados',
+}
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 LOGS_DIR = PROJECT_ROOT / "logs"
 
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from myagilekit.core.logging import queue_file_handler  # noqa: E402
+
+
 def ensure_logs_dir():
     LOGS_DIR.mkdir(parents=True, exist_ok=True)
     return LOGS_DIR
@@ -99,19 +114,78 @@ def get_script_directory():
     else:
         return os.path.dirname(os.path.abspath(sys.argv[0]))
 
+def batch_log_lines(entries, max_lines=GUI_LOG_MAX_LINES, quiet_per_tick=GUI_LOG_QUIET_PER_TICK):
+    """Turn one tick of (levelno, message) entries into the lines shown in the widget."""
+    shown = []
+    quiet_seen = {}
+    suppressed = {}
+    for levelno, message in entries:
+        marker = None
+        if levelno <= logging.INFO:
+            marker = next((m for m in QUIET_MARKERS if m in message), None)
+        if marker is not None:
+            quiet_seen[marker] = quiet_seen.get(marker, 0) + 1
+            if quiet_seen[marker] > quiet_per_tick:
+                suppressed[marker] = suppressed.get(marker, 0) + 1
+                continue
+        shown.append(message)
+
+    for marker, count in suppressed.items():
+        shown.append(f"+{count:,} {QUIET_MARKERS[marker]}")
+    if len(shown) > max_lines:
+        omitted = len(shown) - max_lines + 1
+        shown = [f"+{omitted:,} linhas omitidas (veja o arquivo de log)"] + shown[-(max_lines - 1):]
+    return shown
+
 class GuiHandler(logging.Handler):
-    def __init__(self, text_widget):
+    """Queues records and writes them to the Text widget in one batch per tick."""
+
+    def __init__(self, text_widget, max_lines=GUI_LOG_MAX_LINES, interval_ms=GUI_LOG_INTERVAL_MS):
         super().__init__()
         self.text_widget = text_widget
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self.pending = queue.SimpleQueue()
+        self._scheduled = False
+        self._schedule_lock = threading.Lock()
 
     def emit(self, record):
-        msg = self.format(record)
-        def append():
-            self.text_widget.config(state='normal')
-            self.text_widget.insert(tk.END, msg + '\n')
-            self.text_widget.see(tk.END)
-            self.text_widget.config(state='disabled')
-        self.text_widget.after(0, append)
+        try:
+            self.pending.put((record.levelno, self.format(record)))
+        except Exception:
+            self.handleError(record)
+            return
+        with self._schedule_lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        with contextlib.suppress(RuntimeError, tk.TclError):
+            self.text_widget.after(self.interval_ms, self.flush_pending)
+
+    def flush_pending(self):
+        with self._schedule_lock:
+            self._scheduled = False
+        entries = []
+        while True:
+            try:
+                entries.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+        lines = batch_log_lines(entries, self.max_lines)
+        if not lines:
+            return
+
+        widget = self.text_widget
+        try:
+            widget.config(state='normal')
+            widget.insert(tk.END, '\n'.join(lines) + '\n')
+            line_count = int(widget.index('end-1c').split('.')[0]) - 1
+            if line_count > self.max_lines:
+                widget.delete('1.0', f"{line_count - self.max_lines + 1}.0")
+            widget.see(tk.END)
+            widget.config(state='disabled')
+        except tk.TclError:
+            pass
 
 def setup_logger(name, log_file, text_widget=None):
     log_parent = os.path.dirname(os.path.abspath(log_file))
@@ -120,12 +194,14 @@ def setup_logger(name, log_file, text_widget=None):
     
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
+    for handler in logger.handlers:
+        handler.close()
     logger.handlers = []
 
     formatter = logging.Formatter('%(asctime)s | %(levelname)-8s | %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
 
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setFormatter(formatter)
+    # Written by the shared log thread, so worker threads never wait on the disk.
+    file_handler = queue_file_handler(log_file, formatter=formatter)
     logger.addHandler(file_handler)
 
     console_handler = logging.StreamHandler(sys.stdout)
@@ -138,15 +214,3 @@ def setup_logger(name, log_file, text_widget=None):
         logger.addHandler(gui_handler)
 
     return logger
-
-def create_backup(file_path, logger=None):
-    try:
-        backup_path = file_path + ".bak"
-        shutil.copy2(file_path, backup_path)
-        if logger:
-            logger.info(f"Backup criado: {os.path.basename(backup_path)}")
-        return True
-    except Exception as e:
-        if logger:
-            logger.error(f"Falha ao criar backup de {file_path}: {e}")
-        return False
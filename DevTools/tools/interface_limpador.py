@@ -21,7 +21,7 @@ class LimparCitacoesApp(tk.Tk):
         self.create_widgets()
 
     def create_widgets(self):
-        gui_utils.create_header(self, "Interface Limpador", "Remove citações [cite] (Cria backups .bak automaticamente)")
+        gui_utils.create_header(self, "Interface Limpador", "Remove citações [cite] (originais guardados no cofre de backups)")
 
         main_pad = ttk.Frame(self, padding=20)
         main_pad.pack(fill=tk.BOTH, expand=True)
@@ -1,3 +1,4 @@
+import codecs
 import datetime
 import logging
 import os
@@ -7,8 +8,12 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import file_engine
 import gui_utils
 
+COPY_CHUNK_SIZE = 1024 * 1024
+MANIFEST_NUMBER_WIDTH = 12
+SEPARATOR = '=' * 80
 
 class FileMergerApp:
 
@@ -51,6 +56,8 @@ class FileMergerApp:
         ignore_frame.pack(fill=tk.X, pady=5)
         self.ignore_dirs_var = tk.StringVar(value='node_modules, dist, build, target, out, .venv, venv, .git, __pycache__')
         ttk.Entry(ignore_frame, textvariable=self.ignore_dirs_var).pack(fill=tk.X)
+        self.sort_by_path_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ignore_frame, text='Ordenar pelo caminho completo (em vez de pasta por pasta)', variable=self.sort_by_path_var).pack(anchor='w', pady=(5, 0))
 
         output_frame = ttk.LabelFrame(main_pad, text='Arquivo de Saída', padding='10')
         output_frame.pack(fill=tk.X, pady=5)
@@ -106,33 +113,35 @@ class FileMergerApp:
         self.logger = gui_utils.setup_logger("Merger", log_file, self.log_text)
 
         self.process_button.config(state='disabled')
-        threading.Thread(target=self.process_files, args=(source_dir, exts, output_file, ignored), daemon=True).start()
+        sort_by_path = self.sort_by_path_var.get()
+        threading.Thread(target=self.process_files, args=(source_dir, exts, output_file, ignored, sort_by_path), daemon=True).start()
 
-    def process_files(self, source_dir, extensions, output_file, ignored_dirs_str):
+    def process_files(self, source_dir, extensions, output_file, ignored_dirs_str, sort_by_path=False):
         self.logger.info(f'Iniciando concatenação em: {source_dir}')
-        ignored_set = {'__pycache__'}
-        if ignored_dirs_str: ignored_set.update(x.strip() for x in ignored_dirs_str.split(',') if x.strip())
+        ignored_set = file_engine.parse_ignored_dirs(ignored_dirs_str)
         
         try:
-            count = 0
-            with open(output_file, 'w', encoding='utf-8', errors='ignore') as outfile:
-                for root, dirs, files in os.walk(source_dir):
-                    dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ignored_set]
-                    for filename in files:
-                        if any(filename.lower().endswith(e) for e in extensions):
-                            path = os.path.join(root, filename)
-                            rel = os.path.relpath(path, source_dir)
-                            self.logger.info(f'Adicionando: {rel}')
-                            outfile.write(f"\n{'='*80}\n### FILE: {rel}\n{'='*80}\n")
-                            try:
-                                with open(path, encoding='utf-8', errors='ignore') as infile:
-                                    outfile.write(infile.read())
-                            except Exception as e:
-                                self.logger.error(f'Erro ao ler {rel}: {e}')
-                                outfile.write(f"Error reading file: {e}")
-                            count += 1
+            matcher = file_engine.extension_matcher(dict.fromkeys(extensions, True))
+            output_path = os.path.abspath(output_file)
+            tasks = [
+                task for task in file_engine.iter_files(source_dir, matcher, ignored_set)
+                if os.path.abspath(task.path) != output_path
+            ]
+            if sort_by_path:
+                tasks = sort_tasks_by_path(tasks)
+            self.logger.info(f'Arquivos encontrados: {len(tasks)}')
+
+            def on_file(index, task, error):
+                if error:
+                    self.logger.error(f'Erro ao ler {task.rel}: {error}')
+                elif (index + 1) % file_engine.PROGRESS_EVERY == 0:
+                    self.logger.info(f'Progresso: {index + 1}/{len(tasks)} arquivos')
+
+            spans = concatenate_files(tasks, output_file, on_file)
+            count = len(spans)
+            total_bytes = sum(size for _offset, size in spans)
             
-            self.logger.info('Concluído!')
+            self.logger.info(f'Concluído! {count} arquivos, {total_bytes} bytes de conteúdo em {output_file}')
             self.root.after(0, lambda: messagebox.showinfo('Sucesso', f'{count} arquivos concatenados.'))
         except Exception as e:
             self.logger.error(f"Erro Fatal: {e}")
@@ -140,6 +149,86 @@ class FileMergerApp:
         finally:
             self.root.after(0, lambda: self.process_button.config(state='normal'))
 
+def sort_tasks_by_path(tasks):
+    return sorted(tasks, key=lambda task: task.rel.replace(os.sep, '/'))
+
+def _encode(text):
+    return text.encode('utf-8', errors='replace')
+
+def _section_header(rel):
+    return _encode(f"\n{SEPARATOR}\n### FILE: {rel}\n{SEPARATOR}\n")
+
+def build_manifest(tasks, spans):
+    """Header listing every file with the byte offset and size of its content in the output.
+
+    The numbers have a fixed width, so the header written before the copy has the
+    same length as the final one and can be overwritten in place.
+    """
+    width = MANIFEST_NUMBER_WIDTH
+    lines = [f"### MANIFESTO: {len(tasks)} arquivos (offset e tamanho do conteúdo, em bytes)"]
+    for task, (offset, size) in zip(tasks, spans, strict=True):
+        lines.append(f"### {offset:0{width}d} {size:0{width}d} {task.rel}")
+    lines.append(f"### FIM DO MANIFESTO\n{SEPARATOR}\n")
+    return _encode('\n'.join(lines))
+
+def copy_text_stream(src, dst, chunk_size=COPY_CHUNK_SIZE):
+    """Copy src to dst in chunks; valid UTF-8 is copied byte for byte.
+
+    Once a chunk is not valid UTF-8, the rest of the file is decoded with
+    errors='ignore' (the old text-mode behaviour), still one chunk at a time.
+    Returns the number of bytes written.
+    """
+    written = 0
+    strict = codecs.getincrementaldecoder('utf-8')()
+    lenient = None
+    held = b''
+    while True:
+        chunk = src.read(chunk_size)
+        eof = not chunk
+        if lenient is None:
+            try:
+                strict.decode(chunk, final=eof)
+            except UnicodeDecodeError:
+                lenient = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+                chunk = held + chunk
+            else:
+                # The bytes of a character split across chunks are held until it is complete.
+                buffer = held + chunk
+                held = strict.getstate()[0]
+                data = buffer[:len(buffer) - len(held)]
+        if lenient is not None:
+            data = lenient.decode(chunk, final=eof).encode('utf-8')
+        dst.write(data)
+        written += len(data)
+        if eof:
+            return written
+
+def concatenate_files(tasks, output_file, on_file=None, chunk_size=COPY_CHUNK_SIZE):
+    """Stream every task into output_file behind a manifest; returns the (offset, size) spans.
+
+    Memory use is bounded by chunk_size, whatever the size of the files.
+    """
+    tasks = list(tasks)
+    spans = [(0, 0)] * len(tasks)
+    with open(output_file, 'wb') as out:
+        out.write(build_manifest(tasks, spans))
+        for index, task in enumerate(tasks):
+            out.write(_section_header(task.rel))
+            offset = out.tell()
+            error = None
+            try:
+                with open(task.path, 'rb') as src:
+                    copy_text_stream(src, out, chunk_size)
+            except OSError as e:
+                error = str(e)
+                out.write(_encode(f"Error reading file: {e}"))
+            spans[index] = (offset, out.tell() - offset)
+            if on_file is not None:
+                on_file(index, task, error)
+        out.seek(0)
+        out.write(build_manifest(tasks, spans))
+    return spans
+
 if __name__ == '__main__':
     root = tk.Tk()
     app = FileMergerApp(root)
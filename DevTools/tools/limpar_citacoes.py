@@ -1,19 +1,43 @@
 import argparse
 import datetime
+import mmap
 import os
 import re
-import shutil
 import sys
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import backup_vault
+import file_engine
+
+EXTENSOES_VALIDAS = ('.txt', '.md', '.py', '.html', '.xml', '.tex', '.c', '.h', '.sql', '.js', '.java', '.cs', '.cpp', '.hpp', '.ts', '.php', '.go', '.swift', '.rb')
+
+PADRAO_ORIGINAL = '\\[\\s*cite\\s*\\\\?:\\s*.*?\\]'
+PADRAO_START = '\\[\\s*cite\\\\?_start\\s*\\]'
+PADRAO_END = '\\[\\s*cite\\\\?_end\\s*\\]'
+PADRAO_CITACAO = re.compile(f'({PADRAO_ORIGINAL})|({PADRAO_START})|({PADRAO_END})', re.IGNORECASE)
+# Every marker contains "cite"; files without it in any ASCII case are never decoded.
+PADRAO_CANDIDATO = re.compile(rb'[cC][iI][tT][eE]')
 
 def remover_citacoes(texto):
-    padrao_original = '\\[\\s*cite\\s*\\\\?:\\s*.*?\\]'
-    padrao_start = '\\[\\s*cite\\\\?_start\\s*\\]'
-    padrao_end = '\\[\\s*cite\\\\?_end\\s*\\]'
-    padrao_combinado = f'({padrao_original})|({padrao_start})|({padrao_end})'
-    texto_limpo, num_remocoes = re.subn(padrao_combinado, '', texto, flags=re.IGNORECASE)
+    texto_limpo, num_remocoes = PADRAO_CITACAO.subn('', texto)
     return (texto_limpo, num_remocoes)
 
+def ler_se_tiver_marcador(caminho):
+    """Return (text or None, stamp); text is None when the bytes have no "cite" at all.
+
+    The file is mapped instead of read, so the check and the cache digest do not
+    copy it into Python memory.
+    """
+    with open(caminho, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            return None, (0, stat.st_mtime_ns, file_engine.content_digest(b''))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+            stamp = (stat.st_size, stat.st_mtime_ns, file_engine.content_digest(dados))
+            if PADRAO_CANDIDATO.search(dados) is None:
+                return None, stamp
+            return dados[:].decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n'), stamp
+
 def log(msg, log_file=None):
     ts = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     formatted = f"{ts} | INFO | {msg}"
@@ -27,15 +51,7 @@ def log(msg, log_file=None):
                 f.write(formatted + '\n')
         except: pass
 
-def criar_backup(caminho, log_file=None):
-    try:
-        bak = caminho + ".bak"
-        shutil.copy2(caminho, bak)
-        log(f"Backup criado: {os.path.basename(bak)}", log_file)
-    except Exception as e:
-        log(f"Falha ao criar backup de {caminho}: {e}", log_file)
-
-def limpar_arquivo_inplace(caminho_arquivo, log_file=None):
+def limpar_arquivo_inplace(caminho_arquivo, log_file=None, vault_dir=backup_vault.VAULT_DIR):
     try:
         with open(caminho_arquivo, encoding='utf-8', errors='replace') as f:
             conteudo_original = f.read()
@@ -47,9 +63,11 @@ def limpar_arquivo_inplace(caminho_arquivo, log_file=None):
     
     if contagem > 0 and conteudo_original != conteudo_limpo:
         try:
-            criar_backup(caminho_arquivo, log_file)
-            with open(caminho_arquivo, 'w', encoding='utf-8') as f:
-                f.write(conteudo_limpo)
+            backup_run = backup_vault.BackupRun('limpar_citacoes', vault_dir, source=caminho_arquivo)
+            with file_engine.backups_to_vault(vault_dir):
+                backup_run.add(file_engine.write_with_backup(caminho_arquivo, conteudo_limpo))
+            backup_run.close()
+            log(f'Original guardado no cofre: {backup_run.id}', log_file)
             log(f'Modificado: {caminho_arquivo} ({contagem} remoções)', log_file)
             return contagem
         except Exception as e:
@@ -57,41 +75,67 @@ def limpar_arquivo_inplace(caminho_arquivo, log_file=None):
             return 0
     return 0
 
-def processar_pasta_recursivamente(pasta_path, log_file=None):
-    extensoes_validas = ('.txt', '.md', '.py', '.html', '.xml', '.tex', '.c', '.h', '.sql', '.js', '.java', '.cs', '.cpp', '.hpp', '.ts', '.php', '.go', '.swift', '.rb')
+def limpar_arquivo_task(task):
+    """Worker for file_engine; detail is the number of removed citations."""
+    conteudo_original, stamp = ler_se_tiver_marcador(task.path)
+    if conteudo_original is None:
+        return file_engine.FileResult(task.path, task.rel, file_engine.STATUS_UNCHANGED, detail=0, stamp=stamp)
+
+    conteudo_limpo, contagem = remover_citacoes(conteudo_original)
+    if contagem == 0 or conteudo_original == conteudo_limpo:
+        return file_engine.FileResult(task.path, task.rel, file_engine.STATUS_UNCHANGED, detail=0, stamp=stamp)
+    backup = file_engine.write_with_backup(task.path, conteudo_limpo)
+    return file_engine.FileResult(task.path, task.rel, file_engine.STATUS_MODIFIED, detail=contagem, backup=backup)
+
+def processar_pasta_recursivamente(pasta_path, log_file=None, jobs=None, usar_cache=True, vault_dir=backup_vault.VAULT_DIR):
     log(f'Iniciando varredura recursiva de: {pasta_path}', log_file)
     
-    total_arquivos_modificados = 0
+    matcher = file_engine.extension_matcher(dict.fromkeys(EXTENSOES_VALIDAS, True))
+    tasks = file_engine.iter_files(pasta_path, matcher, ignored_dirs=frozenset(), skip_hidden=False)
     total_remocoes_geral = 0
     
-    for root, _, files in os.walk(pasta_path):
-        for file in files:
-            if file.lower().endswith(extensoes_validas):
-                caminho_completo = os.path.join(root, file)
-                remocoes_no_arquivo = limpar_arquivo_inplace(caminho_completo, log_file)
-                if remocoes_no_arquivo > 0:
-                    total_arquivos_modificados += 1
-                    total_remocoes_geral += remocoes_no_arquivo
+    def registrar(result, totals):
+        nonlocal total_remocoes_geral
+        if result.status == file_engine.STATUS_MODIFIED:
+            total_remocoes_geral += result.detail
+            log(f'Modificado: {result.path} ({result.detail} remoções)', log_file)
+        elif result.status == file_engine.STATUS_ERROR:
+            log(f'ERRO ao processar {result.path}: {result.error}', log_file)
+    
+    cache = file_engine.CleanCache('limpar_citacoes') if usar_cache else None
+    backup_run = backup_vault.BackupRun('limpar_citacoes', vault_dir, source=pasta_path)
+    totals = file_engine.process_files(
+        tasks, limpar_arquivo_task, jobs=jobs, on_result=registrar, cache=cache, backup_run=backup_run
+    )
+    if totals.cached:
+        log(f'{totals.cached} arquivos sem mudanças desde a última execução (cache)', log_file)
+    if backup_run.entries:
+        log(f'Originais guardados no cofre: {backup_run.id}', log_file)
+        log(f'Para desfazer: python DevTools/tools/backup_vault.py restaurar {backup_run.id}', log_file)
                     
     log('Varredura concluída.', log_file)
-    log(f'Total de arquivos modificados: {total_arquivos_modificados}', log_file)
+    log(f'Total de arquivos modificados: {totals.modified}', log_file)
     log(f'Total de citações removidas: {total_remocoes_geral}', log_file)
+    return totals
 
 def main():
     parser = argparse.ArgumentParser(description='Remove marcações de citação.', formatter_class=argparse.RawTextHelpFormatter)
     parser.add_argument('-p', '--pasta', help='Caminho para limpar recursivamente.')
     parser.add_argument('arquivo_entrada', nargs='?', help='Arquivo único.')
     parser.add_argument('-o', '--output', help='Arquivo de saída (sem backup).')
-    parser.add_argument('-i', '--in-place', action='store_true', help='Modifica o original (Gera backup).')
+    parser.add_argument('-i', '--in-place', action='store_true', help='Modifica o original (guarda o original no cofre de backups).')
     parser.add_argument('-l', '--log', help='Arquivo de log.')
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='Processos em paralelo para --pasta (0 = todos os núcleos, 1 = sem paralelismo).')
+    parser.add_argument('--cofre', default=backup_vault.VAULT_DIR, help='Diretório do cofre de backups.')
+    parser.add_argument('--sem-cache', action='store_true', help='Reprocessa também os arquivos que já estavam limpos na última execução.')
     
     args = parser.parse_args()
     
     if args.pasta:
-        processar_pasta_recursivamente(args.pasta, args.log)
+        processar_pasta_recursivamente(args.pasta, args.log, jobs=args.jobs, usar_cache=not args.sem_cache, vault_dir=args.cofre)
     elif args.arquivo_entrada:
         if args.in_place:
-            limpar_arquivo_inplace(args.arquivo_entrada, args.log)
+            limpar_arquivo_inplace(args.arquivo_entrada, args.log, vault_dir=args.cofre)
         elif args.output:
             try:
                 with open(args.arquivo_entrada, encoding='utf-8') as f: content = f.read()
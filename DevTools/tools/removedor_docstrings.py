@@ -1,5 +1,7 @@
+import argparse
 import ast
 import datetime
+import io
 import os
 import re
 import sys
@@ -8,32 +10,51 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import backup_vault
+import file_engine
 import gui_utils
 
+DEFAULT_IGNORED_DIRS = '.idea, .vscode, .vs, venv, .venv, env, node_modules, dist, build, target, out, .git, bin, obj, __pycache__'
 SQL_KEYWORDS = {'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER', 'TRUNCATE', 'WITH', 'FROM', 'WHERE', 'JOIN', 'SET', 'VALUES', 'TABLE', 'VIEW', 'INTO', 'PRAGMA', 'GROUP BY', 'ORDER BY', 'HAVING', 'LEFT JOIN', 'RIGHT JOIN', 'INNER JOIN', 'OUTER JOIN', 'ON', 'AS'}
 
+MODE_SPAN = 'span'
+MODE_UNPARSE = 'unparse'
+DOCSTRING_OWNERS = (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+SQL_SCAN_CHARS = 200
+# One alternation, longest keywords first; 'LEFT JOIN' also counts as 'JOIN', as separate searches did.
+SQL_KEYWORD_PATTERN = re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in sorted(SQL_KEYWORDS, key=len, reverse=True)) + r')\b')
+SQL_KEYWORD_HITS = {k: frozenset({k, *(w for w in k.split() if w in SQL_KEYWORDS)}) for k in SQL_KEYWORDS}
+
 class DocstringRemover(ast.NodeTransformer):
     def _is_sql_string(self, s: str) -> bool:
-        s_upper = s.upper()
-        s_fragment = s_upper[:200]
-        found_keywords = 0
-        for keyword in SQL_KEYWORDS:
-            if re.search(r'\b' + keyword + r'\b', s_fragment):
-                found_keywords += 1
-        return (found_keywords >= 2)
+        # Upper-casing only the prefix: str.upper maps char by char, so this is s.upper()[:200].
+        s_fragment = s[:SQL_SCAN_CHARS].upper()[:SQL_SCAN_CHARS]
+        found_keywords = set()
+        for match in SQL_KEYWORD_PATTERN.finditer(s_fragment):
+            found_keywords |= SQL_KEYWORD_HITS[match.group()]
+            if len(found_keywords) >= 2:
+                return True
+        return False
 
-    def _remove_docstring(self, node):
+    def removable_docstring(self, node):
+        """The docstring statement of node that should go, or None."""
         if not node.body or not isinstance(node.body[0], ast.Expr):
-            return node
+            return None
+        # A module that is only its docstring (e.g. a package __init__) would become an empty file.
+        if isinstance(node, ast.Module) and len(node.body) == 1:
+            return None
 
         first_value = node.body[0].value
         if not isinstance(first_value, ast.Constant) or not isinstance(first_value.value, str):
-            return node
+            return None
+
+        if self._is_sql_string(first_value.value):
+            return None
+        return node.body[0]
 
-        docstring_content = first_value.value
-        if self._is_sql_string(docstring_content):
-            return node
-        node.body = node.body[1:]
+    def _remove_docstring(self, node):
+        if self.removable_docstring(node) is not None:
+            node.body = node.body[1:]
         return node
 
     def visit_Module(self, node):
@@ -64,7 +85,7 @@ class DocstringRemoverApp:
         self.create_widgets(self.root)
 
     def create_widgets(self, parent):
-        gui_utils.create_header(parent, "Removedor de Docstrings", "Remove docstrings de Python (Cria Backups .bak)")
+        gui_utils.create_header(parent, "Removedor de Docstrings", "Remove docstrings de Python (originais guardados no cofre de backups)")
 
         main_pad = ttk.Frame(parent, padding=10)
         main_pad.pack(fill=tk.BOTH, expand=True)
@@ -77,8 +98,10 @@ class DocstringRemoverApp:
 
         ignore_frame = ttk.LabelFrame(main_pad, text='Diretórios Ignorados', padding='10')
         ignore_frame.pack(fill=tk.X, pady=5)
-        self.ignore_dirs_var = tk.StringVar(value='.idea, .vscode, .vs, venv, .venv, env, node_modules, dist, build, target, out, .git, bin, obj, __pycache__')
+        self.ignore_dirs_var = tk.StringVar(value=DEFAULT_IGNORED_DIRS)
         ttk.Entry(ignore_frame, textvariable=self.ignore_dirs_var).pack(fill=tk.X)
+        self.reformat_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ignore_frame, text='Reformatar o arquivo inteiro (ast.unparse)', variable=self.reformat_var).pack(anchor='w', pady=(5, 0))
 
         log_frame = ttk.LabelFrame(main_pad, text='Arquivo de Log', padding='10')
         log_frame.pack(fill=tk.X, pady=5)
@@ -115,56 +138,20 @@ class DocstringRemoverApp:
         log = self.log_file_var.get()
         if not src or not log: return messagebox.showerror('Erro', 'Defina diretório e log.')
         
-        if not messagebox.askyesno('Atenção', f"Isso modificará arquivos em: {src}\nBackups (.bak) serão criados.\nContinuar?", icon='warning'): return
+        if not messagebox.askyesno('Atenção', f"Isso modificará arquivos em: {src}\nOs originais serão guardados no cofre (logs/backups).\nContinuar?", icon='warning'): return
         
         self.process_button.config(state='disabled')
         self.logger = gui_utils.setup_logger("DocstringRemover", log, self.log_text)
-        threading.Thread(target=self.process_files, args=(src, self.ignore_dirs_var.get()), daemon=True).start()
+        mode = MODE_UNPARSE if self.reformat_var.get() else MODE_SPAN
+        threading.Thread(target=self.process_files, args=(src, self.ignore_dirs_var.get(), mode), daemon=True).start()
 
-    def remove_python_docstrings_only(self, code):
-        try:
-            tree = ast.parse(code)
-            new_tree = self.ast_transformer.visit(tree)
-            ast.fix_missing_locations(new_tree)
-            return ast.unparse(new_tree)
-        except Exception as e:
-            return None
+    def remove_python_docstrings_only(self, code, mode=MODE_UNPARSE):
+        return remove_python_docstrings(code, self.ast_transformer, mode)
 
-    def process_files(self, source_dir, ignored_dirs_str):
-        self.logger.info(f"Iniciando em: {source_dir}")
-        ign = {x.strip() for x in ignored_dirs_str.split(',') if x.strip()}
-        
+    def process_files(self, source_dir, ignored_dirs_str, mode=MODE_SPAN):
         try:
-            processed = 0
-            modified = 0
-            
-            for root, dirs, files in os.walk(source_dir):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ign]
-                for f in files:
-                    if f.endswith('.py'):
-                        path = os.path.join(root, f)
-                        rel = os.path.relpath(path, source_dir)
-                        self.logger.info(f"Processando: {rel}")
-                        processed += 1
-                        
-                        try:
-                            with open(path, encoding='utf-8') as ifile:
-                                orig = ifile.read()
-                            
-                            clean = self.remove_python_docstrings_only(orig)
-                            if clean and clean != orig:
-                                gui_utils.create_backup(path, self.logger)
-                                
-                                with open(path, 'w', encoding='utf-8') as ofile:
-                                    ofile.write(clean)
-                                modified += 1
-                                self.logger.info(f"[MODIFICADO] {rel}")
-                            else:
-                                self.logger.info(f"[SEM MUDANÇAS] {rel}")
-                        except Exception as e:
-                            self.logger.error(f"[ERRO] {rel}: {e}")
-            
-            self.logger.info(f'Concluído! Processados: {processed}, Modificados: {modified}')
+            totals = remove_docstrings_in_tree(source_dir, ignored_dirs_str, self.logger, mode=mode)
+            processed, modified = totals.done, totals.modified
             self.root.after(0, lambda: messagebox.showinfo('Fim', f'Processados: {processed}, Modificados: {modified}'))
         
         except Exception as e:
@@ -172,7 +159,124 @@ class DocstringRemoverApp:
         finally:
             self.root.after(0, lambda: self.process_button.config(state='normal'))
 
+_worker_transformer = None
+
+def remove_python_docstrings(code, transformer=None, mode=MODE_UNPARSE):
+    """Source without docstrings, or None when it does not parse.
+
+    MODE_SPAN cuts only the docstring ranges out of the original text; MODE_UNPARSE
+    regenerates the whole file with ast.unparse.
+    """
+    global _worker_transformer
+    if transformer is None:
+        # One remover per process: pool workers build their own on first use.
+        if _worker_transformer is None:
+            _worker_transformer = DocstringRemover()
+        transformer = _worker_transformer
+    try:
+        tree = ast.parse(code)
+        if mode == MODE_SPAN:
+            return cut_docstring_spans(code, tree, transformer)
+        new_tree = transformer.visit(tree)
+        ast.fix_missing_locations(new_tree)
+        return ast.unparse(new_tree)
+    except Exception:
+        return None
+
+def cut_docstring_spans(code, tree, transformer):
+    lines = io.StringIO(code, newline='').readlines()
+    edits = []
+    for node in ast.walk(tree):
+        if isinstance(node, DOCSTRING_OWNERS):
+            doc = transformer.removable_docstring(node)
+            if doc is not None:
+                edits.append(_docstring_edit(lines, doc, only_statement=len(node.body) == 1 and not isinstance(node, ast.Module)))
+    if not edits:
+        return code
+    # Bottom-up, so earlier line numbers stay valid.
+    for first, last, replacement in sorted(edits, key=lambda edit: edit[0], reverse=True):
+        lines[first:last + 1] = replacement
+    return ''.join(lines)
+
+def _docstring_edit(lines, doc, only_statement):
+    """(first line index, last line index, replacement lines) removing one docstring statement."""
+    first, last = doc.lineno - 1, doc.end_lineno - 1
+    # AST columns are UTF-8 byte offsets.
+    prefix = lines[first].encode('utf-8')[:doc.col_offset].decode('utf-8')
+    tail = lines[last].encode('utf-8')[doc.end_col_offset:].decode('utf-8')
+    body = tail.rstrip('\r\n')
+    newline = tail[len(body):]
+    rest = body.lstrip(' \t')
+    if rest.startswith(';'):
+        rest = rest[1:].lstrip(' \t')
+
+    if only_statement:
+        # The body would be empty: keep a pass in the docstring's place.
+        return first, last, [prefix + 'pass' + tail]
+    if not prefix.strip() and not rest:
+        return first, last, []
+    # Something else shares the line (a header, a ';' statement or a comment): keep it.
+    return first, last, [prefix + rest + newline]
+
+def remove_docstrings_task(task):
+    """Worker for file_engine; runs in a pool process for large trees."""
+    mode = task.option if task.option in (MODE_SPAN, MODE_UNPARSE) else MODE_SPAN
+    # newline='' keeps CRLF files byte-identical outside the removed ranges.
+    orig, stamp = file_engine.read_text(task.path, newline='')
+
+    clean = remove_python_docstrings(orig, mode=mode)
+    if clean is None or clean == orig:
+        return file_engine.FileResult(task.path, task.rel, file_engine.STATUS_UNCHANGED, stamp=stamp)
+    backup = file_engine.write_with_backup(task.path, clean, newline='')
+    return file_engine.FileResult(task.path, task.rel, file_engine.STATUS_MODIFIED, backup=backup)
+
+def remove_docstrings_in_tree(source_dir, ignored_dirs_str, logger, jobs=None, show_unchanged=True, mode=MODE_SPAN, use_cache=True,
+                              vault_dir=backup_vault.VAULT_DIR):
+    """Strip docstrings from every .py under source_dir; used by the GUI and the CLI."""
+    logger.info(f"Iniciando em: {source_dir}")
+    ign = file_engine.parse_ignored_dirs(ignored_dirs_str)
+    matcher = file_engine.extension_matcher({'.py': mode})
+    tasks = list(file_engine.iter_files(source_dir, matcher, ign))
+    logger.info(f"Arquivos encontrados: {len(tasks)}")
+    backup_run = backup_vault.BackupRun('removedor_docstrings', vault_dir, source=source_dir)
+    totals = file_engine.process_files(
+        tasks,
+        remove_docstrings_task,
+        jobs=jobs,
+        on_result=lambda result, totals: file_engine.log_result(logger, result, totals, show_unchanged),
+        cache=file_engine.CleanCache('removedor_docstrings') if use_cache else None,
+        backup_run=backup_run,
+    )
+    file_engine.log_cached(logger, totals)
+    file_engine.log_backup_run(logger, backup_run)
+    logger.info(f'Concluído! Processados: {totals.done}, Modificados: {totals.modified}, Erros: {totals.errors}')
+    return totals
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Remove docstrings de arquivos Python (originais guardados no cofre de backups). Sem argumentos abre a interface.')
+    parser.add_argument('pasta', nargs='?', help='Diretório a processar recursivamente.')
+    parser.add_argument('-i', '--ignorar', default=DEFAULT_IGNORED_DIRS, help='Diretórios ignorados, separados por vírgula.')
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='Processos em paralelo (0 = todos os núcleos).')
+    parser.add_argument('-l', '--log', help='Arquivo de log.')
+    parser.add_argument('--reformatar', action='store_true', help='Regera o arquivo inteiro com ast.unparse em vez de cortar só as docstrings.')
+    parser.add_argument('--sem-cache', action='store_true', help='Reprocessa também os arquivos que já estavam limpos na última execução.')
+    parser.add_argument('--cofre', default=backup_vault.VAULT_DIR, help='Diretório do cofre de backups.')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Lista também os arquivos sem mudanças.')
+    args = parser.parse_args(argv)
+
+    if not args.pasta:
+        root = tk.Tk()
+        DocstringRemoverApp(root)
+        root.mainloop()
+        return 0
+
+    if not os.path.isdir(args.pasta):
+        parser.error(f'diretório não encontrado: {args.pasta}')
+    ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    logger = gui_utils.setup_logger("DocstringRemover", args.log or gui_utils.get_log_path(f'log_docstrings_{ts}.log'))
+    totals = remove_docstrings_in_tree(args.pasta, args.ignorar, logger, jobs=args.jobs, show_unchanged=args.verbose,
+                                       mode=MODE_UNPARSE if args.reformatar else MODE_SPAN, use_cache=not args.sem_cache, vault_dir=args.cofre)
+    return 1 if totals.errors else 0
+
 if __name__ == '__main__':
-    root = tk.Tk()
-    app = DocstringRemoverApp(root)
-    root.mainloop()
+    sys.exit(main())
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import subprocess
 import sys
 from pathlib import Path
 
@@ -11,10 +10,30 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SCRIPT_DIR = Path(__file__).resolve().parent
 
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
-def _run(command: list[str]) -> int:
-    print("$ " + " ".join(command))
-    return subprocess.run(command, cwd=PROJECT_ROOT, check=False).returncode
+from myagilekit.core.process_runner import PROCESS_SUPERVISOR, Job  # noqa: E402
+
+
+def _write_output(_job: Job, _stream: str, text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def _run(command: list[str], timeout: float | None = None) -> int:
+    print("$ " + " ".join(command), flush=True)
+    job = PROCESS_SUPERVISOR.start(command, cwd=PROJECT_ROOT, timeout=timeout, output=_write_output)
+    try:
+        job.wait()
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+    if job.state == "timeout":
+        print(f"Timeout apos {timeout:g}s: {job.name}", file=sys.stderr)
+    elif job.error:
+        print(f"Erro: {job.error}", file=sys.stderr)
+    return job.return_code if job.return_code is not None else 1
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -29,6 +48,12 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Nao usar xvfb-run na smoke suite.",
     )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Tempo maximo, em segundos, de cada etapa da pipeline.",
+    )
     args = parser.parse_args(argv)
 
     smoke_command = [
@@ -36,13 +61,13 @@ def main(argv: list[str] | None = None) -> int:
         str(SCRIPT_DIR / "run_smoke_suite.py"),
         *(("--no-xvfb",) if args.no_xvfb else ()),
     ]
-    result = _run(smoke_command)
+    result = _run(smoke_command, args.timeout)
     if result != 0:
         return result
 
     if args.with_ruff:
         ruff_command = [sys.executable, str(SCRIPT_DIR / "run_incremental_ruff.py")]
-        return _run(ruff_command)
+        return _run(ruff_command, args.timeout)
 
     return 0
 
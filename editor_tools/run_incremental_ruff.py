@@ -30,12 +30,18 @@ RUFF_ZONES = (
             "tool_registry.py",
             "myagilekit/__init__.py",
             "myagilekit/core/__init__.py",
+            "myagilekit/core/config.py",
+            "myagilekit/core/diagnostics.py",
+            "myagilekit/core/history.py",
             "myagilekit/core/logging.py",
             "myagilekit/core/paths.py",
+            "myagilekit/core/probes.py",
             "myagilekit/core/process_runner.py",
             "myagilekit/core/registry.py",
+            "myagilekit/core/telemetry.py",
             "myagilekit/manager/__init__.py",
             "myagilekit/manager/gui.py",
+            "myagilekit/manager/output.py",
             "instalacao/instalador_tk.py",
             "DevTools/main.py",
             "youtube_multilang_downloader/youtube_multilang.py",
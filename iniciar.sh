@@ -80,7 +80,7 @@ import sys
 
 from myagilekit.core.registry import TOOL_CATALOG
 
-required = sorted({module for tool in TOOL_CATALOG for module in tool.requires_modules})
+required = TOOL_CATALOG.required_modules()
 missing = [module for module in required if importlib.util.find_spec(module) is None]
 
 if missing:
@@ -101,7 +101,7 @@ import shutil
 
 from myagilekit.core.registry import TOOL_CATALOG
 
-required = sorted({command for tool in TOOL_CATALOG for command in tool.requires_commands})
+required = TOOL_CATALOG.required_commands()
 missing = [command for command in required if shutil.which(command) is None]
 
 if missing:
@@ -9,18 +9,30 @@ import os
 import platform
 import queue
 import shutil
-import subprocess
 import sys
 import threading
 from collections.abc import Callable
-from dataclasses import dataclass
 from pathlib import Path
 
 BOOTSTRAP_PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(BOOTSTRAP_PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(BOOTSTRAP_PROJECT_ROOT))
 
+from myagilekit.core.diagnostics import (  # noqa: E402
+    DEFAULT_PROBE_TIMEOUT,
+    CheckItem,
+    Probe,
+    SharedResult,
+    command_probe,
+    format_elapsed,
+    module_probe,
+    path_probe,
+    run_diagnostics,
+    static_probe,
+    version_probe,
+)
 from myagilekit.core.paths import CONFIG_DIR, LOGS_DIR, PROJECT_ROOT, ensure_project_layout, log_path  # noqa: E402
+from myagilekit.core.probes import ModuleReport, probe_python_modules  # noqa: E402
 from myagilekit.core.process_runner import run_streamed  # noqa: E402
 
 REQUIREMENTS_FILE = PROJECT_ROOT / "requirements.txt"
@@ -28,30 +40,32 @@ VENV_DIR = PROJECT_ROOT / ".venv"
 PYTHON_BIN = VENV_DIR / ("Scripts/python.exe" if os.name == "nt" else "bin/python")
 
 OutputWriter = Callable[[str], None]
+CHECKED_MODULES = (
+    ("tkinter/ttk", "tkinter"),
+    ("yt-dlp", "yt_dlp"),
+    ("pygame", "pygame"),
+    ("ruff", "ruff"),
+)
 
 
-@dataclass(frozen=True)
-class CheckItem:
-    name: str
-    status: str
-    required: bool = True
-    detail: str = ""
+def python_module_available(module: str, python: str) -> bool:
+    return probe_python_modules(python, (module,))[module].available
 
 
-def python_module_available(module: str, python: str) -> bool:
-    command = [python, "-c", f"import {module}"]
-    try:
-        result = subprocess.run(command, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except OSError:
-        return False
-    return result.returncode == 0
+def probe_checked_modules(python: str) -> dict[str, ModuleReport]:
+    """One interpreter run reporting every module in ``CHECKED_MODULES``."""
 
+    return probe_python_modules(python, (module for _, module in CHECKED_MODULES), timeout=DEFAULT_PROBE_TIMEOUT)
 
-def missing_system_packages(python: str) -> list[str]:
+
+def missing_system_packages(python: str, modules: dict[str, ModuleReport] | None = None) -> list[str]:
     """Return OS packages that cannot be solved inside .venv."""
 
     packages: list[str] = []
-    if not python_module_available("tkinter", python):
+    tkinter_ok = modules["tkinter"].available if modules and "tkinter" in modules else None
+    if tkinter_ok is None:
+        tkinter_ok = python_module_available("tkinter", python)
+    if not tkinter_ok:
         packages.append("python3-tk")
 
     if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
@@ -66,39 +80,43 @@ def python_for_checks() -> str:
     return shutil.which("python3") or sys.executable or "python3"
 
 
+def diagnostic_probes(python: str) -> list[Probe]:
+    modules = SharedResult(lambda: probe_checked_modules(python))
+    return [
+        static_probe("Sistema", f"{platform.system()} {platform.release()}"),
+        path_probe("Ambiente virtual .venv", PYTHON_BIN),
+        path_probe("requirements.txt", REQUIREMENTS_FILE),
+        path_probe("config/myagilekit.toml", CONFIG_DIR / "myagilekit.toml"),
+        *(module_probe(label, module, modules) for label, module in CHECKED_MODULES),
+        version_probe("ffmpeg", ("ffmpeg", "-version")),
+        version_probe("ffprobe", ("ffprobe", "-version")),
+        command_probe("bash", "bash"),
+        command_probe("node ou deno", "node", "deno", required=False, missing_status="Opcional"),
+        path_probe("logs/install", LOGS_DIR / "install"),
+        path_probe("logs/tools", LOGS_DIR / "tools"),
+        path_probe("logs/tests", LOGS_DIR / "tests"),
+        path_probe("logs/errors", LOGS_DIR / "errors"),
+    ]
+
+
 def status_items(python: str | None = None) -> list[CheckItem]:
     python = python or python_for_checks()
     ensure_project_layout()
-    return [
-        CheckItem("Sistema", f"{platform.system()} {platform.release()}", required=False),
-        CheckItem("Ambiente virtual .venv", "OK" if PYTHON_BIN.exists() else "Pendente"),
-        CheckItem("requirements.txt", "OK" if REQUIREMENTS_FILE.exists() else "Pendente"),
-        CheckItem("config/myagilekit.toml", "OK" if (CONFIG_DIR / "myagilekit.toml").exists() else "Pendente"),
-        CheckItem("tkinter/ttk", "OK" if python_module_available("tkinter", python) else "Pendente"),
-        CheckItem("yt-dlp", "OK" if python_module_available("yt_dlp", python) else "Pendente"),
-        CheckItem("pygame", "OK" if python_module_available("pygame", python) else "Pendente"),
-        CheckItem("ruff", "OK" if python_module_available("ruff", python) else "Pendente"),
-        CheckItem("ffmpeg", "OK" if shutil.which("ffmpeg") else "Pendente"),
-        CheckItem("ffprobe", "OK" if shutil.which("ffprobe") else "Pendente"),
-        CheckItem("bash", "OK" if shutil.which("bash") else "Pendente"),
-        CheckItem("node ou deno", "OK" if shutil.which("node") or shutil.which("deno") else "Opcional", required=False),
-        CheckItem("logs/install", "OK" if (LOGS_DIR / "install").exists() else "Pendente"),
-        CheckItem("logs/tools", "OK" if (LOGS_DIR / "tools").exists() else "Pendente"),
-        CheckItem("logs/tests", "OK" if (LOGS_DIR / "tests").exists() else "Pendente"),
-        CheckItem("logs/errors", "OK" if (LOGS_DIR / "errors").exists() else "Pendente"),
-    ]
+    return run_diagnostics(diagnostic_probes(python))
 
 
 def run_check(output: OutputWriter | None = None) -> int:
     writer = output or (lambda text: print(text, end=""))
     items = status_items()
     width = max(len(item.name) for item in items)
+    status_width = max(len(item.status) for item in items)
     writer("Diagnostico myAgileKit\n")
     writer(f"Python usado: {python_for_checks()}\n\n")
     for item in items:
         detail = f" - {item.detail}" if item.detail else ""
-        writer(f"{item.name:<{width}}  {item.status}{detail}\n")
-    return 0 if all(not item.required or item.status == "OK" for item in items) else 1
+        elapsed = f"  [{format_elapsed(item.elapsed)}]" if item.elapsed else ""
+        writer(f"{item.name:<{width}}  {item.status:<{status_width}}{elapsed}{detail}\n")
+    return 0 if all(item.ok for item in items) else 1
 
 
 def new_install_log_path() -> Path:
@@ -142,7 +160,7 @@ def run_install(
 
     if install_system:
         if platform.system() == "Linux":
-            packages = missing_system_packages(str(PYTHON_BIN))
+            packages = missing_system_packages(str(PYTHON_BIN), probe_checked_modules(str(PYTHON_BIN)))
             if packages:
                 _run_step(
                     "Instalando dependencias de sistema indispensaveis",
@@ -0,0 +1,40 @@
+"""Read settings from config/myagilekit.toml."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from .paths import DEFAULT_CONFIG_FILE
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python 3.10: settings fall back to their defaults
+    tomllib = None  # type: ignore[assignment]
+
+
+def load_config(path: Path = DEFAULT_CONFIG_FILE) -> dict[str, Any]:
+    if tomllib is None:
+        return {}
+    try:
+        with path.open("rb") as handle:
+            return tomllib.load(handle)
+    except (OSError, tomllib.TOMLDecodeError):
+        return {}
+
+
+def config_int(
+    section: str,
+    key: str,
+    default: int,
+    *,
+    minimum: int = 1,
+    path: Path = DEFAULT_CONFIG_FILE,
+) -> int:
+    """Integer setting from ``[section]``; missing or invalid values use ``default``."""
+
+    values = load_config(path).get(section)
+    value = values.get(key, default) if isinstance(values, dict) else default
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        return default
+    return value
@@ -0,0 +1,186 @@
+"""Concurrent environment diagnostics used by the installer and the manager."""
+
+from __future__ import annotations
+
+import re
+import shutil
+import subprocess
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from .probes import ModuleReport
+
+DEFAULT_PROBE_TIMEOUT = 15.0
+MAX_DIAGNOSTIC_WORKERS = 16
+
+T = TypeVar("T")
+
+_VERSION_PATTERN = re.compile(r"\d+(?:\.\d+)+[\w.+-]*")
+
+
+@dataclass(frozen=True)
+class CheckItem:
+    name: str
+    status: str
+    required: bool = True
+    detail: str = ""
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.required or self.status == "OK"
+
+
+@dataclass(frozen=True)
+class Probe:
+    """Independent check that produces one CheckItem."""
+
+    name: str
+    run: Callable[[], CheckItem]
+    required: bool = True
+    timeout: float = DEFAULT_PROBE_TIMEOUT
+
+
+class SharedResult(Generic[T]):
+    """Runs an expensive call once and hands the result to every probe that needs it."""
+
+    def __init__(self, compute: Callable[[], T]) -> None:
+        self._compute = compute
+        self._lock = threading.Lock()
+        self._done = False
+        self._value: T | None = None
+
+    def __call__(self) -> T:
+        with self._lock:
+            if not self._done:
+                self._value = self._compute()
+                self._done = True
+        return self._value  # type: ignore[return-value]
+
+
+def static_probe(name: str, status: str, *, required: bool = False, detail: str = "") -> Probe:
+    return Probe(name, lambda: CheckItem(name, status, required, detail), required=required)
+
+
+def path_probe(name: str, path: Path, *, required: bool = True) -> Probe:
+    def run() -> CheckItem:
+        return CheckItem(name, "OK" if path.exists() else "Pendente", required)
+
+    return Probe(name, run, required=required)
+
+
+def command_probe(
+    name: str,
+    *commands: str,
+    required: bool = True,
+    missing_status: str = "Pendente",
+) -> Probe:
+    def run() -> CheckItem:
+        for command in commands:
+            found = shutil.which(command)
+            if found:
+                return CheckItem(name, "OK", required, found)
+        return CheckItem(name, missing_status, required)
+
+    return Probe(name, run, required=required)
+
+
+def version_probe(
+    name: str,
+    command: Sequence[str],
+    *,
+    required: bool = True,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> Probe:
+    def run() -> CheckItem:
+        if shutil.which(command[0]) is None:
+            return CheckItem(name, "Pendente", required)
+        try:
+            result = subprocess.run(
+                list(command),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                timeout=timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired) as exc:
+            return CheckItem(name, "Pendente", required, str(exc))
+        if result.returncode != 0:
+            return CheckItem(name, "Pendente", required, f"codigo {result.returncode}")
+        first_line = result.stdout.strip().splitlines()[0] if result.stdout.strip() else ""
+        match = _VERSION_PATTERN.search(first_line)
+        return CheckItem(name, "OK", required, f"versao {match.group(0)}" if match else "")
+
+    return Probe(name, run, required=required, timeout=timeout)
+
+
+def module_probe(
+    name: str,
+    module: str,
+    reports: Callable[[], dict[str, ModuleReport]],
+    *,
+    required: bool = True,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> Probe:
+    """Read one module from a shared batched report (see ``SharedResult``)."""
+
+    def run() -> CheckItem:
+        report = reports().get(module, ModuleReport(False))
+        detail = f"versao {report.version}" if report.available and report.version else ""
+        return CheckItem(name, "OK" if report.available else "Pendente", required, detail)
+
+    return Probe(name, run, required=required, timeout=timeout)
+
+
+def _timed(probe: Probe) -> CheckItem:
+    started = time.perf_counter()
+    try:
+        item = probe.run()
+    except Exception as exc:  # a broken probe must not hide the others
+        item = CheckItem(probe.name, "Erro", probe.required, str(exc))
+    return replace(item, elapsed=time.perf_counter() - started)
+
+
+def run_diagnostics(probes: Iterable[Probe], *, max_workers: int = MAX_DIAGNOSTIC_WORKERS) -> list[CheckItem]:
+    """Run every probe concurrently and return the items in declaration order."""
+
+    probes = list(probes)
+    if not probes:
+        return []
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(probes)), thread_name_prefix="diagnostic")
+    started = time.perf_counter()
+    try:
+        futures = [executor.submit(_timed, probe) for probe in probes]
+        items: list[CheckItem] = []
+        for probe, future in zip(probes, futures, strict=True):
+            remaining = max(0.0, started + probe.timeout - time.perf_counter())
+            try:
+                items.append(future.result(timeout=remaining))
+            except FutureTimeoutError:
+                future.cancel()
+                items.append(
+                    CheckItem(
+                        probe.name,
+                        "Timeout",
+                        probe.required,
+                        f"sem resposta em {probe.timeout:g}s",
+                        probe.timeout,
+                    )
+                )
+        return items
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def format_elapsed(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.1f} s"
+    return f"{seconds * 1000:.0f} ms"
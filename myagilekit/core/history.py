@@ -0,0 +1,312 @@
+"""Execution history stored in SQLite (WAL) with indexed queries."""
+
+from __future__ import annotations
+
+import contextlib
+import datetime as _dt
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .paths import log_path
+
+HISTORY_FILENAME = "execution_history.sqlite3"
+LEGACY_HISTORY_FILENAME = "execution_history.jsonl"
+HISTORY_MAX_ROWS = 5000
+COMPACT_EVERY = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    action TEXT NOT NULL,
+    tool TEXT,
+    command TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    duration REAL,
+    return_code INTEGER,
+    state TEXT NOT NULL DEFAULT 'running',
+    launch_latency REAL,
+    peak_rss INTEGER,
+    cpu_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS runs_tool_started ON runs (tool, started_at);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at);
+"""
+
+# Columns added after the first schema; older databases get them on open.
+_LATER_COLUMNS = (
+    ("launch_latency", "REAL"),
+    ("peak_rss", "INTEGER"),
+    ("cpu_seconds", "REAL"),
+)
+
+
+@dataclass(frozen=True)
+class HistoryRun:
+    id: int
+    action: str
+    tool: str | None
+    command: tuple[str, ...]
+    started_at: float
+    finished_at: float | None
+    duration: float | None
+    return_code: int | None
+    state: str
+    launch_latency: float | None = None
+    peak_rss: int | None = None
+    cpu_seconds: float | None = None
+
+    @property
+    def started(self) -> _dt.datetime:
+        return _dt.datetime.fromtimestamp(self.started_at)
+
+
+@dataclass(frozen=True)
+class ToolStats:
+    tool: str
+    runs: int
+    failures: int
+    p95: float | None
+    crashes: int = 0
+    mean_launch_latency: float | None = None
+    mean_peak_rss: float | None = None
+    mean_cpu_seconds: float | None = None
+
+
+def percentile(values: list[float], percent: float) -> float | None:
+    """Nearest-rank percentile of already sorted ``values``."""
+
+    if not values:
+        return None
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class ExecutionHistory:
+    """Records manager actions and answers "last runs of X" / "p95 per tool" from indexes.
+
+    Old rows are compacted automatically so the database stays bounded: every
+    ``COMPACT_EVERY`` run ids (persisted, so short sessions add up) and when
+    ``open_execution_history`` opens the database.
+    """
+
+    def __init__(self, path: Path, *, max_rows: int = HISTORY_MAX_ROWS) -> None:
+        if max_rows < 1:
+            raise ValueError("max_rows deve ser maior que zero")
+        self.path = path
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(_SCHEMA)
+        existing = {row["name"] for row in self._connection.execute("PRAGMA table_info(runs)")}
+        for column, kind in _LATER_COLUMNS:
+            if column not in existing:
+                self._connection.execute(f"ALTER TABLE runs ADD COLUMN {column} {kind}")
+
+    def record_start(
+        self,
+        action: str,
+        command: list[str],
+        tool: str | None = None,
+        *,
+        started_at: float | None = None,
+        state: str = "running",
+        launch_latency: float | None = None,
+    ) -> int:
+        if started_at is None:
+            started_at = time.time()
+        with self._transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO runs (action, tool, command, started_at, state, launch_latency) VALUES (?, ?, ?, ?, ?, ?)",
+                (action, tool, json.dumps(command, ensure_ascii=False), started_at, state, launch_latency),
+            )
+            run_id = int(cursor.lastrowid)
+            if run_id % COMPACT_EVERY == 0:
+                self._delete_old_rows(cursor, self.max_rows)
+        return run_id
+
+    def record_end(
+        self,
+        run_id: int,
+        *,
+        return_code: int | None,
+        state: str = "finished",
+        finished_at: float | None = None,
+        duration: float | None = None,
+        peak_rss: int | None = None,
+        cpu_seconds: float | None = None,
+    ) -> None:
+        if finished_at is None:
+            finished_at = time.time()
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE runs SET finished_at = ?, return_code = ?, state = ?, "
+                "duration = COALESCE(?, ? - started_at), peak_rss = ?, cpu_seconds = ? WHERE id = ?",
+                (finished_at, return_code, state, duration, finished_at, peak_rss, cpu_seconds, run_id),
+            )
+
+    def recent(self, limit: int = 50, *, tool: str | None = None, action: str | None = None) -> list[HistoryRun]:
+        where, params = _filters(tool=tool, action=action)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT * FROM runs{where} ORDER BY started_at DESC, id DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [_run_from_row(row) for row in rows]
+
+    def tool_stats(
+        self,
+        percent: float = 95,
+        *,
+        tool: str | None = None,
+        action: str | None = None,
+    ) -> list[ToolStats]:
+        """Aggregates for every tool with finished runs: failures, crashes, p95 and resource means."""
+
+        where, params = _filters("finished_at IS NOT NULL", tool=tool, action=action)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT COALESCE(tool, action) AS name, duration, return_code, launch_latency, peak_rss, cpu_seconds "
+                f"FROM runs{where} ORDER BY name, duration",
+                params,
+            ).fetchall()
+
+        grouped: dict[str, list[sqlite3.Row]] = {}
+        for row in rows:
+            grouped.setdefault(row["name"], []).append(row)
+        return [_stats_from_rows(name, runs, percent) for name, runs in grouped.items()]
+
+    def tool_summary(self, tool: str, *, action: str | None = None) -> ToolStats | None:
+        stats = self.tool_stats(tool=tool, action=action)
+        return stats[0] if stats else None
+
+    def compact(self, max_rows: int | None = None) -> int:
+        """Delete the oldest rows beyond ``max_rows`` and return how many were removed."""
+
+        with self._transaction() as cursor:
+            removed = self._delete_old_rows(cursor, max_rows or self.max_rows)
+        with self._lock:
+            # Each step of the pragma frees one page and yields a zero-column row, which
+            # execute() never steps past; executescript() runs it until every page is freed.
+            self._connection.executescript("PRAGMA incremental_vacuum;")
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
+
+    def import_jsonl(self, path: Path) -> int:
+        """Import the old ``execution_history.jsonl`` lines (start time only)."""
+
+        imported = 0
+        with contextlib.suppress(OSError), path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    event = json.loads(line)
+                    started_at = _dt.datetime.fromisoformat(event["timestamp"]).timestamp()
+                    command = [str(part) for part in event["command"]]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                self.record_start(
+                    str(event.get("action", "?")),
+                    command,
+                    event.get("tool"),
+                    started_at=started_at,
+                    state="imported",
+                )
+                imported += 1
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+
+    def _delete_old_rows(self, cursor: sqlite3.Cursor, max_rows: int) -> int:
+        cursor.execute(
+            "DELETE FROM runs WHERE id <= (SELECT MAX(id) FROM runs) - ?",
+            (max_rows,),
+        )
+        return cursor.rowcount
+
+
+def _filters(*required: str, tool: str | None, action: str | None) -> tuple[str, list[str]]:
+    clauses, params = list(required), []
+    if tool is not None:
+        clauses.append("tool = ?")
+        params.append(tool)
+    if action is not None:
+        clauses.append("action = ?")
+        params.append(action)
+    return (" WHERE " + " AND ".join(clauses) if clauses else "", params)
+
+
+def _mean(values: list[float]) -> float | None:
+    return sum(values) / len(values) if values else None
+
+
+def _stats_from_rows(name: str, rows: list[sqlite3.Row], percent: float) -> ToolStats:
+    def column(key: str) -> list[float]:
+        return [row[key] for row in rows if row[key] is not None]
+
+    codes = column("return_code")
+    return ToolStats(
+        tool=name,
+        runs=len(rows),
+        failures=sum(1 for code in codes if code != 0),
+        p95=percentile(column("duration"), percent),
+        crashes=sum(1 for code in codes if code < 0),
+        mean_launch_latency=_mean(column("launch_latency")),
+        mean_peak_rss=_mean(column("peak_rss")),
+        mean_cpu_seconds=_mean(column("cpu_seconds")),
+    )
+
+
+def _run_from_row(row: sqlite3.Row) -> HistoryRun:
+    return HistoryRun(
+        id=row["id"],
+        action=row["action"],
+        tool=row["tool"],
+        command=tuple(json.loads(row["command"])),
+        started_at=row["started_at"],
+        finished_at=row["finished_at"],
+        duration=row["duration"],
+        return_code=row["return_code"],
+        state=row["state"],
+        launch_latency=row["launch_latency"],
+        peak_rss=row["peak_rss"],
+        cpu_seconds=row["cpu_seconds"],
+    )
+
+
+def open_execution_history(*, max_rows: int = HISTORY_MAX_ROWS) -> ExecutionHistory:
+    """Open ``logs/tools/execution_history.sqlite3``, migrating the old JSONL file once and compacting it."""
+
+    history = ExecutionHistory(log_path(HISTORY_FILENAME, "tools"), max_rows=max_rows)
+    legacy = log_path(LEGACY_HISTORY_FILENAME, "tools")
+    if legacy.exists():
+        history.import_jsonl(legacy)
+        with contextlib.suppress(OSError):
+            legacy.replace(legacy.with_suffix(".jsonl.imported"))
+    with contextlib.suppress(sqlite3.Error):
+        history.compact()
+    return history
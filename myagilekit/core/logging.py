@@ -1,12 +1,222 @@
-"""Logging helpers for myAgileKit scripts."""
+"""Logging helpers for myAgileKit scripts.
+
+File output goes through one ``QueueListener`` thread: callers only enqueue
+records, and the listener writes them to rotating files under ``logs/``.
+"""
 
 from __future__ import annotations
 
+import atexit
+import copy
+import datetime as _dt
+import json
 import logging
+import logging.handlers
+import queue
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 
 from .paths import log_path
 
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+
+@dataclass(frozen=True)
+class LogRotation:
+    """Size rotation by default; ``when`` (e.g. ``"midnight"``) switches to time rotation."""
+
+    max_bytes: int = LOG_MAX_BYTES
+    backup_count: int = LOG_BACKUP_COUNT
+    when: str | None = None
+
+
+DEFAULT_ROTATION = LogRotation()
+CATEGORY_ROTATION = {
+    "errors": LogRotation(when="midnight", backup_count=14),
+}
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per line, for logs that are read by tools instead of people."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": _dt.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _TargetQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records tagged with the file handler that must write them."""
+
+    def __init__(self, backend: LogBackend, target: logging.Handler, path: Path) -> None:
+        super().__init__(backend.queue)
+        # Only the file handler's formatter should apply (basicConfig fills in missing ones).
+        self.setFormatter(logging.Formatter("%(message)s"))
+        self.backend = backend
+        self.target = target
+        self.path = path
+        self._released = False
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() folds the traceback into the message and drops exc_text;
+        # keep it apart so the file handler's formatter places it (JSON: "exception").
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        prepared = copy.copy(record)
+        prepared.message = prepared.msg = record.getMessage()
+        prepared.args = None
+        prepared.exc_info = None
+        prepared.exc_text = exc_text
+        prepared.log_target = self.target
+        return prepared
+
+    def close(self) -> None:
+        # logging.shutdown() closes every handler again at exit.
+        if not self._released:
+            self._released = True
+            self.backend.release(self.path)
+        super().close()
+
+
+class _RoutingHandler(logging.Handler):
+    """Runs on the listener thread and hands each record to its own file handler."""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        target = getattr(record, "log_target", None)
+        if getattr(record, "log_close", False) and target is not None:
+            target.close()
+        elif target is not None:
+            target.handle(record)
+        return True
+
+
+class LogBackend:
+    """Single writer thread shared by every file logger of the process."""
+
+    def __init__(self) -> None:
+        self.queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._targets: dict[Path, tuple[logging.Handler, int]] = {}
+        self._listener: logging.handlers.QueueListener | None = None
+
+    def file_handler(
+        self,
+        path: Path,
+        *,
+        formatter: logging.Formatter,
+        rotation: LogRotation = DEFAULT_ROTATION,
+        mode: str = "a",
+    ) -> logging.Handler:
+        """Return a non-blocking handler that writes ``path`` from the listener thread."""
+
+        path = path.resolve()
+        with self._lock:
+            target, users = self._targets.get(path, (None, 0))
+            if target is None:
+                # The first caller's formatter and rotation win for a shared file.
+                target = _open_target(path, rotation, mode)
+                target.setFormatter(formatter)
+            self._targets[path] = (target, users + 1)
+            self._ensure_started()
+        return _TargetQueueHandler(self, target, path)
+
+    def release(self, path: Path) -> None:
+        with self._lock:
+            target, users = self._targets.get(path, (None, 0))
+            if target is None:
+                return
+            if users > 1:
+                self._targets[path] = (target, users - 1)
+                return
+            del self._targets[path]
+        # Closed by the listener after every record queued before it.
+        marker = logging.makeLogRecord({"log_target": target, "log_close": True})
+        self.queue.put(marker)
+
+    def flush(self) -> None:
+        """Wait until every queued record is written."""
+
+        with self._lock:
+            if self._listener is None:
+                return
+        done = threading.Event()
+        self.queue.put(logging.makeLogRecord({"log_target": _EventHandler(done)}))
+        done.wait()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            listener, self._listener = self._listener, None
+            targets = [target for target, _users in self._targets.values()]
+            self._targets.clear()
+        if listener is not None:
+            listener.stop()
+        for target in targets:
+            target.close()
+
+    def _ensure_started(self) -> None:
+        if self._listener is None:
+            self._listener = logging.handlers.QueueListener(self.queue, _RoutingHandler())
+            self._listener.start()
+
+
+class _EventHandler(logging.Handler):
+    def __init__(self, event: threading.Event) -> None:
+        super().__init__()
+        self.event = event
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        self.event.set()
+        return True
+
+
+def _open_target(path: Path, rotation: LogRotation, mode: str) -> logging.Handler:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if mode == "w":
+        path.write_bytes(b"")
+    if rotation.when is not None:
+        return logging.handlers.TimedRotatingFileHandler(
+            path,
+            when=rotation.when,
+            backupCount=rotation.backup_count,
+            encoding="utf-8",
+        )
+    return logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=rotation.max_bytes,
+        backupCount=rotation.backup_count,
+        encoding="utf-8",
+    )
+
+
+LOG_BACKEND = LogBackend()
+atexit.register(LOG_BACKEND.shutdown)
+
+
+def queue_file_handler(
+    path: Path | str,
+    *,
+    formatter: logging.Formatter | None = None,
+    json_lines: bool = False,
+    rotation: LogRotation = DEFAULT_ROTATION,
+    mode: str = "a",
+) -> logging.Handler:
+    if formatter is None:
+        formatter = JsonLineFormatter() if json_lines else logging.Formatter(LOG_FORMAT)
+    return LOG_BACKEND.file_handler(Path(path), formatter=formatter, rotation=rotation, mode=mode)
+
 
 def configure_file_logger(
     name: str,
@@ -14,24 +224,34 @@ def configure_file_logger(
     *,
     category: str = "tools",
     level: int = logging.DEBUG,
+    json_lines: bool = False,
+    rotation: LogRotation | None = None,
 ) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
     target = log_path(filename, category)
     if not _has_handler_for(logger, target):
-        handler = logging.FileHandler(target, encoding="utf-8")
+        if rotation is None:
+            rotation = CATEGORY_ROTATION.get(category, DEFAULT_ROTATION)
+        handler = queue_file_handler(target, json_lines=json_lines, rotation=rotation)
         handler.setLevel(level)
-        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
         logger.addHandler(handler)
 
     return logger
 
 
+def shutdown_logging() -> None:
+    """Flush and close every file written by the queue backend."""
+
+    LOG_BACKEND.shutdown()
+
+
 def _has_handler_for(logger: logging.Logger, target: Path) -> bool:
     target = target.resolve()
     for handler in logger.handlers:
+        if isinstance(handler, _TargetQueueHandler) and handler.path == target:
+            return True
         if isinstance(handler, logging.FileHandler) and Path(handler.baseFilename).resolve() == target:
             return True
     return False
-
@@ -9,6 +9,7 @@ CONFIG_DIR = PROJECT_ROOT / "config"
 DEFAULT_CONFIG_FILE = CONFIG_DIR / "myagilekit.toml"
 LOGS_DIR = PROJECT_ROOT / "logs"
 LOG_SUBDIRS = ("install", "tools", "tests", "errors")
+CACHE_DIR = PROJECT_ROOT / ".myagilekit-cache"
 
 
 def _safe_child(base_dir: Path, filename: str) -> Path:
@@ -43,6 +44,15 @@ def log_path(filename: str, category: str | None = None) -> Path:
     return _safe_child(ensure_logs_dir(category), filename)
 
 
+def ensure_cache_dir() -> Path:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return CACHE_DIR
+
+
+def cache_path(filename: str) -> Path:
+    return _safe_child(ensure_cache_dir(), filename)
+
+
 def ensure_project_layout() -> None:
     ensure_config_dir()
     ensure_logs_dir()
@@ -0,0 +1,195 @@
+"""Cached dependency probes shared by the registry, manager and installer."""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+from .paths import PROJECT_ROOT
+
+DEFAULT_PROBE_TTL = 30.0
+MODULE_PROBE_TIMEOUT = 30.0
+
+T = TypeVar("T")
+
+# Executed inside the target interpreter: one process answers for every module.
+_MODULE_PROBE_SCRIPT = """
+import importlib.util, json, sys
+try:
+    from importlib import metadata
+    distributions = metadata.packages_distributions()
+except Exception:
+    metadata = None
+    distributions = {}
+companions = {"tkinter": "_tkinter"}
+report = {}
+for name in sys.argv[1:]:
+    found = True
+    for candidate in (name, companions.get(name)):
+        if candidate is None:
+            continue
+        try:
+            found = found and importlib.util.find_spec(candidate) is not None
+        except (ImportError, ValueError):
+            found = False
+    version = None
+    if found and metadata is not None:
+        top_level = name.split(".")[0]
+        for dist in distributions.get(top_level, [top_level]):
+            try:
+                version = metadata.version(dist)
+                break
+            except Exception:
+                continue
+    report[name] = {"available": found, "version": version}
+print(json.dumps(report))
+"""
+
+
+@dataclass(frozen=True)
+class ModuleReport:
+    available: bool
+    version: str | None = None
+
+
+def probe_python_modules(
+    python: str,
+    modules: Iterable[str],
+    *,
+    timeout: float = MODULE_PROBE_TIMEOUT,
+) -> dict[str, ModuleReport]:
+    """Check many modules with a single run of ``python``; failures mark every module as missing."""
+
+    names = list(dict.fromkeys(modules))
+    if not names:
+        return {}
+    missing = {name: ModuleReport(False) for name in names}
+
+    try:
+        result = subprocess.run(
+            [python, "-c", _MODULE_PROBE_SCRIPT, *names],
+            cwd=PROJECT_ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=timeout,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return missing
+    if result.returncode != 0:
+        return missing
+
+    try:
+        raw = json.loads(result.stdout)
+    except ValueError:
+        return missing
+    if not isinstance(raw, dict):
+        return missing
+
+    report: dict[str, ModuleReport] = {}
+    for name in names:
+        entry = raw.get(name)
+        if not isinstance(entry, dict):
+            report[name] = ModuleReport(False)
+            continue
+        version = entry.get("version")
+        report[name] = ModuleReport(bool(entry.get("available")), version if isinstance(version, str) else None)
+    return report
+
+
+def is_running_interpreter(python: str | None) -> bool:
+    if not python:
+        return True
+    current = sys.executable or ""
+    return os.path.normcase(os.path.abspath(python)) == os.path.normcase(os.path.abspath(current))
+
+
+def _find_module(module_name: str) -> bool:
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class ProbeCache:
+    """Memoizes module, PATH and file probes for a limited time.
+
+    Entries are keyed by the running interpreter and the current PATH, so a
+    changed environment never reuses stale answers.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_PROBE_TTL, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: dict[tuple[str, str, str, str], tuple[float, object]] = {}
+        self._lock = threading.Lock()
+
+    def module_available(self, module_name: str, python: str | None = None) -> bool:
+        if is_running_interpreter(python):
+            return self._get_or_probe("module", module_name, lambda: _find_module(module_name))
+        assert python is not None
+        return self.prefetch_modules((module_name,), python)[module_name].available
+
+    def prefetch_modules(self, module_names: Iterable[str], python: str) -> dict[str, ModuleReport]:
+        """Resolve every uncached module for ``python`` with one batched probe."""
+
+        names = list(dict.fromkeys(module_names))
+        now = self._clock()
+        reports: dict[str, ModuleReport] = {}
+        stale: list[str] = []
+        with self._lock:
+            for name in names:
+                entry = self._entries.get(self._key("interpreter-module", name, python))
+                if entry is not None and now - entry[0] < self.ttl:
+                    reports[name] = entry[1]  # type: ignore[assignment]
+                else:
+                    stale.append(name)
+
+        if stale:
+            fresh = probe_python_modules(python, stale)
+            with self._lock:
+                for name, report in fresh.items():
+                    self._entries[self._key("interpreter-module", name, python)] = (now, report)
+            reports.update(fresh)
+        return reports
+
+    def which(self, command_name: str) -> str | None:
+        return self._get_or_probe("command", command_name, lambda: shutil.which(command_name))
+
+    def path_exists(self, path: Path) -> bool:
+        return self._get_or_probe("path", str(path), path.exists)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        importlib.invalidate_caches()
+
+    def _key(self, kind: str, name: str, python: str | None = None) -> tuple[str, str, str, str]:
+        return (kind, name, python or sys.executable or "", os.environ.get("PATH", ""))
+
+    def _get_or_probe(self, kind: str, name: str, probe: Callable[[], T]) -> T:
+        key = self._key(kind, name)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]  # type: ignore[return-value]
+
+        value = probe()
+        with self._lock:
+            self._entries[key] = (now, value)
+        return value
+
+
+PROBE_CACHE = ProbeCache()
@@ -2,15 +2,102 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import codecs
+import contextlib
+import io
+import itertools
+import locale
 import os
+import queue
 import subprocess
-from collections.abc import Callable
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
 from pathlib import Path
 
 from .paths import PROJECT_ROOT
 
 OutputWriter = Callable[[str], None]
 
+READ_CHUNK_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 0.5
+LOG_FLUSH_BYTES = 64 * 1024
+JOB_TERMINATE_GRACE = 3.0
+
+
+class BufferedLogWriter:
+    """Append-only log handle that flushes by size or after a time interval.
+
+    Pending text is also flushed by a timer, so a child that goes quiet after a
+    short burst still has its output on disk within ``flush_interval``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        flush_bytes: int = LOG_FLUSH_BYTES,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = path.open("a", encoding="utf-8")
+        self._pending: list[str] = []
+        self._pending_size = 0
+        self._flush_interval = flush_interval
+        self._flush_bytes = flush_bytes
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            self._pending.append(text)
+            self._pending_size += len(text)
+            if self._pending_size >= self._flush_bytes or time.monotonic() - self._last_flush >= self._flush_interval:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._handle.closed:
+            return
+        if self._pending:
+            self._handle.write("".join(self._pending))
+            self._pending.clear()
+            self._pending_size = 0
+        self._handle.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._handle.close()
+
+    def __enter__(self) -> BufferedLogWriter:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+def stream_decoder(encoding: str | None = None) -> io.IncrementalNewlineDecoder:
+    """Incremental decoder matching ``text=True``: tolerant of split characters and ``\\r\\n``."""
+
+    decoder = codecs.getincrementaldecoder(encoding or locale.getpreferredencoding(False))(errors="replace")
+    return io.IncrementalNewlineDecoder(decoder, translate=True)
+
 
 def run_streamed(
     command: list[str],
@@ -18,28 +105,308 @@ def run_streamed(
     cwd: Path = PROJECT_ROOT,
     output: OutputWriter | None = None,
     log_file: Path | None = None,
+    encoding: str | None = None,
 ) -> int:
+    header = "$ " + " ".join(command) + "\n"
     if output is not None:
-        output("$ " + " ".join(command) + "\n")
-    if log_file is not None:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        with log_file.open("a", encoding="utf-8") as handle:
-            handle.write("$ " + " ".join(command) + "\n")
-
-    process = subprocess.Popen(
-        command,
-        cwd=cwd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        env={**os.environ, "PYTHONUNBUFFERED": "1"},
-    )
-    assert process.stdout is not None
-    for line in process.stdout:
-        if output is not None:
-            output(line)
-        if log_file is not None:
-            with log_file.open("a", encoding="utf-8") as handle:
-                handle.write(line)
-
-    return process.wait()
+        output(header)
+    log = BufferedLogWriter(log_file) if log_file is not None else None
+
+    try:
+        if log is not None:
+            log.write(header)
+            log.flush()
+
+        process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        )
+        assert process.stdout is not None
+        decoder = stream_decoder(encoding)
+        try:
+            while True:
+                chunk = process.stdout.read1(READ_CHUNK_SIZE)
+                text = decoder.decode(chunk, final=not chunk)
+                if text:
+                    if output is not None:
+                        output(text)
+                    if log is not None:
+                        log.write(text)
+                if not chunk:
+                    break
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            process.stdout.close()
+
+        return process.wait()
+    finally:
+        if log is not None:
+            log.close()
+
+
+JobOutput = Callable[["Job", str, str], None]
+JobCallback = Callable[["Job"], None]
+
+
+class Job:
+    """Handle for a child process managed by ``ProcessSupervisor``."""
+
+    def __init__(
+        self,
+        job_id: int,
+        name: str,
+        command: list[str],
+        *,
+        timeout: float | None,
+        output: JobOutput | None,
+    ) -> None:
+        self.id = job_id
+        self.name = name
+        self.command = command
+        self.timeout = timeout
+        self.state = "pending"
+        self.pid: int | None = None
+        self.return_code: int | None = None
+        self.error: str | None = None
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._output = output
+        self._chunks: queue.Queue[str | None] | None = queue.Queue() if output is None else None
+        self._done = threading.Event()
+        self._cancel_requested = False
+        self._request_cancel: Callable[[], None] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def cancel(self) -> None:
+        if self.done:
+            return
+        self._cancel_requested = True
+        if self._request_cancel is not None:
+            self._request_cancel()
+
+    def wait(self, timeout: float | None = None) -> int | None:
+        self._done.wait(timeout)
+        return self.return_code
+
+    def stream(self) -> Iterator[str]:
+        """Yield output chunks until the job ends (only for jobs started without ``output``)."""
+
+        if self._chunks is None:
+            raise RuntimeError("a saida deste job ja e entregue ao callback output")
+        while True:
+            chunk = self._chunks.get()
+            if chunk is None:
+                return
+            yield chunk
+
+    def _emit(self, stream: str, text: str) -> None:
+        if self._output is not None:
+            self._output(self, stream, text)
+        elif self._chunks is not None:
+            self._chunks.put(text)
+
+    def _finish(self, state: str, return_code: int | None = None, error: str | None = None) -> None:
+        if self.done:
+            return
+        self.state = state
+        self.return_code = return_code
+        self.error = error
+        self.finished_at = time.time()
+        if self._chunks is not None:
+            self._chunks.put(None)
+        self._done.set()
+
+
+class ProcessSupervisor:
+    """Runs child processes on one asyncio loop thread instead of a reader thread per process.
+
+    ``start`` may be called from any thread. Output and exit callbacks run on the
+    loop thread, so GUI code should hand the data over through a queue.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: dict[int, Job] = {}
+
+    def start(
+        self,
+        command: list[str],
+        *,
+        name: str | None = None,
+        cwd: Path = PROJECT_ROOT,
+        timeout: float | None = None,
+        output: JobOutput | None = None,
+        on_exit: JobCallback | None = None,
+        log_file: Path | None = None,
+        merge_stderr: bool = True,
+        env: dict[str, str] | None = None,
+    ) -> Job:
+        loop = self._ensure_loop()
+        job = Job(next(self._ids), name or command[0], list(command), timeout=timeout, output=output)
+        with self._lock:
+            self._jobs[job.id] = job
+
+        job._request_cancel = lambda: loop.call_soon_threadsafe(self._cancel_task, job)
+        coroutine = self._run(job, cwd, log_file, merge_stderr, env, on_exit)
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        future.add_done_callback(lambda done: self._on_future_done(job, done, on_exit))
+        return job
+
+    def jobs(self, *, active_only: bool = False) -> list[Job]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job for job in jobs if not job.done] if active_only else jobs
+
+    def cancel_all(self) -> None:
+        for job in self.jobs(active_only=True):
+            job.cancel()
+
+    def shutdown(self, timeout: float = JOB_TERMINATE_GRACE * 2) -> None:
+        jobs = self.jobs(active_only=True)
+        for job in jobs:
+            job.cancel()
+        for job in jobs:
+            job.wait(timeout)
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and thread is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="process-supervisor", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _cancel_task(self, job: Job) -> None:
+        # Runs on the loop thread; before _run starts the flag alone is enough.
+        if job._task is not None and not job._task.done():
+            job._task.cancel()
+
+    def _on_future_done(self, job: Job, future: Future[None], on_exit: JobCallback | None) -> None:
+        if not job.done:
+            error = future.exception() if not future.cancelled() else None
+            job._finish("failed", error=str(error) if error else "job interrompido")
+            if on_exit is not None:
+                on_exit(job)
+        with self._lock:
+            self._jobs.pop(job.id, None)
+
+    async def _run(
+        self,
+        job: Job,
+        cwd: Path,
+        log_file: Path | None,
+        merge_stderr: bool,
+        env: dict[str, str] | None,
+        on_exit: JobCallback | None,
+    ) -> None:
+        job._task = asyncio.current_task()
+        log = BufferedLogWriter(log_file) if log_file is not None else None
+        job.started_at = time.time()
+        process: asyncio.subprocess.Process | None = None
+        try:
+            if job._cancel_requested:
+                job._finish("cancelled")
+                return
+            if log is not None:
+                log.write("$ " + " ".join(job.command) + "\n")
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *job.command,
+                    cwd=cwd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.PIPE,
+                    env=env if env is not None else {**os.environ, "PYTHONUNBUFFERED": "1"},
+                )
+            except OSError as exc:
+                job._finish("failed", error=str(exc))
+                return
+
+            job.pid = process.pid
+            job.state = "running"
+            return_code = await asyncio.wait_for(self._communicate(job, process, log), job.timeout)
+            job._finish("finished", return_code)
+        except asyncio.TimeoutError:
+            job._finish("timeout", await self._terminate(process))
+        except asyncio.CancelledError:
+            job._finish("cancelled", await self._terminate(process))
+        finally:
+            if log is not None:
+                log.close()
+            if on_exit is not None and job.done:
+                on_exit(job)
+
+    async def _communicate(
+        self,
+        job: Job,
+        process: asyncio.subprocess.Process,
+        log: BufferedLogWriter | None,
+    ) -> int:
+        pumps = [self._pump(job, process.stdout, "stdout", log)]
+        if process.stderr is not None:
+            pumps.append(self._pump(job, process.stderr, "stderr", log))
+        await asyncio.gather(*pumps)
+        return await process.wait()
+
+    async def _pump(
+        self,
+        job: Job,
+        reader: asyncio.StreamReader | None,
+        stream: str,
+        log: BufferedLogWriter | None,
+    ) -> None:
+        if reader is None:
+            return
+        decoder = stream_decoder()
+        while True:
+            chunk = await reader.read(READ_CHUNK_SIZE)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                job._emit(stream, text)
+                if log is not None:
+                    log.write(text)
+            if not chunk:
+                return
+
+    async def _terminate(self, process: asyncio.subprocess.Process | None) -> int | None:
+        if process is None:
+            return None
+        with contextlib.suppress(ProcessLookupError):
+            process.terminate()
+        try:
+            return await asyncio.wait_for(process.wait(), JOB_TERMINATE_GRACE)
+        except asyncio.TimeoutError:
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+            return await process.wait()
+
+
+PROCESS_SUPERVISOR = ProcessSupervisor()
+atexit.register(PROCESS_SUPERVISOR.shutdown)
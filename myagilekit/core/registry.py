@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
-import importlib.util
+import contextlib
 import json
+import os
 import shutil
 import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
-from .paths import PROJECT_ROOT, ensure_logs_dir
+from .paths import CACHE_DIR, PROJECT_ROOT, ensure_logs_dir
+from .probes import PROBE_CACHE, ProbeCache, is_running_interpreter
 
 TOOL_MANIFEST_DIR = PROJECT_ROOT / "config" / "tools"
+CATALOG_SNAPSHOT_FILENAME = "tool_catalog.json"
+CATALOG_SNAPSHOT_VERSION = 1
 
 
 @dataclass(frozen=True)
@@ -50,13 +56,6 @@ def python_executable() -> str:
     return sys.executable or shutil.which("python3") or "python3"
 
 
-def _module_available(module_name: str) -> bool:
-    try:
-        return importlib.util.find_spec(module_name) is not None
-    except (ImportError, ValueError):
-        return False
-
-
 def build_launch_command(tool: ToolDefinition) -> list[str]:
     entrypoint = str(tool.entrypoint_path)
     if tool.launch_mode == "python":
@@ -77,26 +76,48 @@ def build_launch_command(tool: ToolDefinition) -> list[str]:
     raise ValueError(f"Modo de execucao desconhecido: {tool.launch_mode}")
 
 
-def check_tool(tool: ToolDefinition) -> tuple[bool, list[str]]:
+def check_tool(
+    tool: ToolDefinition,
+    *,
+    probes: ProbeCache = PROBE_CACHE,
+    python: str | None = None,
+) -> tuple[bool, list[str]]:
+    python = python or python_executable()
     problems: list[str] = []
-    if not tool.entrypoint_path.exists():
+    if not probes.path_exists(tool.entrypoint_path):
         problems.append(f"arquivo nao encontrado: {tool.entrypoint}")
 
     if not tool.supports_current_platform():
         platforms = ", ".join(tool.platforms)
         problems.append(f"indisponivel nesta plataforma; suporte: {platforms}")
 
+    if tool.requires_modules and not is_running_interpreter(python):
+        probes.prefetch_modules(tool.requires_modules, python)
     for module_name in tool.requires_modules:
-        if not _module_available(module_name):
+        if not probes.module_available(module_name, python):
             problems.append(f"modulo Python ausente: {module_name}")
 
     for command_name in tool.requires_commands:
-        if shutil.which(command_name) is None:
+        if probes.which(command_name) is None:
             problems.append(f"comando ausente no PATH: {command_name}")
 
     return not problems, problems
 
 
+def prefetch_tool_dependencies(
+    tools: Iterable[ToolDefinition],
+    *,
+    probes: ProbeCache = PROBE_CACHE,
+    python: str | None = None,
+) -> None:
+    python = python or python_executable()
+    if is_running_interpreter(python):
+        return
+    modules = [module_name for tool in tools for module_name in tool.requires_modules]
+    if modules:
+        probes.prefetch_modules(modules, python)
+
+
 def build_test_command() -> list[str]:
     return [python_executable(), "-m", "unittest", "discover", "-s", "tests"]
 
@@ -129,6 +150,10 @@ def _string_tuple(raw: object, field_name: str, manifest_path: Path) -> tuple[st
 
 def load_tool_manifest(manifest_path: Path) -> ToolDefinition:
     raw = json.loads(manifest_path.read_text(encoding="utf-8"))
+    return _tool_from_manifest_data(raw, manifest_path)
+
+
+def _tool_from_manifest_data(raw: object, manifest_path: Path) -> ToolDefinition:
     if not isinstance(raw, dict):
         raise ValueError(f"{manifest_path}: manifesto precisa conter um objeto JSON")
 
@@ -167,21 +192,251 @@ def load_tool_manifest(manifest_path: Path) -> ToolDefinition:
     )
 
 
-def load_tool_catalog(manifest_dir: Path = TOOL_MANIFEST_DIR) -> tuple[ToolDefinition, ...]:
-    manifests = sorted(manifest_dir.glob("*.json"))
-    if not manifests:
+def _manifest_signature(manifest_dir: Path) -> tuple[tuple[str, int, int], ...]:
+    if not manifest_dir.is_dir():
+        return ()
+    entries: list[tuple[str, int, int]] = []
+    with os.scandir(manifest_dir) as iterator:
+        for entry in iterator:
+            if entry.name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+def _read_snapshot(snapshot_path: Path) -> dict[str, dict[str, object]]:
+    try:
+        raw = json.loads(snapshot_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != CATALOG_SNAPSHOT_VERSION:
+        return {}
+    manifests = raw.get("manifests")
+    return manifests if isinstance(manifests, dict) else {}
+
+
+def _write_snapshot(snapshot_path: Path, manifests: dict[str, dict[str, object]]) -> None:
+    payload = {"version": CATALOG_SNAPSHOT_VERSION, "manifests": manifests}
+    temp_path = snapshot_path.with_name(snapshot_path.name + ".tmp")
+    with contextlib.suppress(OSError):
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp_path, snapshot_path)
+
+
+def load_tool_catalog(
+    manifest_dir: Path = TOOL_MANIFEST_DIR,
+    *,
+    snapshot_path: Path | None = None,
+) -> tuple[ToolDefinition, ...]:
+    return _load_catalog_for_signature(manifest_dir, _manifest_signature(manifest_dir), snapshot_path)
+
+
+def _load_catalog_for_signature(
+    manifest_dir: Path,
+    signature: tuple[tuple[str, int, int], ...],
+    snapshot_path: Path | None,
+) -> tuple[ToolDefinition, ...]:
+    if not signature:
         raise FileNotFoundError(f"nenhum manifesto de ferramenta encontrado em {manifest_dir}")
-    return tuple(load_tool_manifest(path) for path in manifests)
+    if snapshot_path is None:
+        return tuple(load_tool_manifest(manifest_dir / name) for name, _, _ in signature)
+
+    cached = _read_snapshot(snapshot_path)
+    fresh: dict[str, dict[str, object]] = {}
+    tools: list[ToolDefinition] = []
+    for name, mtime_ns, size in signature:
+        manifest_path = manifest_dir / name
+        entry = cached.get(name)
+        if isinstance(entry, dict) and entry.get("mtime_ns") == mtime_ns and entry.get("size") == size:
+            data = entry.get("data")
+        else:
+            data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        tools.append(_tool_from_manifest_data(data, manifest_path))
+        fresh[name] = {"mtime_ns": mtime_ns, "size": size, "data": data}
+
+    if fresh != cached:
+        _write_snapshot(snapshot_path, fresh)
+    return tuple(tools)
+
+
+def _index_by(
+    tools: tuple[ToolDefinition, ...],
+    keys: Callable[[ToolDefinition], tuple[str, ...]],
+) -> dict[str, tuple[ToolDefinition, ...]]:
+    index: dict[str, list[ToolDefinition]] = {}
+    for tool in tools:
+        for key in dict.fromkeys(keys(tool)):
+            index.setdefault(key, []).append(tool)
+    return {key: tuple(items) for key, items in index.items()}
+
+
+class ToolCatalog(Sequence[ToolDefinition]):
+    """Immutable tool list with precomputed lookups by identifier, group, platform and dependency."""
+
+    def __init__(self, tools: Iterable[ToolDefinition]) -> None:
+        self.tools = tuple(tools)
+        self._by_identifier: dict[str, ToolDefinition] = {}
+        for tool in self.tools:
+            if tool.identifier in self._by_identifier:
+                raise ValueError(f"identificador de ferramenta duplicado: {tool.identifier}")
+            self._by_identifier[tool.identifier] = tool
+        self._by_group = _index_by(self.tools, lambda tool: (tool.group,))
+        self._by_platform = _index_by(self.tools, lambda tool: tool.platforms)
+        self._by_module = _index_by(self.tools, lambda tool: tool.requires_modules)
+        self._by_command = _index_by(self.tools, lambda tool: tool.requires_commands)
+        self._groups = tuple(sorted(self._by_group))
+        self._platform_cache: dict[str, tuple[ToolDefinition, ...]] = {}
+
+    def get(self, identifier: str) -> ToolDefinition | None:
+        return self._by_identifier.get(identifier)
+
+    def groups(self) -> tuple[str, ...]:
+        return self._groups
+
+    def in_group(self, group: str | None) -> tuple[ToolDefinition, ...]:
+        if not group or group == "Todas":
+            return self.tools
+        return self._by_group.get(group, ())
+
+    def for_platform(self, platform: str = sys.platform) -> tuple[ToolDefinition, ...]:
+        cached = self._platform_cache.get(platform)
+        if cached is None:
+            matches = {
+                tool.identifier
+                for declared, tools in self._by_platform.items()
+                if platform.startswith(declared)
+                for tool in tools
+            }
+            cached = tuple(tool for tool in self.tools if tool.identifier in matches)
+            self._platform_cache[platform] = cached
+        return cached
+
+    def requiring_module(self, module_name: str) -> tuple[ToolDefinition, ...]:
+        return self._by_module.get(module_name, ())
+
+    def requiring_command(self, command_name: str) -> tuple[ToolDefinition, ...]:
+        return self._by_command.get(command_name, ())
+
+    def required_modules(self) -> tuple[str, ...]:
+        return tuple(sorted(self._by_module))
+
+    def required_commands(self) -> tuple[str, ...]:
+        return tuple(sorted(self._by_command))
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, str):
+            return item in self._by_identifier
+        return isinstance(item, ToolDefinition) and self._by_identifier.get(item.identifier) == item
+
+    def __getitem__(self, index):  # type: ignore[override]
+        return self.tools[index]
+
+    def __iter__(self) -> Iterator[ToolDefinition]:
+        return iter(self.tools)
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+
+class LazyToolCatalog(Sequence[ToolDefinition]):
+    """Tool catalog that only reads the manifests on first use."""
+
+    def __init__(self, manifest_dir: Path = TOOL_MANIFEST_DIR, *, snapshot_path: Path | None = None) -> None:
+        self.manifest_dir = manifest_dir
+        self.snapshot_path = snapshot_path
+        self._catalog: ToolCatalog | None = None
+        self._signature: tuple[tuple[str, int, int], ...] = ()
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._catalog is not None
+
+    @property
+    def catalog(self) -> ToolCatalog:
+        catalog = self._catalog
+        if catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._load()
+                catalog = self._catalog
+        assert catalog is not None
+        return catalog
+
+    @property
+    def tools(self) -> tuple[ToolDefinition, ...]:
+        return self.catalog.tools
+
+    def refresh(self) -> bool:
+        """Reload the manifests when any of them changed; return True when reloaded."""
+
+        with self._lock:
+            signature = _manifest_signature(self.manifest_dir)
+            if self._catalog is not None and signature == self._signature:
+                return False
+            self._load(signature)
+            return True
+
+    def _load(self, signature: tuple[tuple[str, int, int], ...] | None = None) -> None:
+        if signature is None:
+            signature = _manifest_signature(self.manifest_dir)
+        tools = _load_catalog_for_signature(self.manifest_dir, signature, self.snapshot_path)
+        self._catalog = ToolCatalog(tools)
+        self._signature = signature
+
+    def get(self, identifier: str) -> ToolDefinition | None:
+        return self.catalog.get(identifier)
+
+    def groups(self) -> tuple[str, ...]:
+        return self.catalog.groups()
+
+    def in_group(self, group: str | None) -> tuple[ToolDefinition, ...]:
+        return self.catalog.in_group(group)
+
+    def for_platform(self, platform: str = sys.platform) -> tuple[ToolDefinition, ...]:
+        return self.catalog.for_platform(platform)
+
+    def requiring_module(self, module_name: str) -> tuple[ToolDefinition, ...]:
+        return self.catalog.requiring_module(module_name)
 
+    def requiring_command(self, command_name: str) -> tuple[ToolDefinition, ...]:
+        return self.catalog.requiring_command(command_name)
 
-TOOL_CATALOG: tuple[ToolDefinition, ...] = load_tool_catalog()
+    def required_modules(self) -> tuple[str, ...]:
+        return self.catalog.required_modules()
 
+    def required_commands(self) -> tuple[str, ...]:
+        return self.catalog.required_commands()
 
-def tool_groups(catalog: tuple[ToolDefinition, ...] = TOOL_CATALOG) -> tuple[str, ...]:
+    def __contains__(self, item: object) -> bool:
+        return item in self.catalog
+
+    def __getitem__(self, index):  # type: ignore[override]
+        return self.catalog[index]
+
+    def __iter__(self) -> Iterator[ToolDefinition]:
+        return iter(self.catalog)
+
+    def __len__(self) -> int:
+        return len(self.catalog)
+
+
+TOOL_CATALOG = LazyToolCatalog(snapshot_path=CACHE_DIR / CATALOG_SNAPSHOT_FILENAME)
+
+
+def tool_groups(catalog: Sequence[ToolDefinition] = TOOL_CATALOG) -> tuple[str, ...]:
+    if isinstance(catalog, (ToolCatalog, LazyToolCatalog)):
+        return catalog.groups()
     return tuple(sorted({tool.group for tool in catalog}))
 
 
-def filter_tools_by_group(group: str | None, catalog: tuple[ToolDefinition, ...] = TOOL_CATALOG) -> tuple[ToolDefinition, ...]:
+def filter_tools_by_group(
+    group: str | None,
+    catalog: Sequence[ToolDefinition] = TOOL_CATALOG,
+) -> tuple[ToolDefinition, ...]:
+    if isinstance(catalog, (ToolCatalog, LazyToolCatalog)):
+        return catalog.in_group(group)
     if not group or group == "Todas":
-        return catalog
+        return tuple(catalog)
     return tuple(tool for tool in catalog if tool.group == group)
@@ -0,0 +1,174 @@
+"""Resource telemetry for tools launched by the manager."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from .history import ExecutionHistory
+
+TELEMETRY_INTERVAL = 1.0
+PROC_ROOT = Path("/proc")
+
+
+@dataclass(frozen=True)
+class ProcessSample:
+    rss_bytes: int
+    cpu_seconds: float
+
+
+def read_process_sample(pid: int, *, proc_root: Path = PROC_ROOT) -> ProcessSample | None:
+    """RSS and user+system CPU time from ``/proc/<pid>``; ``None`` where /proc is unavailable."""
+
+    try:
+        stat = (proc_root / str(pid) / "stat").read_text(encoding="ascii")
+        statm = (proc_root / str(pid) / "statm").read_text(encoding="ascii")
+    except OSError:
+        return None
+    # The command name may contain spaces, so fields are counted after its closing parenthesis.
+    fields = stat[stat.rfind(")") + 2 :].split()
+    try:
+        ticks = int(fields[11]) + int(fields[12])
+        rss_pages = int(statm.split()[1])
+    except (IndexError, ValueError):
+        return None
+    return ProcessSample(rss_pages * _PAGE_SIZE, ticks / _CLOCK_TICKS)
+
+
+def _sysconf(name: str, default: int) -> int:
+    try:
+        return os.sysconf(name)
+    except (AttributeError, OSError, ValueError):
+        return default
+
+
+_PAGE_SIZE = _sysconf("SC_PAGE_SIZE", 4096)
+_CLOCK_TICKS = _sysconf("SC_CLK_TCK", 100)
+
+
+@dataclass
+class TrackedProcess:
+    process: subprocess.Popen[bytes]
+    run_id: int | None
+    tool: str
+    started_at: float
+    peak_rss: int | None = None
+    cpu_seconds: float | None = None
+    return_code: int | None = None
+    finished_at: float | None = None
+
+    @property
+    def duration(self) -> float:
+        return (self.finished_at or time.time()) - self.started_at
+
+
+Sampler = Callable[[int], ProcessSample | None]
+ExitCallback = Callable[[TrackedProcess], None]
+
+
+class ProcessTelemetry:
+    """Samples launched processes from one background thread and records how they ended.
+
+    The thread only runs while something is tracked. Results go to the execution
+    history row created for the launch.
+    """
+
+    def __init__(
+        self,
+        history: ExecutionHistory | None,
+        *,
+        interval: float = TELEMETRY_INTERVAL,
+        sampler: Sampler = read_process_sample,
+        on_exit: ExitCallback | None = None,
+    ) -> None:
+        self.history = history
+        self.interval = interval
+        self._sampler = sampler
+        self._on_exit = on_exit
+        self._tracked: dict[int, TrackedProcess] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def track(
+        self,
+        process: subprocess.Popen[bytes],
+        *,
+        tool: str,
+        run_id: int | None,
+        started_at: float | None = None,
+    ) -> TrackedProcess:
+        tracked = TrackedProcess(process, run_id, tool, time.time() if started_at is None else started_at)
+        self._sample(tracked)
+        with self._lock:
+            self._tracked[process.pid] = tracked
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name="tool-telemetry", daemon=True)
+                self._thread.start()
+        return tracked
+
+    def active(self) -> list[TrackedProcess]:
+        with self._lock:
+            return list(self._tracked.values())
+
+    def sample_once(self) -> list[TrackedProcess]:
+        """Sample every tracked process and return the ones that exited since the last call."""
+
+        finished: list[TrackedProcess] = []
+        for tracked in self.active():
+            self._sample(tracked)
+            return_code = tracked.process.poll()
+            if return_code is None:
+                continue
+            tracked.return_code = return_code
+            tracked.finished_at = time.time()
+            with self._lock:
+                self._tracked.pop(tracked.process.pid, None)
+            self._record(tracked)
+            finished.append(tracked)
+        return finished
+
+    def stop(self) -> None:
+        """Stop sampling; the launched tools keep running."""
+
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(self.interval * 2)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample_once()
+            with self._lock:
+                if not self._tracked:
+                    self._thread = None
+                    return
+
+    def _sample(self, tracked: TrackedProcess) -> None:
+        sample = self._sampler(tracked.process.pid)
+        if sample is None:
+            return
+        tracked.peak_rss = max(tracked.peak_rss or 0, sample.rss_bytes)
+        tracked.cpu_seconds = sample.cpu_seconds
+
+    def _record(self, tracked: TrackedProcess) -> None:
+        if self.history is not None and tracked.run_id is not None:
+            with contextlib.suppress(sqlite3.Error):
+                self.history.record_end(
+                    tracked.run_id,
+                    return_code=tracked.return_code,
+                    finished_at=tracked.finished_at,
+                    duration=tracked.duration,
+                    peak_rss=tracked.peak_rss,
+                    cpu_seconds=tracked.cpu_seconds,
+                )
+        if self._on_exit is not None:
+            self._on_exit(tracked)
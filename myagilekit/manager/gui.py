@@ -4,15 +4,25 @@ from __future__ import annotations
 
 import contextlib
 import datetime as _dt
-import json
 import queue
+import re
+import sqlite3
 import subprocess
-import threading
+import time
 import tkinter as tk
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 from tkinter import messagebox, ttk
 
+from myagilekit.core.config import config_int
+from myagilekit.core.diagnostics import format_elapsed
+from myagilekit.core.history import ExecutionHistory, ToolStats, open_execution_history
+from myagilekit.core.paths import PROJECT_ROOT, log_path
+from myagilekit.core.process_runner import PROCESS_SUPERVISOR, Job
 from myagilekit.core.registry import (
-    PROJECT_ROOT,
+    PROBE_CACHE,
     TOOL_CATALOG,
     ToolDefinition,
     build_environment_check_command,
@@ -21,9 +31,30 @@ from myagilekit.core.registry import (
     build_tool_test_command,
     check_tool,
     filter_tools_by_group,
-    logs_directory,
+    prefetch_tool_dependencies,
     tool_groups,
 )
+from myagilekit.core.telemetry import ProcessTelemetry, TrackedProcess
+from myagilekit.manager.output import (
+    DRAIN_FAST_MS,
+    DRAIN_MAX_ITEMS,
+    OUTPUT_MAX_LINES,
+    OutputBuffer,
+    collect_output,
+    next_drain_interval,
+)
+
+STATUS_WORKERS = 4
+STATUS_PENDING_TEXT = "Verificando…"
+OUTPUT_MAX_TABS = 8
+HISTORY_VIEW_LIMIT = 200
+GENERAL_OUTPUT_TAB = 0
+JOB_STATE_LABELS = {
+    "finished": "codigo {code}",
+    "timeout": "timeout",
+    "cancelled": "cancelado",
+    "failed": "erro",
+}
 
 
 class Tooltip:
@@ -87,6 +118,50 @@ class Tooltip:
             self._window = None
 
 
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_tool_stats(stats: ToolStats) -> list[str]:
+    lines = [f"- {stats.runs} execucoes, {stats.failures} com erro, {stats.crashes} encerradas por sinal"]
+    if stats.p95 is not None:
+        lines.append(f"- Duracao p95: {format_elapsed(stats.p95)}")
+    if stats.mean_launch_latency is not None:
+        lines.append(f"- Inicio medio: {format_elapsed(stats.mean_launch_latency)}")
+    if stats.mean_peak_rss is not None:
+        lines.append(f"- Pico de memoria medio: {format_bytes(stats.mean_peak_rss)}")
+    if stats.mean_cpu_seconds is not None:
+        lines.append(f"- CPU media: {stats.mean_cpu_seconds:.1f} s")
+    return lines
+
+
+def probe_tool_status(
+    tool: ToolDefinition,
+    check: Callable[[ToolDefinition], tuple[bool, list[str]]] = check_tool,
+) -> tuple[bool, list[str]]:
+    """``check_tool`` for the status workers: a failing check becomes a problem instead of vanishing."""
+
+    try:
+        return check(tool)
+    except Exception as exc:  # a broken probe must not leave the row "Verificando…" forever
+        return False, [f"falha ao verificar: {exc}"]
+
+
+@dataclass
+class OutputPane:
+    """One output tab: the Text widget only ever holds what ``buffer`` keeps."""
+
+    frame: ttk.Frame
+    text: tk.Text
+    buffer: OutputBuffer
+    title: str
+    finished: bool = False
+
+
 class MyAgileKitManager(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
@@ -96,8 +171,25 @@ class MyAgileKitManager(tk.Tk):
 
         self.selected_tool: ToolDefinition | None = None
         self.category_var = tk.StringVar(value="Todas")
-        self.output_queue: queue.Queue[str] = queue.Queue()
-        self.running_process: subprocess.Popen[str] | None = None
+        self.output_queue: queue.Queue[tuple[int, str | None]] = queue.Queue()
+        self.running_jobs: dict[int, Job] = {}
+        self.output_panes: dict[int, OutputPane] = {}
+        self.output_max_lines = config_int("manager", "output_max_lines", OUTPUT_MAX_LINES)
+        self.output_max_tabs = config_int("manager", "output_max_tabs", OUTPUT_MAX_TABS)
+        self.drain_interval = DRAIN_FAST_MS
+        self.history: ExecutionHistory | None = None
+        with contextlib.suppress(OSError, sqlite3.Error):
+            self.history = open_execution_history()
+        self.job_history: dict[int, int] = {}
+        self.history_window: tk.Toplevel | None = None
+        self.telemetry = ProcessTelemetry(self.history, on_exit=self._queue_launch_exit)
+        self.status_queue: queue.Queue[tuple[int, str, bool, list[str]]] = queue.Queue()
+        self.status_executor = ThreadPoolExecutor(max_workers=STATUS_WORKERS, thread_name_prefix="tool-status")
+        self.status_generation = 0
+        self.tool_status: dict[str, tuple[bool, list[str]]] = {}
+        self.tool_status_checked: dict[str, float] = {}
+        self.pending_status: set[str] = set()
+        self.pending_launch: str | None = None
         self.tool_tree_tooltip: Tooltip | None = None
         self.detail_title_tooltip: Tooltip | None = None
         self.detail_status_tooltip: Tooltip | None = None
@@ -246,9 +338,15 @@ class MyAgileKitManager(tk.Tk):
         refresh_button = ttk.Button(
             button_row,
             text="Atualizar status",
-            command=self._load_tools,
+            command=self._refresh_catalog,
         )
         refresh_button.pack(side=tk.LEFT)
+        history_button = ttk.Button(
+            button_row,
+            text="Historico",
+            command=self._show_history,
+        )
+        history_button.pack(side=tk.LEFT, padx=8)
         self.launch_button_tooltip = Tooltip(
             self.launch_button,
             "Abre o projeto selecionado usando o comando padrao mostrado no painel.",
@@ -270,14 +368,20 @@ class MyAgileKitManager(tk.Tk):
             refresh_button,
             "Recarrega o catalogo visual e recalcula o status das ferramentas.",
         )
+        Tooltip(
+            history_button,
+            "Mostra as ultimas execucoes e o tempo p95 de cada ferramenta.",
+        )
 
         log_frame = ttk.LabelFrame(self, text="Saida", padding=8)
         log_frame.pack(fill=tk.BOTH, expand=False, padx=18, pady=(0, 14))
-        self.output_text = tk.Text(log_frame, height=9, wrap=tk.WORD, state=tk.DISABLED)
-        self.output_text.pack(fill=tk.BOTH, expand=True)
+        self.output_tabs = ttk.Notebook(log_frame)
+        self.output_tabs.pack(fill=tk.BOTH, expand=True)
+        self._open_output_tab(GENERAL_OUTPUT_TAB, "Geral")
         Tooltip(
-            self.output_text,
-            "Area de saida dos testes, diagnosticos e comandos executados pela GUI.",
+            self.output_tabs,
+            "Cada teste ou diagnostico abre uma aba propria com as ultimas linhas da saida. "
+            "A transcricao completa fica em logs/tools/.",
         )
 
     def _load_tools(self) -> None:
@@ -286,18 +390,19 @@ class MyAgileKitManager(tk.Tk):
         visible_tools = filter_tools_by_group(self.category_var.get())
 
         for tool in visible_tools:
-            ready, _ = check_tool(tool)
             item_id = tool.identifier
             self.tool_tree.insert(
                 "",
                 tk.END,
                 iid=item_id,
                 text=tool.name,
-                values=(tool.group, "OK" if ready else "Pendente"),
+                values=(tool.group, self._status_label(item_id)),
             )
             if selected == item_id:
                 self.tool_tree.selection_set(item_id)
 
+        self._request_tool_status(visible_tools)
+
         if not self.tool_tree.selection() and visible_tools:
             first = visible_tools[0].identifier
             self.tool_tree.selection_set(first)
@@ -310,6 +415,66 @@ class MyAgileKitManager(tk.Tk):
             self.detail_title.config(text="Nenhuma ferramenta nesta categoria")
             self._set_detail_text("Selecione outra categoria para ver ferramentas.")
 
+    def _status_label(self, identifier: str) -> str:
+        status = self.tool_status.get(identifier)
+        if status is None:
+            return STATUS_PENDING_TEXT
+        return "OK" if status[0] else "Pendente"
+
+    def _request_tool_status(self, tools: tuple[ToolDefinition, ...]) -> None:
+        pending = tuple(
+            tool
+            for tool in tools
+            if tool.identifier not in self.tool_status and tool.identifier not in self.pending_status
+        )
+        if not pending:
+            return
+        self.pending_status.update(tool.identifier for tool in pending)
+        self.status_executor.submit(self._dispatch_tool_status, self.status_generation, pending)
+
+    def _dispatch_tool_status(self, generation: int, tools: tuple[ToolDefinition, ...]) -> None:
+        # One batched .venv probe first, so the per-tool checks below hit the cache;
+        # if it fails, each check probes again and reports its own error.
+        with contextlib.suppress(Exception):
+            prefetch_tool_dependencies(tools)
+        with contextlib.suppress(RuntimeError):
+            for tool in tools:
+                self.status_executor.submit(self._probe_tool_status, generation, tool)
+
+    def _probe_tool_status(self, generation: int, tool: ToolDefinition) -> None:
+        ready, problems = probe_tool_status(tool)
+        self.status_queue.put((generation, tool.identifier, ready, problems))
+
+    def _apply_tool_status(self, generation: int, identifier: str, ready: bool, problems: list[str]) -> None:
+        if generation != self.status_generation:
+            return
+        self.pending_status.discard(identifier)
+        self.tool_status[identifier] = (ready, problems)
+        self.tool_status_checked[identifier] = time.monotonic()
+        if self.tool_tree.exists(identifier):
+            self.tool_tree.set(identifier, "status", self._status_label(identifier))
+        if self.selected_tool is not None and self.selected_tool.identifier == identifier:
+            self._on_tool_selected()
+        if self.pending_launch == identifier:
+            self.pending_launch = None
+            tool = TOOL_CATALOG.get(identifier)
+            if tool is not None:
+                self._launch_tool(tool, ready, problems)
+
+    def _refresh_catalog(self) -> None:
+        PROBE_CACHE.invalidate()
+        self.status_generation += 1
+        self.tool_status.clear()
+        self.tool_status_checked.clear()
+        self.pending_status.clear()
+        self.pending_launch = None
+        if TOOL_CATALOG.refresh():
+            groups = tool_groups()
+            self.category_filter.config(values=("Todas", *groups))
+            if self.category_var.get() not in groups:
+                self.category_var.set("Todas")
+        self._load_tools()
+
     def _on_filter_changed(self, _event: tk.Event | None = None) -> None:
         self._load_tools()
 
@@ -318,7 +483,7 @@ class MyAgileKitManager(tk.Tk):
             return
 
         identifier = self.tool_tree.identify_row(event.y)
-        tool = next((item for item in TOOL_CATALOG if item.identifier == identifier), None)
+        tool = TOOL_CATALOG.get(identifier)
         if tool is None:
             self.tool_tree_tooltip.set_text(
                 "Lista dos projetos registrados. Passe o mouse sobre uma linha para "
@@ -334,16 +499,20 @@ class MyAgileKitManager(tk.Tk):
             return
 
         identifier = selection[0]
-        self.selected_tool = next((tool for tool in TOOL_CATALOG if tool.identifier == identifier), None)
+        self.selected_tool = TOOL_CATALOG.get(identifier)
         if self.selected_tool is None:
             return
 
-        ready, problems = check_tool(self.selected_tool)
+        status = self.tool_status.get(identifier)
+        ready, problems = status if status is not None else (False, [])
         command = " ".join(build_launch_command(self.selected_tool))
         test_target = self.selected_tool.test_target or "sem teste especifico"
 
         self.detail_title.config(text=self.selected_tool.name)
-        if ready:
+        if status is None:
+            self.detail_status.config(text="Status: verificando dependencias…", style="TLabel")
+            self.launch_button.config(state=tk.DISABLED)
+        elif ready:
             self.detail_status.config(text="Status: pronto para executar", style="Ready.TLabel")
             self.launch_button.config(state=tk.NORMAL)
         else:
@@ -363,6 +532,7 @@ class MyAgileKitManager(tk.Tk):
         if problems:
             lines.extend(["", "Pendencias:"])
             lines.extend(f"- {problem}" for problem in problems)
+        lines.extend(self._format_tool_telemetry(self.selected_tool))
 
         self._set_detail_text("\n".join(lines))
         tooltip_text = self._format_tool_tooltip(self.selected_tool)
@@ -379,9 +549,24 @@ class MyAgileKitManager(tk.Tk):
                 "Executa este projeto:\n\n" + tooltip_text
             )
 
+    def _format_tool_telemetry(self, tool: ToolDefinition) -> list[str]:
+        if self.history is None:
+            return []
+        try:
+            stats = self.history.tool_summary(tool.identifier, action="launch")
+        except sqlite3.Error:
+            return []
+        if stats is None:
+            return []
+        return ["", "Execucoes pelo manager:", *format_tool_stats(stats)]
+
     def _format_tool_tooltip(self, tool: ToolDefinition) -> str:
-        ready, problems = check_tool(tool)
-        status = "pronto para executar" if ready else "precisa de ajuste"
+        cached = self.tool_status.get(tool.identifier)
+        ready, problems = cached if cached is not None else (False, [])
+        if cached is None:
+            status = "verificando dependencias…"
+        else:
+            status = "pronto para executar" if ready else "precisa de ajuste"
         command = " ".join(build_launch_command(tool))
         test_target = tool.test_target or "sem teste especifico"
         lines = [
@@ -405,107 +590,284 @@ class MyAgileKitManager(tk.Tk):
         self.detail_text.insert(tk.END, text)
         self.detail_text.config(state=tk.DISABLED)
 
-    def _append_output(self, text: str) -> None:
-        self.output_text.config(state=tk.NORMAL)
-        self.output_text.insert(tk.END, text)
-        self.output_text.see(tk.END)
-        self.output_text.config(state=tk.DISABLED)
+    def _open_output_tab(self, job_id: int, title: str, transcript: Path | None = None) -> None:
+        frame = ttk.Frame(self.output_tabs)
+        if transcript is not None:
+            ttk.Label(frame, text=f"Transcricao completa: {transcript.relative_to(PROJECT_ROOT)}").pack(anchor=tk.W)
+        text = tk.Text(frame, height=9, wrap=tk.WORD, state=tk.DISABLED)
+        text.pack(fill=tk.BOTH, expand=True)
+        self.output_tabs.add(frame, text=title)
+        self.output_panes[job_id] = OutputPane(frame, text, OutputBuffer(self.output_max_lines), title)
+
+    def _finish_output_tab(self, job: Job) -> None:
+        pane = self.output_panes.get(job.id)
+        if pane is None:
+            return
+        pane.finished = True
+        label = JOB_STATE_LABELS.get(job.state, job.state).format(code=job.return_code)
+        self.output_tabs.tab(pane.frame, text=f"{pane.title} ({label})")
+
+        finished = sorted(job_id for job_id, pane in self.output_panes.items() if pane.finished)
+        excess = len(self.output_panes) - 1 - self.output_max_tabs
+        for job_id in finished[: max(0, excess)]:
+            self.output_tabs.forget(self.output_panes.pop(job_id).frame)
+
+    def _append_output(self, text: str, job_id: int = GENERAL_OUTPUT_TAB) -> None:
+        pane = self.output_panes.get(job_id)
+        if pane is None:
+            return
+        shown_lines = len(pane.buffer)
+        evicted = pane.buffer.append(text)
+        pane.text.config(state=tk.NORMAL)
+        if evicted and evicted >= shown_lines:
+            # The burst alone overflows the tab: replace it with the kept tail.
+            pane.text.delete("1.0", tk.END)
+            pane.text.insert(tk.END, pane.buffer.text())
+        else:
+            pane.text.insert(tk.END, text)
+            if evicted:
+                pane.text.delete("1.0", f"{evicted + 1}.0")
+        pane.text.see(tk.END)
+        pane.text.config(state=tk.DISABLED)
 
     def _launch_selected_tool(self) -> None:
-        if self.selected_tool is None:
+        tool = self.selected_tool
+        if tool is None:
             return
 
-        ready, problems = check_tool(self.selected_tool)
+        status = self.tool_status.get(tool.identifier)
+        checked = self.tool_status_checked.get(tool.identifier, 0.0)
+        if status is not None and time.monotonic() - checked < PROBE_CACHE.ttl:
+            self._launch_tool(tool, *status)
+            return
+
+        # Stale status: re-check on a worker and launch from _apply_tool_status.
+        self.pending_launch = tool.identifier
+        self.launch_button.config(state=tk.DISABLED)
+        if tool.identifier not in self.pending_status:
+            self.pending_status.add(tool.identifier)
+            self.status_executor.submit(self._probe_tool_status, self.status_generation, tool)
+
+    def _launch_tool(self, tool: ToolDefinition, ready: bool, problems: list[str]) -> None:
         if not ready:
             messagebox.showwarning("Pendencias", "\n".join(problems))
             return
 
-        command = build_launch_command(self.selected_tool)
+        command = build_launch_command(tool)
         self._append_output(f"\n$ {' '.join(command)}\n")
+        started_at = time.time()
+        spawn_started = time.perf_counter()
         try:
-            subprocess.Popen(command, cwd=self.selected_tool.working_dir_path)
-            self._record_history("launch", command, self.selected_tool)
+            process = subprocess.Popen(command, cwd=tool.working_dir_path)
         except OSError as exc:
             messagebox.showerror("Erro ao executar", str(exc))
+            return
+        run_id = self._record_history(
+            "launch",
+            command,
+            tool,
+            state="launched",
+            launch_latency=time.perf_counter() - spawn_started,
+        )
+        self.telemetry.track(process, tool=tool.identifier, run_id=run_id, started_at=started_at)
+
+    def _queue_launch_exit(self, tracked: TrackedProcess) -> None:
+        # Runs on the telemetry thread.
+        details = [f"apos {format_elapsed(tracked.duration)}"]
+        if tracked.peak_rss is not None:
+            details.append(f"pico de memoria {format_bytes(tracked.peak_rss)}")
+        if tracked.cpu_seconds is not None:
+            details.append(f"CPU {tracked.cpu_seconds:.1f} s")
+        message = f"\n{tracked.tool} finalizado com codigo {tracked.return_code} ({', '.join(details)}).\n"
+        self.output_queue.put((GENERAL_OUTPUT_TAB, message))
 
     def _run_selected_tool_test(self) -> None:
         if self.selected_tool is None:
             return
-        if self.running_process is not None:
-            messagebox.showinfo("Em execucao", "Ja existe um processo rodando.")
-            return
-
-        command = build_tool_test_command(self.selected_tool)
-        self._append_output(f"\n$ {' '.join(command)}\n")
-        self._record_history("tool-test", command, self.selected_tool)
-        thread = threading.Thread(target=self._run_command_capture, args=(command,), daemon=True)
-        thread.start()
+        tool = self.selected_tool
+        command = build_tool_test_command(tool)
+        self._start_job(f"tool-test-{tool.identifier}", f"Teste: {tool.name}", command, "tool-test", tool)
 
     def _run_test_suite(self) -> None:
-        if self.running_process is not None:
-            messagebox.showinfo("Em execucao", "Ja existe um processo de testes rodando.")
-            return
-
-        command = build_test_command()
-        self._append_output(f"\n$ {' '.join(command)}\n")
-        self._record_history("test-suite", command)
-        thread = threading.Thread(target=self._run_command_capture, args=(command,), daemon=True)
-        thread.start()
+        self._start_job("test-suite", "Todos os testes", build_test_command(), "test-suite")
 
     def _run_environment_check(self) -> None:
-        if self.running_process is not None:
-            messagebox.showinfo("Em execucao", "Ja existe um processo rodando.")
-            return
+        self._start_job("diagnostic", "Diagnostico", build_environment_check_command(), "diagnostic")
 
-        command = build_environment_check_command()
-        self._append_output(f"\n$ {' '.join(command)}\n")
-        self._record_history("diagnostic", command)
-        thread = threading.Thread(target=self._run_command_capture, args=(command,), daemon=True)
-        thread.start()
+    def _start_job(
+        self,
+        name: str,
+        title: str,
+        command: list[str],
+        action: str,
+        tool: ToolDefinition | None = None,
+    ) -> None:
+        if any(job.name == name for job in self.running_jobs.values()):
+            messagebox.showinfo("Em execucao", "Esta acao ja esta rodando.")
+            return
 
-    def _run_command_capture(self, command: list[str]) -> None:
-        try:
-            self.running_process = subprocess.Popen(
-                command,
-                cwd=PROJECT_ROOT,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-            )
-            assert self.running_process.stdout is not None
-            for line in self.running_process.stdout:
-                self.output_queue.put(line)
-            return_code = self.running_process.wait()
-            self.output_queue.put(f"\nProcesso finalizado com codigo {return_code}.\n")
-        except OSError as exc:
-            self.output_queue.put(f"\nErro: {exc}\n")
-        finally:
-            self.running_process = None
+        slug = re.sub(r"[^\w.-]+", "-", name)
+        transcript = log_path(f"{_dt.datetime.now():%Y%m%d-%H%M%S}-{slug}.log", "tools")
+        run_id = self._record_history(action, command, tool)
+        job = PROCESS_SUPERVISOR.start(
+            command,
+            name=name,
+            output=self._queue_job_output,
+            on_exit=self._queue_job_exit,
+            log_file=transcript,
+        )
+        self.running_jobs[job.id] = job
+        if run_id is not None:
+            self.job_history[job.id] = run_id
+        self._open_output_tab(job.id, title, transcript)
+        self._append_output(f"$ {' '.join(command)}\n", job.id)
+        self.output_tabs.select(self.output_panes[job.id].frame)
+
+    def _queue_job_output(self, job: Job, _stream: str, text: str) -> None:
+        self.output_queue.put((job.id, text))
+
+    def _queue_job_exit(self, job: Job) -> None:
+        if job.state == "finished":
+            message = f"\nProcesso finalizado com codigo {job.return_code}.\n"
+        elif job.state == "timeout":
+            message = "\nProcesso encerrado por timeout.\n"
+        elif job.state == "cancelled":
+            message = "\nProcesso cancelado.\n"
+        else:
+            message = f"\nErro: {job.error}\n"
+        self.output_queue.put((job.id, message))
+        self.output_queue.put((job.id, None))
 
     def _record_history(
         self,
         action: str,
         command: list[str],
         tool: ToolDefinition | None = None,
-    ) -> None:
-        event = {
-            "timestamp": _dt.datetime.now().isoformat(timespec="seconds"),
-            "action": action,
-            "tool": tool.identifier if tool else None,
-            "command": command,
-        }
-        history_path = logs_directory() / "execution_history.jsonl"
-        with contextlib.suppress(OSError), history_path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(event, ensure_ascii=False) + "\n")
+        *,
+        state: str = "running",
+        launch_latency: float | None = None,
+    ) -> int | None:
+        if self.history is None:
+            return None
+        try:
+            return self.history.record_start(
+                action,
+                command,
+                tool.identifier if tool else None,
+                state=state,
+                launch_latency=launch_latency,
+            )
+        except sqlite3.Error:
+            return None
+
+    def _record_job_end(self, job: Job) -> None:
+        run_id = self.job_history.pop(job.id, None)
+        if self.history is None or run_id is None:
+            return
+        with contextlib.suppress(sqlite3.Error):
+            self.history.record_end(
+                run_id,
+                return_code=job.return_code,
+                state=job.state,
+                finished_at=job.finished_at,
+                duration=job.duration,
+            )
+
+    def _show_history(self) -> None:
+        if self.history is None:
+            messagebox.showwarning("Historico", "O historico de execucoes nao esta disponivel.")
+            return
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.destroy()
+
+        window = tk.Toplevel(self)
+        window.title("Historico de execucoes")
+        window.geometry("820x480")
+        self.history_window = window
+        tool = self.selected_tool.identifier if self.selected_tool else None
+
+        runs_frame = ttk.LabelFrame(
+            window,
+            text=f"Ultimas execucoes de {self.selected_tool.name}" if self.selected_tool else "Ultimas execucoes",
+            padding=8,
+        )
+        runs_frame.pack(fill=tk.BOTH, expand=True, padx=12, pady=(12, 6))
+        runs_tree = ttk.Treeview(
+            runs_frame,
+            columns=("started", "action", "tool", "state", "code", "duration"),
+            show="headings",
+            height=10,
+        )
+        for column, heading, width in (
+            ("started", "Inicio", 150),
+            ("action", "Acao", 100),
+            ("tool", "Ferramenta", 170),
+            ("state", "Estado", 90),
+            ("code", "Codigo", 70),
+            ("duration", "Duracao", 90),
+        ):
+            runs_tree.heading(column, text=heading)
+            runs_tree.column(column, width=width, anchor=tk.W if column in ("tool", "action") else tk.CENTER)
+        runs_tree.pack(fill=tk.BOTH, expand=True)
+        for run in self.history.recent(HISTORY_VIEW_LIMIT, tool=tool):
+            runs_tree.insert(
+                "",
+                tk.END,
+                values=(
+                    run.started.strftime("%Y-%m-%d %H:%M:%S"),
+                    run.action,
+                    run.tool or "-",
+                    run.state,
+                    "-" if run.return_code is None else run.return_code,
+                    "-" if run.duration is None else format_elapsed(run.duration),
+                ),
+            )
+
+        stats_frame = ttk.LabelFrame(window, text="Resumo por ferramenta", padding=8)
+        stats_frame.pack(fill=tk.BOTH, expand=True, padx=12, pady=(6, 12))
+        stats_tree = ttk.Treeview(
+            stats_frame,
+            columns=("tool", "runs", "failures", "p95"),
+            show="headings",
+            height=6,
+        )
+        for column, heading in (("tool", "Ferramenta"), ("runs", "Execucoes"), ("failures", "Falhas"), ("p95", "p95")):
+            stats_tree.heading(column, text=heading)
+        stats_tree.pack(fill=tk.BOTH, expand=True)
+        for stats in self.history.tool_stats():
+            p95 = "-" if stats.p95 is None else format_elapsed(stats.p95)
+            stats_tree.insert("", tk.END, values=(stats.tool, stats.runs, stats.failures, p95))
 
     def _drain_output_queue(self) -> None:
-        while True:
+        batch = collect_output(self.output_queue)
+        for job_id, text in batch.chunks.items():
+            self._append_output(text, job_id)
+        for job_id in batch.finished:
+            job = self.running_jobs.pop(job_id, None)
+            if job is not None:
+                self._finish_output_tab(job)
+                self._record_job_end(job)
+
+        handled = batch.count
+        for _ in range(DRAIN_MAX_ITEMS):
             try:
-                self._append_output(self.output_queue.get_nowait())
+                self._apply_tool_status(*self.status_queue.get_nowait())
             except queue.Empty:
                 break
-        self.after(100, self._drain_output_queue)
+            handled += 1
+
+        backlog = batch.backlog or not self.status_queue.empty()
+        self.drain_interval = next_drain_interval(self.drain_interval, handled, backlog)
+        self.after(self.drain_interval, self._drain_output_queue)
+
+    def destroy(self) -> None:
+        self.status_executor.shutdown(wait=False, cancel_futures=True)
+        for job in self.running_jobs.values():
+            job.cancel()
+        self.telemetry.stop()
+        if self.history is not None:
+            self.history.close()
+        super().destroy()
 
 
 def main() -> None:
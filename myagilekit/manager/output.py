@@ -0,0 +1,91 @@
+"""Bounded output buffers for the manager's job tabs."""
+
+from __future__ import annotations
+
+import queue
+from collections import deque
+from dataclasses import dataclass, field
+
+OUTPUT_MAX_LINES = 2000
+DRAIN_MAX_ITEMS = 500
+DRAIN_FAST_MS = 30
+DRAIN_IDLE_MS = 250
+DRAIN_BACKLOG_MS = 1
+
+
+class OutputBuffer:
+    """Keeps only the last ``max_lines`` complete lines of a job's output.
+
+    ``append`` reports how many lines fell off the front so the Text widget
+    showing the buffer can drop the same lines and stay in sync.
+    """
+
+    def __init__(self, max_lines: int = OUTPUT_MAX_LINES) -> None:
+        if max_lines < 1:
+            raise ValueError("max_lines deve ser maior que zero")
+        self.max_lines = max_lines
+        self.dropped = 0
+        self._lines: deque[str] = deque()
+        self._partial = ""
+
+    def append(self, text: str) -> int:
+        pieces = (self._partial + text).split("\n")
+        self._partial = pieces.pop()
+        self._lines.extend(piece + "\n" for piece in pieces)
+
+        evicted = max(0, len(self._lines) - self.max_lines)
+        for _ in range(evicted):
+            self._lines.popleft()
+        self.dropped += evicted
+        return evicted
+
+    def text(self) -> str:
+        return "".join(self._lines) + self._partial
+
+    def __len__(self) -> int:
+        return len(self._lines) + (1 if self._partial else 0)
+
+
+@dataclass
+class OutputBatch:
+    """Output taken from the queue in one UI tick, already joined per job."""
+
+    chunks: dict[int, str] = field(default_factory=dict)
+    finished: list[int] = field(default_factory=list)
+    count: int = 0
+    backlog: bool = False
+
+
+def collect_output(
+    source: queue.Queue[tuple[int, str | None]],
+    max_items: int = DRAIN_MAX_ITEMS,
+) -> OutputBatch:
+    """Take at most ``max_items`` entries; ``None`` text marks the end of a job."""
+
+    parts: dict[int, list[str]] = {}
+    batch = OutputBatch()
+    while batch.count < max_items:
+        try:
+            job_id, text = source.get_nowait()
+        except queue.Empty:
+            break
+        batch.count += 1
+        if text is None:
+            batch.finished.append(job_id)
+        else:
+            parts.setdefault(job_id, []).append(text)
+    else:
+        batch.backlog = not source.empty()
+
+    batch.chunks = {job_id: "".join(texts) for job_id, texts in parts.items()}
+    return batch
+
+
+def next_drain_interval(current: int, handled: int, backlog: bool) -> int:
+    """Poll again right away while behind, quickly while output flows, and back off when idle."""
+
+    if backlog:
+        return DRAIN_BACKLOG_MS
+    if handled:
+        return DRAIN_FAST_MS
+    return min(DRAIN_IDLE_MS, max(current, DRAIN_FAST_MS) * 2)
@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 from myagilekit.core.paths import (
+    CACHE_DIR,
     CONFIG_DIR,
     DEFAULT_CONFIG_FILE,
     LOG_SUBDIRS,
     LOGS_DIR,
     PROJECT_ROOT,
+    cache_path,
     config_path,
+    ensure_cache_dir,
     ensure_config_dir,
     ensure_logs_dir,
     ensure_project_layout,
@@ -16,12 +19,15 @@ from myagilekit.core.paths import (
 )
 
 __all__ = [
+    "CACHE_DIR",
     "CONFIG_DIR",
     "DEFAULT_CONFIG_FILE",
     "LOGS_DIR",
     "LOG_SUBDIRS",
     "PROJECT_ROOT",
+    "cache_path",
     "config_path",
+    "ensure_cache_dir",
     "ensure_config_dir",
     "ensure_logs_dir",
     "ensure_project_layout",
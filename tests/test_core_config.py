@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from myagilekit.core import config
+
+
+@unittest.skipIf(config.tomllib is None, "tomllib esta disponivel a partir do Python 3.11")
+class CoreConfigTests(unittest.TestCase):
+    def test_config_int_reads_section_value(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "myagilekit.toml"
+            path.write_text("[manager]\noutput_max_lines = 500\n", encoding="utf-8")
+
+            self.assertEqual(config.config_int("manager", "output_max_lines", 10, path=path), 500)
+            self.assertEqual(config.config_int("manager", "output_max_tabs", 8, path=path), 8)
+
+    def test_invalid_or_missing_values_use_default(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "myagilekit.toml"
+            path.write_text('[manager]\noutput_max_lines = "muitas"\noutput_max_tabs = 0\n', encoding="utf-8")
+
+            self.assertEqual(config.config_int("manager", "output_max_lines", 10, path=path), 10)
+            self.assertEqual(config.config_int("manager", "output_max_tabs", 8, path=path), 8)
+            self.assertEqual(config.config_int("manager", "x", 3, path=Path(temp_dir) / "nao-existe.toml"), 3)
+
+    def test_project_config_declares_manager_output_limits(self) -> None:
+        self.assertGreater(config.config_int("manager", "output_max_lines", 0, minimum=0), 0)
+        self.assertGreater(config.config_int("manager", "output_max_tabs", 0, minimum=0), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+
+from myagilekit.core import diagnostics
+
+
+def _slow_probe(name: str, delay: float, timeout: float = 5.0) -> diagnostics.Probe:
+    def run() -> diagnostics.CheckItem:
+        time.sleep(delay)
+        return diagnostics.CheckItem(name, "OK")
+
+    return diagnostics.Probe(name, run, timeout=timeout)
+
+
+class DiagnosticsEngineTests(unittest.TestCase):
+    def test_probes_run_concurrently_and_keep_declaration_order(self) -> None:
+        probes = [_slow_probe(f"probe-{index}", 0.2) for index in range(5)]
+
+        started = time.perf_counter()
+        items = diagnostics.run_diagnostics(probes)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual([item.name for item in items], [probe.name for probe in probes])
+        self.assertLess(elapsed, 0.8)
+        self.assertTrue(all(item.elapsed >= 0.2 for item in items))
+
+    def test_slow_probe_is_reported_as_timeout(self) -> None:
+        release = threading.Event()
+
+        def stuck() -> diagnostics.CheckItem:
+            release.wait(5)
+            return diagnostics.CheckItem("stuck", "OK")
+
+        try:
+            items = diagnostics.run_diagnostics(
+                [diagnostics.Probe("stuck", stuck, timeout=0.1), _slow_probe("fast", 0)]
+            )
+        finally:
+            release.set()
+
+        self.assertEqual(items[0].status, "Timeout")
+        self.assertFalse(items[0].ok)
+        self.assertEqual(items[1].status, "OK")
+
+    def test_failing_probe_becomes_error_item(self) -> None:
+        def broken() -> diagnostics.CheckItem:
+            raise RuntimeError("quebrou")
+
+        items = diagnostics.run_diagnostics([diagnostics.Probe("broken", broken, required=False)])
+
+        self.assertEqual(items[0].status, "Erro")
+        self.assertIn("quebrou", items[0].detail)
+        self.assertTrue(items[0].ok)
+
+    def test_shared_result_is_computed_once_for_all_module_probes(self) -> None:
+        calls: list[int] = []
+
+        def compute() -> dict[str, diagnostics.ModuleReport]:
+            calls.append(1)
+            time.sleep(0.05)
+            return {"json": diagnostics.ModuleReport(True, "1.0")}
+
+        shared = diagnostics.SharedResult(compute)
+        items = diagnostics.run_diagnostics(
+            [
+                diagnostics.module_probe("json", "json", shared),
+                diagnostics.module_probe("ausente", "ausente", shared),
+            ]
+        )
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((items[0].status, items[0].detail), ("OK", "versao 1.0"))
+        self.assertEqual(items[1].status, "Pendente")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+from myagilekit.core import history as history_module
+from myagilekit.core.history import COMPACT_EVERY, ExecutionHistory, percentile
+
+
+class ExecutionHistoryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.history = ExecutionHistory(Path(self.temp_dir.name) / "history.sqlite3", max_rows=50)
+        self.addCleanup(self.history.close)
+
+    def test_records_start_and_end_of_a_run(self) -> None:
+        run_id = self.history.record_start("tool-test", ["python", "-V"], "mp3", started_at=100.0)
+        self.history.record_end(run_id, return_code=0, finished_at=102.5)
+
+        [run] = self.history.recent(tool="mp3")
+
+        self.assertEqual(run.command, ("python", "-V"))
+        self.assertEqual(run.state, "finished")
+        self.assertEqual(run.return_code, 0)
+        self.assertAlmostEqual(run.duration, 2.5)
+
+    def test_recent_filters_by_tool_newest_first(self) -> None:
+        for index in range(5):
+            self.history.record_start("tool-test", ["x"], "a" if index % 2 else "b", started_at=float(index))
+
+        runs = self.history.recent(2, tool="b")
+
+        self.assertEqual([run.started_at for run in runs], [4.0, 2.0])
+
+    def test_tool_stats_reports_p95_and_failures(self) -> None:
+        for index in range(20):
+            run_id = self.history.record_start("tool-test", ["x"], "mp3", started_at=0.0)
+            self.history.record_end(run_id, return_code=1 if index == 0 else 0, finished_at=float(index + 1))
+        self.history.record_start("test-suite", ["x"], started_at=0.0)
+
+        [stats] = self.history.tool_stats()
+
+        self.assertEqual((stats.tool, stats.runs, stats.failures), ("mp3", 20, 1))
+        self.assertEqual(stats.p95, 19.0)
+
+    def test_compact_keeps_only_newest_rows(self) -> None:
+        for index in range(80):
+            self.history.record_start("launch", ["x"], started_at=float(index))
+
+        self.assertEqual(self.history.compact(), 30)
+        runs = self.history.recent(100)
+        self.assertEqual(len(runs), 50)
+        self.assertEqual(runs[-1].started_at, 30.0)
+
+    def test_compact_returns_free_pages_to_the_filesystem(self) -> None:
+        for index in range(3000):
+            self.history.record_start("launch", ["x" * 50], started_at=float(index))
+
+        self.history.compact(10)
+        [(free_pages,)] = self.history._connection.execute("PRAGMA freelist_count").fetchall()
+
+        self.assertEqual(free_pages, 0)
+
+    def test_short_sessions_still_compact(self) -> None:
+        path = Path(self.temp_dir.name) / "sessions.sqlite3"
+        for _session in range(5):
+            history = ExecutionHistory(path, max_rows=50)
+            for _ in range(COMPACT_EVERY // 2 - 10):
+                history.record_start("launch", ["x"])
+            history.close()
+
+        history = ExecutionHistory(path, max_rows=50)
+        self.addCleanup(history.close)
+        self.assertLessEqual(len(history.recent(1000)), 50 + COMPACT_EVERY)
+
+    def test_opening_the_history_compacts_it(self) -> None:
+        path = Path(self.temp_dir.name) / history_module.HISTORY_FILENAME
+        history = ExecutionHistory(path)
+        for index in range(80):
+            history.record_start("launch", ["x"], started_at=float(index))
+        history.close()
+
+        with unittest.mock.patch.object(history_module, "log_path", lambda name, category: path.with_name(name)):
+            history = history_module.open_execution_history(max_rows=50)
+        self.addCleanup(history.close)
+
+        self.assertEqual(len(history.recent(100)), 50)
+
+    def test_imports_legacy_jsonl(self) -> None:
+        legacy = Path(self.temp_dir.name) / "execution_history.jsonl"
+        events = [
+            {"timestamp": "2024-01-02T03:04:05", "action": "launch", "tool": "mp3", "command": ["python", "a.py"]},
+            {"timestamp": "quebrado"},
+        ]
+        legacy.write_text("\n".join(json.dumps(event) for event in events) + "\n", encoding="utf-8")
+
+        self.assertEqual(self.history.import_jsonl(legacy), 1)
+        [run] = self.history.recent()
+        self.assertEqual((run.tool, run.state), ("mp3", "imported"))
+
+    def test_old_databases_gain_telemetry_columns(self) -> None:
+        path = Path(self.temp_dir.name) / "old.sqlite3"
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, action TEXT NOT NULL, tool TEXT, "
+            "command TEXT NOT NULL, started_at REAL NOT NULL, finished_at REAL, duration REAL, "
+            "return_code INTEGER, state TEXT NOT NULL DEFAULT 'running')"
+        )
+        connection.commit()
+        connection.close()
+
+        history = ExecutionHistory(path)
+        self.addCleanup(history.close)
+        run_id = history.record_start("launch", ["x"], "mp3", started_at=1.0, launch_latency=0.2)
+        history.record_end(run_id, return_code=-9, finished_at=3.0, peak_rss=4096, cpu_seconds=1.5)
+
+        summary = history.tool_summary("mp3")
+        assert summary is not None
+        self.assertEqual((summary.crashes, summary.mean_peak_rss, summary.mean_cpu_seconds), (1, 4096, 1.5))
+
+    def test_percentile_uses_nearest_rank(self) -> None:
+        self.assertIsNone(percentile([], 95))
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 50), 2.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 95), 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import logging
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from myagilekit.core.logging import JsonLineFormatter, LogBackend, LogRotation
+
+
+class LogBackendTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.backend = LogBackend()
+        self.addCleanup(self.backend.shutdown)
+        self.logger = logging.getLogger(f"myagilekit.test.{self.id()}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.addCleanup(self.logger.handlers.clear)
+
+    def test_records_are_written_by_the_listener_thread(self) -> None:
+        path = Path(self.temp_dir.name) / "tool.log"
+        writers: list[str] = []
+
+        class RecordingFormatter(logging.Formatter):
+            def format(self, record: logging.LogRecord) -> str:
+                writers.append(threading.current_thread().name)
+                return super().format(record)
+
+        self.logger.addHandler(self.backend.file_handler(path, formatter=RecordingFormatter("%(message)s")))
+        for index in range(3):
+            self.logger.info("linha %s", index)
+        self.backend.flush()
+
+        self.assertEqual(path.read_text(encoding="utf-8").splitlines(), ["linha 0", "linha 1", "linha 2"])
+        self.assertNotIn(threading.current_thread().name, writers)
+
+    def test_json_lines_keep_message_and_exception(self) -> None:
+        path = Path(self.temp_dir.name) / "tool.jsonl"
+        self.logger.addHandler(self.backend.file_handler(path, formatter=JsonLineFormatter()))
+
+        try:
+            raise ValueError("quebrou")
+        except ValueError:
+            self.logger.exception("falha em %s", "arquivo.py")
+        self.backend.flush()
+
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(entry["level"], "ERROR")
+        self.assertEqual(entry["message"], "falha em arquivo.py")
+        self.assertIn("Traceback", entry["exception"])
+        self.assertIn("ValueError: quebrou", entry["exception"])
+
+    def test_text_lines_still_carry_the_traceback(self) -> None:
+        path = Path(self.temp_dir.name) / "tool.log"
+        self.logger.addHandler(self.backend.file_handler(path, formatter=logging.Formatter("%(levelname)s %(message)s")))
+
+        try:
+            raise ValueError("quebrou")
+        except ValueError:
+            self.logger.exception("falha em %s", "arquivo.py")
+        self.backend.flush()
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(lines[0], "ERROR falha em arquivo.py")
+        self.assertEqual(lines[1], "Traceback (most recent call last):")
+        self.assertEqual(lines[-1], "ValueError: quebrou")
+
+    def test_size_rotation_and_shared_file_release(self) -> None:
+        path = Path(self.temp_dir.name) / "rotating.log"
+        rotation = LogRotation(max_bytes=200, backup_count=2)
+        first = self.backend.file_handler(path, formatter=logging.Formatter("%(message)s"), rotation=rotation)
+        second = self.backend.file_handler(path, formatter=logging.Formatter("%(message)s"), rotation=rotation)
+        self.assertIs(first.target, second.target)
+        self.logger.addHandler(first)
+
+        for index in range(30):
+            self.logger.info("mensagem numero %02d", index)
+        first.close()
+        first.close()
+        self.backend.flush()
+
+        self.assertTrue(path.with_name("rotating.log.1").exists())
+        self.assertIsNotNone(second.target.stream)
+        second.close()
+        self.backend.flush()
+        self.assertIsNone(second.target.stream)
+
+    def test_write_mode_truncates_previous_content(self) -> None:
+        path = Path(self.temp_dir.name) / "debug_log.txt"
+        path.write_text("sessao anterior\n", encoding="utf-8")
+
+        self.logger.addHandler(self.backend.file_handler(path, formatter=logging.Formatter("%(message)s"), mode="w"))
+        self.logger.info("nova sessao")
+        self.backend.shutdown()
+
+        self.assertEqual(path.read_text(encoding="utf-8"), "nova sessao\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from unittest.mock import patch
+
+from myagilekit.core import probes
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ProbeCacheTests(unittest.TestCase):
+    def test_command_lookups_are_memoized_until_ttl_expires(self) -> None:
+        clock = FakeClock()
+        cache = probes.ProbeCache(ttl=10, clock=clock)
+
+        with patch.object(probes.shutil, "which", return_value="/usr/bin/ffmpeg") as which:
+            self.assertEqual(cache.which("ffmpeg"), "/usr/bin/ffmpeg")
+            self.assertEqual(cache.which("ffmpeg"), "/usr/bin/ffmpeg")
+            self.assertEqual(which.call_count, 1)
+
+            clock.now = 11
+            cache.which("ffmpeg")
+            self.assertEqual(which.call_count, 2)
+
+    def test_invalidate_forces_new_probe(self) -> None:
+        cache = probes.ProbeCache(ttl=60)
+
+        with patch.object(probes, "_find_module", return_value=False) as find_module:
+            self.assertFalse(cache.module_available("missing_module"))
+            cache.module_available("missing_module")
+            cache.invalidate()
+            cache.module_available("missing_module")
+
+        self.assertEqual(find_module.call_count, 2)
+
+    def test_cache_is_keyed_by_path_environment(self) -> None:
+        cache = probes.ProbeCache(ttl=60)
+
+        with patch.object(probes.shutil, "which", side_effect=["/a/bash", "/b/bash"]) as which:
+            with patch.dict(probes.os.environ, {"PATH": "/a"}):
+                self.assertEqual(cache.which("bash"), "/a/bash")
+            with patch.dict(probes.os.environ, {"PATH": "/b"}):
+                self.assertEqual(cache.which("bash"), "/b/bash")
+
+        self.assertEqual(which.call_count, 2)
+
+    def test_interpreter_probe_reports_many_modules_in_one_run(self) -> None:
+        with patch.object(probes.subprocess, "run", wraps=probes.subprocess.run) as run:
+            report = probes.probe_python_modules(sys.executable, ["json", "json", "modulo_que_nao_existe"])
+
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(list(report), ["json", "modulo_que_nao_existe"])
+        self.assertTrue(report["json"].available)
+        self.assertFalse(report["modulo_que_nao_existe"].available)
+
+    def test_interpreter_probe_marks_modules_missing_when_python_cannot_start(self) -> None:
+        report = probes.probe_python_modules("/caminho/inexistente/python", ["json"])
+
+        self.assertEqual(report, {"json": probes.ModuleReport(False)})
+
+    def test_prefetch_caches_reports_for_other_interpreters(self) -> None:
+        cache = probes.ProbeCache(ttl=60)
+        fake_report = {"yt_dlp": probes.ModuleReport(True, "1.0"), "pygame": probes.ModuleReport(False)}
+
+        with patch.object(probes, "probe_python_modules", return_value=fake_report) as probe:
+            cache.prefetch_modules(["yt_dlp", "pygame"], "/venv/bin/python")
+            self.assertTrue(cache.module_available("yt_dlp", "/venv/bin/python"))
+            self.assertFalse(cache.module_available("pygame", "/venv/bin/python"))
+
+        probe.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from myagilekit.core.history import ExecutionHistory
+from myagilekit.core.telemetry import ProcessSample, ProcessTelemetry, read_process_sample
+
+
+class ReadProcessSampleTests(unittest.TestCase):
+    def test_parses_stat_with_spaces_in_command_name(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            proc_dir = Path(temp_dir) / "42"
+            proc_dir.mkdir()
+            fields = ["S", *["0"] * 10, "250", "150", *["0"] * 20]
+            (proc_dir / "stat").write_text("42 (meu app (beta)) " + " ".join(fields), encoding="ascii")
+            (proc_dir / "statm").write_text("1000 300 10 1 0 50 0", encoding="ascii")
+
+            sample = read_process_sample(42, proc_root=Path(temp_dir))
+
+        assert sample is not None
+        self.assertEqual(sample.rss_bytes, 300 * os.sysconf("SC_PAGE_SIZE"))
+        self.assertAlmostEqual(sample.cpu_seconds, 400 / os.sysconf("SC_CLK_TCK"))
+
+    def test_missing_process_returns_none(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertIsNone(read_process_sample(42, proc_root=Path(temp_dir)))
+
+    @unittest.skipUnless(Path("/proc/self/stat").exists(), "requer /proc")
+    def test_reads_running_interpreter(self) -> None:
+        sample = read_process_sample(os.getpid())
+
+        assert sample is not None
+        self.assertGreater(sample.rss_bytes, 0)
+
+
+class ProcessTelemetryTests(unittest.TestCase):
+    def test_records_exit_and_resource_usage_in_history(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            history = ExecutionHistory(Path(temp_dir) / "history.sqlite3")
+            self.addCleanup(history.close)
+            finished = []
+            telemetry = ProcessTelemetry(
+                history,
+                interval=0.02,
+                sampler=lambda _pid: ProcessSample(2048, 0.5),
+                on_exit=finished.append,
+            )
+            command = [sys.executable, "-c", "raise SystemExit(3)"]
+            run_id = history.record_start("launch", command, "demo", launch_latency=0.01)
+
+            telemetry.track(subprocess.Popen(command), tool="demo", run_id=run_id)
+            deadline = time.monotonic() + 10
+            while not finished and time.monotonic() < deadline:
+                time.sleep(0.02)
+            telemetry.stop()
+
+            self.assertEqual([tracked.return_code for tracked in finished], [3])
+            [run] = history.recent(tool="demo")
+            self.assertEqual((run.return_code, run.peak_rss, run.cpu_seconds), (3, 2048, 0.5))
+            stats = history.tool_summary("demo", action="launch")
+            assert stats is not None
+            self.assertEqual((stats.runs, stats.failures, stats.crashes), (1, 1, 0))
+            self.assertAlmostEqual(stats.mean_launch_latency, 0.01)
+            self.assertEqual(telemetry.active(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
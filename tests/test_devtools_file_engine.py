@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+from tests.helpers import load_module_from_path
+
+file_engine = load_module_from_path(
+    "file_engine",
+    "DevTools/tools/file_engine.py",
+    extra_paths=("DevTools/tools",),
+)
+backup_vault = load_module_from_path(
+    "backup_vault",
+    "DevTools/tools/backup_vault.py",
+    extra_paths=("DevTools/tools",),
+)
+# Real module name, so spawned pool workers can import the task function.
+limpar_citacoes = load_module_from_path(
+    "limpar_citacoes",
+    "DevTools/tools/limpar_citacoes.py",
+    extra_paths=("DevTools/tools",),
+)
+file_modifier = load_module_from_path(
+    "file_modifier_for_tests",
+    "DevTools/tools/file_modifier.py",
+    extra_paths=("DevTools/tools",),
+)
+removedor_docstrings = load_module_from_path(
+    "removedor_docstrings",
+    "DevTools/tools/removedor_docstrings.py",
+    extra_paths=("DevTools/tools",),
+)
+juntar_arquivos = load_module_from_path(
+    "juntar_arquivos_for_tests",
+    "DevTools/tools/juntar_arquivos.py",
+    extra_paths=("DevTools/tools",),
+)
+corretor_streamlit = load_module_from_path(
+    "corretor_streamlit_for_tests",
+    "DevTools/tools/corretor_streamlit.py",
+    extra_paths=("DevTools/tools",),
+)
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+class FileEngineWalkTests(unittest.TestCase):
+    def test_iter_files_applies_ignore_rules_in_sorted_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _write(root / "b.py", "")
+            _write(root / "a.py", "")
+            _write(root / "notes.txt", "")
+            _write(root / "pkg" / "c.PY", "")
+            _write(root / "venv" / "skip.py", "")
+            _write(root / ".hidden" / "skip.py", "")
+            _write(root / "__pycache__" / "skip.py", "")
+
+            ignored = file_engine.parse_ignored_dirs("venv, ")
+            matcher = file_engine.extension_matcher({".py": "python"})
+            tasks = list(file_engine.iter_files(str(root), matcher, ignored))
+
+        self.assertEqual([task.rel for task in tasks], ["a.py", "b.py", str(Path("pkg") / "c.PY")])
+        self.assertEqual({task.option for task in tasks}, {"python"})
+
+    def test_iter_files_can_include_hidden_directories(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _write(root / ".hidden" / "a.md", "")
+            matcher = file_engine.extension_matcher({".md": True})
+            tasks = list(file_engine.iter_files(str(root), matcher, frozenset(), skip_hidden=False))
+
+        self.assertEqual([task.rel for task in tasks], [str(Path(".hidden") / "a.md")])
+
+    def test_extension_matcher_accepts_exact_file_names(self) -> None:
+        match = file_engine.extension_matcher({".sh": "hash"}, {"Dockerfile": "docker"})
+
+        self.assertEqual(match("Dockerfile"), "docker")
+        self.assertEqual(match("run.SH"), "hash")
+        self.assertIsNone(match("dockerfile.txt"))
+
+
+class FileEngineRunTests(unittest.TestCase):
+    def test_worker_errors_become_error_results(self) -> None:
+        tasks = [file_engine.FileTask("/nao/existe.txt", "existe.txt")]
+
+        totals = file_engine.process_files(tasks, limpar_citacoes.limpar_arquivo_task, jobs=1)
+
+        self.assertEqual((totals.done, totals.errors, totals.modified), (1, 1, 0))
+
+    def test_process_pool_matches_serial_results(self) -> None:
+        count = file_engine.PARALLEL_MIN_FILES + 8
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for index in range(count):
+                body = "texto [cite: 1] fim" if index % 2 else "sem marcas"
+                _write(root / f"f{index:03}.md", body)
+
+            matcher = file_engine.extension_matcher({".md": True})
+            tasks = list(file_engine.iter_files(str(root), matcher))
+            results = list(file_engine.map_tasks(limpar_citacoes.limpar_arquivo_task, tasks, jobs=2, ordered=True))
+
+            self.assertEqual([result.rel for result in results], [task.rel for task in tasks])
+            self.assertEqual(sum(1 for result in results if result.status == file_engine.STATUS_MODIFIED), count // 2)
+            self.assertEqual((root / "f001.md").read_text(encoding="utf-8"), "texto  fim")
+            self.assertTrue((root / "f001.md.bak").exists())
+            self.assertFalse((root / "f000.md.bak").exists())
+
+    def test_file_modifier_worker_backs_up_and_rewrites(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _write(Path(tmp) / "x.js", "let a = 1; // nota\n")
+            task = file_engine.FileTask(str(path), "x.js", ("c_style", False))
+
+            result = file_modifier.clean_file_task(task)
+
+            self.assertEqual(result.status, file_engine.STATUS_MODIFIED)
+            self.assertEqual(path.read_text(encoding="utf-8"), "let a = 1; \n")
+            self.assertEqual(Path(result.backup).read_text(encoding="utf-8"), "let a = 1; // nota\n")
+
+    def test_corretor_worker_reports_substitution_counts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _write(
+                Path(tmp) / "app.py",
+                "st.button(use_container_width=True)\nst.table(use_container_width = False)\n",
+            )
+
+            result = corretor_streamlit.corrigir_arquivo_task(file_engine.FileTask(str(path), "app.py"))
+
+            self.assertEqual(result.detail, (1, 1))
+            self.assertIn("width='stretch'", path.read_text(encoding="utf-8"))
+
+
+class AtomicWriteTests(unittest.TestCase):
+    def test_backup_is_the_original_file_and_mode_is_kept(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _write(Path(tmp) / "a.txt", "antigo")
+            path.chmod(0o640)
+            original_inode = path.stat().st_ino
+
+            backup = file_engine.write_with_backup(str(path), "novo")
+
+            self.assertEqual(path.read_text(encoding="utf-8"), "novo")
+            self.assertEqual(Path(backup).read_text(encoding="utf-8"), "antigo")
+            self.assertEqual(Path(backup).stat().st_ino, original_inode)
+            self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+            self.assertEqual(sorted(os.listdir(tmp)), ["a.txt", "a.txt.bak"])
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks indisponiveis")
+    def test_symlinked_file_is_written_through(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            target = _write(Path(tmp) / "real" / "a.txt", "antigo")
+            link = Path(tmp) / "a.txt"
+            link.symlink_to(target)
+
+            backup = file_engine.write_with_backup(str(link), "novo")
+
+            self.assertTrue(link.is_symlink())
+            self.assertEqual(target.read_text(encoding="utf-8"), "novo")
+            self.assertEqual(backup, os.path.realpath(target) + ".bak")
+            self.assertEqual(Path(backup).read_text(encoding="utf-8"), "antigo")
+            self.assertEqual(sorted(os.listdir(tmp)), ["a.txt", "real"])
+
+    def test_failed_write_leaves_source_untouched(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _write(Path(tmp) / "a.txt", "antigo")
+
+            with self.assertRaises(UnicodeEncodeError):
+                file_engine.write_with_backup(str(path), "novo \ud800")
+
+            self.assertEqual(path.read_text(encoding="utf-8"), "antigo")
+            self.assertEqual(os.listdir(tmp), ["a.txt"])
+
+
+class BackupVaultTests(unittest.TestCase):
+    def _run(self, root: Path, vault: Path):
+        matcher = file_engine.extension_matcher({".md": True})
+        tasks = file_engine.iter_files(str(root), matcher)
+        backup_run = backup_vault.BackupRun("limpar_citacoes", str(vault), source=str(root))
+        file_engine.process_files(tasks, limpar_citacoes.limpar_arquivo_task, jobs=1, backup_run=backup_run)
+        return backup_run
+
+    def test_run_stores_deduplicated_originals_and_restores_them(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root, vault = Path(tmp) / "src", Path(tmp) / "vault"
+            body = "texto [cite: 1] fim\n" * 50
+            for name in ("a.md", "b.md", "c.md"):
+                _write(root / name, body)
+            _write(root / "limpo.md", "sem marcas")
+            (root / "a.md").chmod(0o640)
+
+            backup_run = self._run(root, vault)
+
+            self.assertEqual(len(backup_run.entries), 3)
+            self.assertEqual(list(root.rglob("*.bak")), [])
+            objects = list((vault / "objects").rglob("*.zz"))
+            self.assertEqual(len(objects), 1)
+            self.assertLess(objects[0].stat().st_size, len(body))
+
+            restored, undo_id = backup_vault.restore_run(backup_run.id, str(vault))
+
+            self.assertEqual(len(restored), 3)
+            self.assertEqual((root / "b.md").read_text(encoding="utf-8"), body)
+            self.assertEqual((root / "a.md").stat().st_mode & 0o777, 0o640)
+            self.assertEqual((root / "limpo.md").read_text(encoding="utf-8"), "sem marcas")
+
+            backup_vault.restore_run(undo_id, str(vault))
+            self.assertEqual((root / "b.md").read_text(encoding="utf-8"), "texto  fim\n" * 50)
+
+    def test_run_without_changes_writes_no_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root, vault = Path(tmp) / "src", Path(tmp) / "vault"
+            _write(root / "limpo.md", "sem marcas")
+
+            self._run(root, vault)
+
+            self.assertEqual(backup_vault.list_runs(str(vault)), [])
+
+    def test_restore_with_missing_object_changes_nothing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root, vault = Path(tmp) / "src", Path(tmp) / "vault"
+            _write(root / "a.md", "um [cite: 1]")
+            _write(root / "b.md", "dois [cite: 2]")
+            backup_run = self._run(root, vault)
+            missing = backup_run.entries[-1]["digest"]
+            Path(backup_vault.object_path(str(vault), missing)).unlink()
+
+            with self.assertRaises(ValueError):
+                backup_vault.restore_run(backup_run.id, str(vault))
+
+            self.assertEqual((root / "a.md").read_text(encoding="utf-8"), "um ")
+            self.assertEqual((root / "b.md").read_text(encoding="utf-8"), "dois ")
+            self.assertEqual(len(backup_vault.list_runs(str(vault))), 1)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                code = backup_vault.main(["--cofre", str(vault), "restaurar", backup_run.id])
+            self.assertEqual(code, 1)
+            self.assertIn("Erro:", output.getvalue())
+
+    def test_restore_uses_the_first_backup_of_a_file_touched_twice(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            vault = Path(tmp) / "vault"
+            path = _write(Path(tmp) / "a.txt", "original")
+            backup_run = backup_vault.BackupRun("teste", str(vault))
+            with file_engine.backups_to_vault(str(vault)):
+                backup_run.add(file_engine.write_with_backup(str(path), "primeira"))
+                backup_run.add(file_engine.write_with_backup(str(path), "segunda"))
+            backup_run.close()
+
+            backup_vault.restore_run(backup_run.id, str(vault))
+
+            self.assertEqual(path.read_text(encoding="utf-8"), "original")
+
+    def test_prune_keeps_objects_of_remaining_runs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root, vault = Path(tmp) / "src", Path(tmp) / "vault"
+            _write(root / "a.md", "um [cite: 1]")
+            old_run = self._run(root, vault)
+            _write(root / "a.md", "dois [cite: 2]")
+            new_run = self._run(root, vault)
+
+            removed_runs, removed_objects = backup_vault.prune(str(vault), keep=1)
+
+            self.assertEqual((removed_runs, removed_objects), (1, 1))
+            self.assertEqual([run["id"] for run in backup_vault.list_runs(str(vault))], [new_run.id])
+            with self.assertRaises(ValueError):
+                backup_vault.restore_run(old_run.id, str(vault))
+            backup_vault.restore_run(new_run.id, str(vault))
+            self.assertEqual((root / "a.md").read_text(encoding="utf-8"), "dois [cite: 2]")
+
+
+class CleanCacheTests(unittest.TestCase):
+    def _run(self, root: Path, cache_dir: Path):
+        matcher = file_engine.extension_matcher({".md": True})
+        tasks = file_engine.iter_files(str(root), matcher)
+        cache = file_engine.CleanCache("limpar_citacoes", cache_dir=str(cache_dir))
+        return file_engine.process_files(tasks, limpar_citacoes.limpar_arquivo_task, jobs=1, cache=cache)
+
+    def test_repeat_run_skips_clean_files_until_they_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root, cache_dir = Path(tmp) / "src", Path(tmp) / "cache"
+            clean = _write(root / "limpo.md", "nada aqui")
+            _write(root / "sujo.md", "texto [cite: 2]")
+
+            first = self._run(root, cache_dir)
+            second = self._run(root, cache_dir)
+            _write(clean, "agora [cite: 3]")
+            third = self._run(root, cache_dir)
+
+        self.assertEqual((first.cached, first.modified, first.unchanged), (0, 1, 1))
+        # sujo.md was rewritten in the first run, so it is checked once more and then cached.
+        self.assertEqual((second.cached, second.done), (1, 1))
+        self.assertEqual((third.cached, third.modified), (1, 1))
+
+    def test_touched_file_with_same_content_stays_cached(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root, cache_dir = Path(tmp) / "src", Path(tmp) / "cache"
+            path = _write(root / "limpo.md", "nada aqui")
+            self._run(root, cache_dir)
+
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+            totals = self._run(root, cache_dir)
+
+        self.assertEqual((totals.cached, totals.done), (1, 0))
+
+    def test_cache_entry_is_bound_to_task_option(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _write(Path(tmp) / "a.md", "nada")
+            cache = file_engine.CleanCache("teste", cache_dir=str(Path(tmp) / "cache"))
+            task = file_engine.FileTask(str(path), "a.md", ("python", False))
+            _text, stamp = file_engine.read_text(str(path))
+            cache.record(task, file_engine.FileResult(task.path, task.rel, file_engine.STATUS_UNCHANGED, stamp=stamp))
+
+            self.assertTrue(cache.is_clean(task))
+            self.assertFalse(cache.is_clean(file_engine.FileTask(str(path), "a.md", ("python", True))))
+
+
+class DocstringRemoverCliTests(unittest.TestCase):
+    def test_cli_processes_tree_in_process_pool(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for index in range(file_engine.PARALLEL_MIN_FILES):
+                _write(root / "pkg" / f"m{index:02}.py", f'def f{index}():\n    """Doc."""\n    return {index}\n')
+            _write(root / "pkg" / "sql.py", 'def q():\n    """SELECT id FROM t WHERE x"""\n')
+            _write(root / "pkg" / "plain.py", "x = 1  # sem docstring\n")
+            _write(root / "venv" / "lib.py", 'def g():\n    """Doc."""\n')
+
+            vault = root / "vault"
+            code = removedor_docstrings.main(
+                [str(root), "--jobs", "2", "--log", str(root / "run.log"), "--sem-cache", "--cofre", str(vault)]
+            )
+
+            self.assertEqual(code, 0)
+            self.assertEqual((root / "pkg" / "m03.py").read_text(encoding="utf-8"), "def f3():\n    return 3\n")
+            self.assertIn("SELECT id FROM t", (root / "pkg" / "sql.py").read_text(encoding="utf-8"))
+            self.assertEqual(list(root.rglob("*.bak")), [])
+            (run,) = backup_vault.list_runs(str(vault))
+            paths = {entry["path"] for entry in run["files"]}
+            self.assertIn(str(root / "pkg" / "m03.py"), paths)
+            self.assertNotIn(str(root / "pkg" / "plain.py"), paths)
+            self.assertNotIn(str(root / "venv" / "lib.py"), paths)
+
+
+class DocstringSpanRemovalTests(unittest.TestCase):
+    def test_span_mode_cuts_only_docstrings_and_keeps_formatting(self) -> None:
+        source = (
+            '"""Modulo."""\r\n'
+            "import os  # comentario\r\n"
+            "\r\n"
+            "def f(a,\r\n"
+            "      b):\r\n"
+            "    '''Só a docstring.'''\r\n"
+            "\r\n"
+            "def g(): 'Doc.'; return {'a':1}\r\n"
+            "\r\n"
+            "def sql():\r\n"
+            '    """SELECT id FROM t WHERE x"""\r\n'
+        )
+
+        output = removedor_docstrings.remove_python_docstrings(source, mode=removedor_docstrings.MODE_SPAN)
+
+        self.assertEqual(
+            output,
+            "import os  # comentario\r\n"
+            "\r\n"
+            "def f(a,\r\n"
+            "      b):\r\n"
+            "    pass\r\n"
+            "\r\n"
+            "def g(): return {'a':1}\r\n"
+            "\r\n"
+            "def sql():\r\n"
+            '    """SELECT id FROM t WHERE x"""\r\n',
+        )
+
+    def test_span_mode_leaves_files_without_docstrings_untouched(self) -> None:
+        source = "x   =  1\n\n\ndef f(): return x\n"
+
+        output = removedor_docstrings.remove_python_docstrings(source, mode=removedor_docstrings.MODE_SPAN)
+
+        self.assertEqual(output, source)
+
+    def test_docstring_only_module_is_left_as_is(self) -> None:
+        source = '"""Pacote de utilitarios."""\n'
+
+        for mode in (removedor_docstrings.MODE_SPAN, removedor_docstrings.MODE_UNPARSE):
+            with self.subTest(mode=mode):
+                self.assertEqual(removedor_docstrings.remove_python_docstrings(source, mode=mode).strip(), source.strip())
+
+
+class CitationCleanerTests(unittest.TestCase):
+    def test_files_without_cite_bytes_are_not_decoded(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            plain = _write(Path(tmp) / "plain.md", "sem marcadores aqui\n")
+            marked = _write(Path(tmp) / "marked.md", "antes [CITE: 4] depois\n")
+
+            plain_text, plain_stamp = limpar_citacoes.ler_se_tiver_marcador(str(plain))
+            marked_text, _stamp = limpar_citacoes.ler_se_tiver_marcador(str(marked))
+            _text, read_stamp = file_engine.read_text(str(plain))
+
+        self.assertIsNone(plain_text)
+        self.assertEqual(plain_stamp, read_stamp)
+        self.assertEqual(marked_text, "antes [CITE: 4] depois\n")
+
+    def test_cli_cleans_folder_with_jobs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for index in range(file_engine.PARALLEL_MIN_FILES + 2):
+                _write(root / "docs" / f"n{index:02}.md", f"nota {index} [cite_start]texto[cite_end]\n")
+            _write(root / "docs" / "vazio.md", "")
+
+            vault = Path(tmp) / "vault"
+            argv = ["limpar_citacoes.py", "-p", str(root / "docs"), "-j", "2", "--sem-cache", "--cofre", str(vault)]
+            with unittest.mock.patch.object(sys, "argv", argv), contextlib.redirect_stdout(io.StringIO()) as output:
+                limpar_citacoes.main()
+
+            self.assertEqual((root / "docs" / "n07.md").read_text(encoding="utf-8"), "nota 7 texto\n")
+            self.assertIn(f"Total de arquivos modificados: {file_engine.PARALLEL_MIN_FILES + 2}", output.getvalue())
+            (run,) = backup_vault.list_runs(str(vault))
+            self.assertEqual(len(run["files"]), file_engine.PARALLEL_MIN_FILES + 2)
+
+
+class StreamingConcatenationTests(unittest.TestCase):
+    def test_copy_keeps_valid_utf8_bytes_across_small_chunks(self) -> None:
+        data = "ação\r\nlinha\n".encode() * 10
+
+        for chunk_size in (1, 2, 5):
+            with self.subTest(chunk_size=chunk_size):
+                out = io.BytesIO()
+                written = juntar_arquivos.copy_text_stream(io.BytesIO(data), out, chunk_size)
+                self.assertEqual((out.getvalue(), written), (data, len(data)))
+
+    def test_copy_drops_invalid_bytes_like_text_mode(self) -> None:
+        data = b"inicio \xff\xfe fim " + "ção".encode()
+        out = io.BytesIO()
+
+        juntar_arquivos.copy_text_stream(io.BytesIO(data), out, 4)
+
+        self.assertEqual(out.getvalue(), "inicio  fim ção".encode())
+
+    def test_manifest_offsets_point_at_each_file_content(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _write(root / "z.py", "print('z')\n")
+            _write(root / "a" / "b.py", "ção = 1\n")
+            matcher = file_engine.extension_matcher({".py": True})
+            tasks = juntar_arquivos.sort_tasks_by_path(file_engine.iter_files(str(root), matcher))
+
+            spans = juntar_arquivos.concatenate_files(tasks, root / "out.txt", chunk_size=3)
+            raw = (root / "out.txt").read_bytes()
+
+        self.assertEqual([task.rel for task in tasks], [str(Path("a") / "b.py"), "z.py"])
+        self.assertEqual([raw[offset:offset + size] for offset, size in spans], ["ção = 1\n".encode(), b"print('z')\n"])
+        header = raw.decode("utf-8").splitlines()
+        self.assertEqual(header[1].split()[1:], [f"{spans[0][0]:012d}", f"{spans[0][1]:012d}", str(Path("a") / "b.py")])
+
+
+if __name__ == "__main__":
+    unittest.main()
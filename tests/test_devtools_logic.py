@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import ast
+import logging
+import re
+import timeit
+import tokenize
 import unittest
 
 from tests.helpers import load_module_from_path
@@ -20,6 +24,11 @@ file_modifier = load_module_from_path(
     "DevTools/tools/file_modifier.py",
     extra_paths=("DevTools/tools",),
 )
+gui_utils = load_module_from_path(
+    "gui_utils_for_tests",
+    "DevTools/tools/gui_utils.py",
+    extra_paths=("DevTools/tools",),
+)
 corretor_streamlit = load_module_from_path(
     "corretor_streamlit_for_tests",
     "DevTools/tools/corretor_streamlit.py",
@@ -67,6 +76,83 @@ def run():
         self.assertNotIn("block", c_output)
         self.assertIn("int y;", c_output)
 
+    def test_python_comment_removal_keeps_the_rest_of_the_source_verbatim(self) -> None:
+        source = (
+            "#!/usr/bin/env python\n"
+            "# -*- coding: utf-8 -*-\n"
+            "# cabecalho\n"
+            "x  =  (1,   # um\n"
+            "      2)\n"
+            "s = '# fica'  # sai\n"
+            "if x:\n"
+            "\tpass\t# tab\n"
+            "y = 1"
+        )
+
+        output = file_modifier.remove_python_comments(source)
+
+        self.assertEqual(
+            output,
+            "#!/usr/bin/env python\n"
+            "# -*- coding: utf-8 -*-\n"
+            "\n"
+            "x  =  (1,\n"
+            "      2)\n"
+            "s = '# fica'\n"
+            "if x:\n"
+            "\tpass\n"
+            "y = 1",
+        )
+
+    def test_python_comment_removal_reports_tokenizer_errors(self) -> None:
+        with self.assertRaises(tokenize.TokenError):
+            file_modifier.remove_python_comments('x = """sem fim\n# nota\n')
+
+    def test_comment_lexers_keep_comment_markers_inside_literals(self) -> None:
+        cases = {
+            "c_style": (
+                'u = "http://x.com"; // c\nchar q = \'"\'; /* a */ s = "a\\"//b";\n',
+                'u = "http://x.com"; \nchar q = \'"\';  s = "a\\"//b";\n',
+            ),
+            "css_style": ("a { background: url(http://x/y.png); } /* c */\n", "a { background: url(http://x/y.png); } \n"),
+            "hash_style": ('echo "a # b" # c\nn=${#arr}\nkey: a#b # c\n', 'echo "a # b" \nn=${#arr}\nkey: a#b \n'),
+            "sql_style": ("SELECT '--no', 'it''s' -- c\n/* b */ FROM t;\n", "SELECT '--no', 'it''s' \n FROM t;\n"),
+            "doubledash_style": (
+                'local s = "a -- b" -- c\n--[==[ longo\n]] ]==]\nx = [[ -- keep ]]\n',
+                'local s = "a -- b" \n\nx = [[ -- keep ]]\n',
+            ),
+            "quote_style": ("x = \"it's\" ' c\n", "x = \"it's\" \n"),
+            "batch_style": ("@echo off\n  REM c\nREMARK x\n:: c\n", "@echo off\n\nREMARK x\n\n"),
+            "percent_style": ("50\\% feito % c\ndisp('50%'); a = b'; % c\n", "50\\% feito \ndisp('50%'); a = b'; \n"),
+            "xml_style": ("<a><![CDATA[ <!-- x --> ]]><!-- c --></a>\n", "<a><![CDATA[ <!-- x --> ]]></a>\n"),
+        }
+
+        for strategy, (source, expected) in cases.items():
+            with self.subTest(strategy=strategy):
+                self.assertEqual(file_modifier.clean_content(source, strategy), expected)
+
+    def test_unterminated_literal_only_protects_its_own_line(self) -> None:
+        source = "char *s = \"aberta // c1\nint x; // c2\n/* sem fim\nint y;\n"
+
+        self.assertEqual(
+            file_modifier.clean_content(source, "c_style"),
+            "char *s = \"aberta // c1\nint x; \n",
+        )
+
+    def test_unterminated_openers_do_not_rescan_the_file(self) -> None:
+        cases = {
+            "c_style": "/* x\n",
+            "doubledash_style": "--[[ x\n",
+            "xml_style": "<!-- x\n",
+            "sql_style": "' x\n",
+        }
+
+        for strategy, line in cases.items():
+            with self.subTest(strategy=strategy):
+                source = line * 20000
+                elapsed = min(timeit.repeat(lambda s=source, st=strategy: file_modifier.clean_content(s, st), number=1, repeat=3))
+                self.assertLess(elapsed, 0.5)
+
     def test_streamlit_replacements_are_consistent(self) -> None:
         source = "st.image(img, use_container_width=True)\nst.dataframe(df, use_container_width=False)\n"
 
@@ -84,5 +170,65 @@ def run():
         self.assertNotIn("use_container_width", updated)
 
 
+
+def _legacy_is_sql_string(text: str) -> bool:
+    fragment = text.upper()[:200]
+    found = sum(1 for keyword in removedor_docstrings.SQL_KEYWORDS if re.search(r"\b" + keyword + r"\b", fragment))
+    return found >= 2
+
+
+class SqlDocstringDetectionTests(unittest.TestCase):
+    def test_single_pass_matcher_agrees_with_per_keyword_search(self) -> None:
+        remover = removedor_docstrings.DocstringRemover()
+        samples = [
+            "SELECT id FROM users",
+            "left join only",
+            "LEFT  JOIN with two spaces",
+            "INNER JOIN",
+            "Return the value as int.",
+            "group by on",
+            "Set up the table view.",
+            "x" * 250 + " SELECT id FROM t",
+            "Documentacao comum.",
+        ]
+
+        for sample in samples:
+            with self.subTest(sample=sample):
+                self.assertEqual(remover._is_sql_string(sample), _legacy_is_sql_string(sample))
+
+    def test_single_pass_matcher_is_faster_on_docstring_corpus(self) -> None:
+        remover = removedor_docstrings.DocstringRemover()
+        corpus = ["Compute the total.\n\n    Args:\n        value: the input value as int.\n" * 3] * 500
+
+        legacy = min(timeit.repeat(lambda: [_legacy_is_sql_string(doc) for doc in corpus], number=1, repeat=3))
+        current = min(timeit.repeat(lambda: [remover._is_sql_string(doc) for doc in corpus], number=1, repeat=3))
+
+        self.assertLess(current * 2, legacy)
+
+class GuiLogBatchTests(unittest.TestCase):
+    def test_quiet_lines_are_summarised_after_the_per_tick_limit(self) -> None:
+        entries = [(logging.INFO, f"[SEM MUDANÇAS] arquivo_{index}.py") for index in range(3412 + 5)]
+        entries.append((logging.INFO, "[MODIFICADO] principal.py"))
+
+        lines = gui_utils.batch_log_lines(entries, max_lines=100, quiet_per_tick=5)
+
+        self.assertEqual(lines[:5], [f"[SEM MUDANÇAS] arquivo_{index}.py" for index in range(5)])
+        self.assertEqual(lines[5:], ["[MODIFICADO] principal.py", "+3,412 arquivos sem mudanças"])
+
+    def test_warnings_are_never_suppressed(self) -> None:
+        entries = [(logging.WARNING, "[SEM MUDANÇAS] mas com aviso")] * 3
+
+        self.assertEqual(len(gui_utils.batch_log_lines(entries, quiet_per_tick=1)), 3)
+
+    def test_batch_is_capped_to_the_widget_size(self) -> None:
+        entries = [(logging.INFO, f"linha {index}") for index in range(50)]
+
+        lines = gui_utils.batch_log_lines(entries, max_lines=10)
+
+        self.assertEqual(len(lines), 10)
+        self.assertEqual(lines[0], "+41 linhas omitidas (veja o arquivo de log)")
+        self.assertEqual(lines[-1], "linha 49")
+
+
 if __name__ == "__main__":
     unittest.main()
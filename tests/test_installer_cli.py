@@ -37,6 +37,41 @@ class InstallerCliTests(unittest.TestCase):
         self.assertEqual(status, 1)
         self.assertIn("missing", output.getvalue())
 
+    def test_status_items_probe_python_modules_in_a_single_batch(self) -> None:
+        reports = {
+            "tkinter": installer_module.ModuleReport(True),
+            "yt_dlp": installer_module.ModuleReport(True, "2026.2.4"),
+            "pygame": installer_module.ModuleReport(False),
+            "ruff": installer_module.ModuleReport(True, "0.15.12"),
+        }
+
+        with patch.object(installer_module, "probe_python_modules", return_value=reports) as probe:
+            items = {item.name: item for item in installer_module.status_items("/fake/python")}
+
+        probe.assert_called_once()
+        self.assertEqual(items["yt-dlp"].status, "OK")
+        self.assertIn("2026.2.4", items["yt-dlp"].detail)
+        self.assertEqual(items["pygame"].status, "Pendente")
+
+    def test_install_reuses_one_batched_module_report_for_system_packages(self) -> None:
+        reports = {module: installer_module.ModuleReport(module != "tkinter") for _, module in installer_module.CHECKED_MODULES}
+        steps: list[tuple[str, list[str]]] = []
+
+        with (
+            patch.object(installer_module, "ensure_project_layout"),
+            patch.object(installer_module, "_emit"),
+            patch.object(installer_module.platform, "system", return_value="Linux"),
+            patch.object(installer_module.shutil, "which", return_value="/usr/bin/tool"),
+            patch.object(installer_module, "probe_python_modules", return_value=reports) as probe,
+            patch.object(installer_module, "python_module_available", side_effect=AssertionError("probe isolado")),
+            patch.object(installer_module, "_run_step", side_effect=lambda title, command, *_: steps.append((title, command))),
+        ):
+            log_file = installer_module.PROJECT_ROOT / "logs" / "install" / "teste.log"
+            installer_module.run_install(install_system=True, run_tests=False, log_file=log_file)
+
+        probe.assert_called_once()
+        self.assertIn(("Instalando dependencias de sistema indispensaveis", ["sudo", "apt-get", "install", "-y", "python3-tk"]), steps)
+
     def test_install_logs_are_written_under_install_subfolder(self) -> None:
         log_file = installer_module.new_install_log_path()
 
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import unittest
+
+from myagilekit.core.registry import ToolDefinition
+from myagilekit.manager.gui import probe_tool_status
+
+TOOL = ToolDefinition("a", "A", "Midia", "a", "a.py", requires_modules=("yt_dlp",))
+
+
+class ProbeToolStatusTests(unittest.TestCase):
+    def test_any_check_failure_becomes_a_problem(self) -> None:
+        errors = (
+            subprocess.TimeoutExpired(["python"], 30),
+            json.JSONDecodeError("resposta invalida", "", 0),
+            KeyError("yt_dlp"),
+        )
+        for error in errors:
+
+            def failing_check(_tool: ToolDefinition, error: Exception = error) -> tuple[bool, list[str]]:
+                raise error
+
+            with self.subTest(error=type(error).__name__):
+                ready, [problem] = probe_tool_status(TOOL, failing_check)
+
+                self.assertFalse(ready)
+                self.assertTrue(problem.startswith("falha ao verificar: "))
+
+    def test_check_result_is_passed_through(self) -> None:
+        self.assertEqual(probe_tool_status(TOOL, lambda _tool: (True, [])), (True, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
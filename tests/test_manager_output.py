@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import queue
+import unittest
+
+from myagilekit.manager.output import (
+    DRAIN_BACKLOG_MS,
+    DRAIN_FAST_MS,
+    DRAIN_IDLE_MS,
+    OutputBuffer,
+    collect_output,
+    next_drain_interval,
+)
+
+
+class OutputBufferTests(unittest.TestCase):
+    def test_keeps_only_the_last_lines_and_reports_evictions(self) -> None:
+        buffer = OutputBuffer(max_lines=3)
+
+        self.assertEqual(buffer.append("a\nb\n"), 0)
+        self.assertEqual(buffer.append("c\nd\ne\n"), 2)
+
+        self.assertEqual(buffer.text(), "c\nd\ne\n")
+        self.assertEqual(buffer.dropped, 2)
+
+    def test_partial_lines_are_joined_across_chunks(self) -> None:
+        buffer = OutputBuffer(max_lines=2)
+
+        buffer.append("pri")
+        buffer.append("meira\nseg")
+
+        self.assertEqual(buffer.text(), "primeira\nseg")
+        self.assertEqual(len(buffer), 2)
+        self.assertEqual(buffer.append("unda\nterceira\n"), 1)
+        self.assertEqual(buffer.text(), "segunda\nterceira\n")
+
+    def test_eviction_count_matches_text_widget_trimming(self) -> None:
+        buffer = OutputBuffer(max_lines=5)
+        shown = ""
+        for index in range(40):
+            chunk = f"linha {index}\n" if index % 3 else f"linha {index} sem fim "
+            shown += chunk
+            evicted = buffer.append(chunk)
+            if evicted:
+                shown = "".join(shown.splitlines(keepends=True)[evicted:])
+
+        self.assertEqual(shown, buffer.text())
+
+    def test_rejects_non_positive_limit(self) -> None:
+        with self.assertRaises(ValueError):
+            OutputBuffer(max_lines=0)
+
+
+class OutputDrainTests(unittest.TestCase):
+    def test_collect_output_joins_chunks_per_job_and_keeps_finish_markers(self) -> None:
+        source: queue.Queue[tuple[int, str | None]] = queue.Queue()
+        for item in ((1, "a\n"), (2, "x\n"), (1, "b\n"), (1, None), (2, "y\n")):
+            source.put(item)
+
+        batch = collect_output(source)
+
+        self.assertEqual(batch.chunks, {1: "a\nb\n", 2: "x\ny\n"})
+        self.assertEqual(batch.finished, [1])
+        self.assertEqual(batch.count, 5)
+        self.assertFalse(batch.backlog)
+
+    def test_collect_output_caps_work_per_tick(self) -> None:
+        source: queue.Queue[tuple[int, str | None]] = queue.Queue()
+        for index in range(10):
+            source.put((1, f"{index}\n"))
+
+        first = collect_output(source, max_items=6)
+        second = collect_output(source, max_items=6)
+
+        self.assertEqual(first.count, 6)
+        self.assertTrue(first.backlog)
+        self.assertEqual(second.chunks, {1: "6\n7\n8\n9\n"})
+        self.assertFalse(second.backlog)
+
+    def test_interval_adapts_to_load(self) -> None:
+        self.assertEqual(next_drain_interval(DRAIN_IDLE_MS, 10, backlog=True), DRAIN_BACKLOG_MS)
+        self.assertEqual(next_drain_interval(DRAIN_IDLE_MS, 10, backlog=False), DRAIN_FAST_MS)
+
+        interval = DRAIN_FAST_MS
+        for _ in range(10):
+            interval = next_drain_interval(interval, 0, backlog=False)
+        self.assertEqual(interval, DRAIN_IDLE_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from myagilekit.core import process_runner
+
+CHILD_SCRIPT = """
+import sys
+out = sys.stdout.buffer
+out.write(b"linha 1\\r\\nlinha 2\\n")
+out.write("ação".encode("utf-8")[:2])
+out.flush()
+out.write("ação".encode("utf-8")[2:] + b"\\n")
+for index in range(2000):
+    out.write(b"saida %d\\n" % index)
+"""
+
+
+class ProcessRunnerTests(unittest.TestCase):
+    def test_run_streamed_decodes_chunks_and_writes_complete_log(self) -> None:
+        chunks: list[str] = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "logs" / "run.log"
+
+            return_code = process_runner.run_streamed(
+                [sys.executable, "-c", CHILD_SCRIPT],
+                cwd=Path(temp_dir),
+                output=chunks.append,
+                log_file=log_file,
+                encoding="utf-8",
+            )
+            log_text = log_file.read_text(encoding="utf-8")
+
+        streamed = "".join(chunks)
+        self.assertEqual(return_code, 0)
+        self.assertEqual(log_text, streamed)
+        self.assertTrue(streamed.startswith("$ "))
+        self.assertIn("linha 1\nlinha 2\nação\n", streamed)
+        self.assertIn("saida 1999\n", streamed)
+        self.assertLess(len(chunks), 2002)
+
+    def test_buffered_log_writer_flushes_by_size(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "buffered.log"
+            writer = process_runner.BufferedLogWriter(log_file, flush_interval=3600, flush_bytes=10)
+
+            writer.write("12345")
+            self.assertEqual(log_file.read_text(encoding="utf-8"), "")
+            writer.write("67890")
+            self.assertEqual(log_file.read_text(encoding="utf-8"), "1234567890")
+            writer.write("x")
+            writer.close()
+
+            self.assertEqual(log_file.read_text(encoding="utf-8"), "1234567890x")
+
+    def test_buffered_log_writer_flushes_idle_output_on_a_timer(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "idle.log"
+            writer = process_runner.BufferedLogWriter(log_file, flush_interval=0.05, flush_bytes=1024)
+
+            writer.write("silencio depois")
+            self.assertEqual(log_file.read_text(encoding="utf-8"), "")
+            deadline = time.monotonic() + 2.0
+            while not log_file.read_text(encoding="utf-8") and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            self.assertEqual(log_file.read_text(encoding="utf-8"), "silencio depois")
+            writer.close()
+
+
+class ProcessSupervisorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.supervisor = process_runner.ProcessSupervisor()
+        self.addCleanup(self.supervisor.shutdown)
+
+    def test_jobs_run_concurrently_on_one_loop(self) -> None:
+        command = [sys.executable, "-c", "import time; time.sleep(0.3); print('ok')"]
+
+        started = time.perf_counter()
+        jobs = [self.supervisor.start(command) for _ in range(4)]
+        outputs = ["".join(job.stream()) for job in jobs]
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual([job.wait(5) for job in jobs], [0, 0, 0, 0])
+        self.assertEqual(outputs, ["ok\n"] * 4)
+        self.assertLess(elapsed, 1.0)
+
+    def test_timeout_and_cancel_terminate_the_child(self) -> None:
+        sleeper = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+        timed_out = self.supervisor.start(sleeper, timeout=0.2)
+        cancelled = self.supervisor.start(sleeper)
+        time.sleep(0.2)
+        cancelled.cancel()
+
+        timed_out.wait(10)
+        cancelled.wait(10)
+        self.assertEqual(timed_out.state, "timeout")
+        self.assertEqual(cancelled.state, "cancelled")
+        self.assertNotEqual(cancelled.return_code, 0)
+
+    def test_output_callback_receives_separate_streams(self) -> None:
+        received: list[tuple[str, str]] = []
+        exits: list[int | None] = []
+        script = "import sys; print('out'); print('err', file=sys.stderr)"
+
+        job = self.supervisor.start(
+            [sys.executable, "-c", script],
+            output=lambda _job, stream, text: received.append((stream, text)),
+            on_exit=lambda finished: exits.append(finished.return_code),
+            merge_stderr=False,
+        )
+        job.wait(10)
+
+        self.assertEqual("".join(text for stream, text in received if stream == "stdout"), "out\n")
+        self.assertEqual("".join(text for stream, text in received if stream == "stderr"), "err\n")
+        self.assertEqual(exits, [0])
+        with self.assertRaises(RuntimeError):
+            next(job.stream())
+
+    def test_missing_executable_marks_job_failed(self) -> None:
+        job = self.supervisor.start(["comando-que-nao-existe-myagilekit"])
+
+        self.assertIsNone(job.wait(10))
+        self.assertEqual(job.state, "failed")
+        self.assertTrue(job.error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import os
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -8,6 +11,9 @@ from tests.helpers import PROJECT_ROOT, load_module_from_path
 from tool_registry import (
     TOOL_CATALOG,
     TOOL_MANIFEST_DIR,
+    LazyToolCatalog,
+    ToolCatalog,
+    ToolDefinition,
     build_environment_check_command,
     build_launch_command,
     build_test_command,
@@ -38,6 +44,74 @@ class ToolRegistryTests(unittest.TestCase):
         self.assertEqual(len(catalog), len(manifests))
         self.assertEqual(catalog[0].identifier, "installer")
 
+    def test_lazy_catalog_reads_manifests_only_on_first_use(self) -> None:
+        catalog = LazyToolCatalog(TOOL_MANIFEST_DIR)
+
+        self.assertFalse(catalog.loaded)
+        self.assertEqual(len(catalog), len(load_tool_catalog()))
+        self.assertTrue(catalog.loaded)
+
+    def test_catalog_snapshot_is_reused_while_manifests_are_unchanged(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest_dir = Path(temp_dir) / "tools"
+            manifest_dir.mkdir()
+            snapshot = Path(temp_dir) / "snapshot.json"
+            manifest = manifest_dir / "010-demo.json"
+            manifest.write_text(
+                json.dumps(
+                    {
+                        "identifier": "demo",
+                        "name": "Demo",
+                        "group": "Teste",
+                        "description": "Ferramenta de teste.",
+                        "entrypoint": "demo.py",
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+            first = load_tool_catalog(manifest_dir, snapshot_path=snapshot)
+            self.assertTrue(snapshot.exists())
+
+            stat = manifest.stat()
+            manifest.write_text(manifest.read_text(encoding="utf-8").replace("Demo", "Omed"), encoding="utf-8")
+            os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            cached = load_tool_catalog(manifest_dir, snapshot_path=snapshot)
+
+            self.assertEqual(first, cached)
+            self.assertEqual(load_tool_catalog(manifest_dir)[0].name, "Omed")
+
+            catalog = LazyToolCatalog(manifest_dir, snapshot_path=snapshot)
+            self.assertEqual(catalog[0].name, "Demo")
+            self.assertFalse(catalog.refresh())
+
+            manifest.write_text(manifest.read_text(encoding="utf-8").replace("Omed", "Novo nome"), encoding="utf-8")
+            self.assertTrue(catalog.refresh())
+            self.assertEqual(catalog[0].name, "Novo nome")
+
+    def test_tool_catalog_indexes_identifier_group_platform_and_dependencies(self) -> None:
+        tools = (
+            ToolDefinition("a", "A", "Midia", "a", "a.py", platforms=("linux",), requires_modules=("tkinter",)),
+            ToolDefinition("b", "B", "Windows", "b", "b.bat", platforms=("win32",), requires_commands=("cmd",)),
+            ToolDefinition("c", "C", "Midia", "c", "c.py", requires_commands=("ffmpeg", "ffmpeg")),
+        )
+        catalog = ToolCatalog(tools)
+
+        self.assertIs(catalog.get("b"), tools[1])
+        self.assertIsNone(catalog.get("missing"))
+        self.assertIn("a", catalog)
+        self.assertEqual(catalog.groups(), ("Midia", "Windows"))
+        self.assertEqual(catalog.in_group("Midia"), (tools[0], tools[2]))
+        self.assertEqual(catalog.in_group("Todas"), tools)
+        self.assertEqual(catalog.for_platform("linux"), (tools[0], tools[2]))
+        self.assertEqual(catalog.requiring_module("tkinter"), (tools[0],))
+        self.assertEqual(catalog.requiring_command("ffmpeg"), (tools[2],))
+        self.assertEqual(catalog.required_commands(), ("cmd", "ffmpeg"))
+        self.assertEqual(filter_tools_by_group("Windows", catalog), (tools[1],))
+
+        with self.assertRaises(ValueError):
+            ToolCatalog((*tools, tools[0]))
+
     def test_registered_entrypoints_exist(self) -> None:
         missing = [
             f"{tool.identifier}: {tool.entrypoint}"
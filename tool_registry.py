@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 from myagilekit.core.registry import (
+    PROBE_CACHE,
     PROJECT_ROOT,
     TOOL_CATALOG,
     TOOL_MANIFEST_DIR,
+    LazyToolCatalog,
+    ProbeCache,
+    ToolCatalog,
     ToolDefinition,
     build_environment_check_command,
     build_launch_command,
@@ -16,14 +20,19 @@ from myagilekit.core.registry import (
     load_tool_catalog,
     load_tool_manifest,
     logs_directory,
+    prefetch_tool_dependencies,
     python_executable,
     tool_groups,
 )
 
 __all__ = [
+    "PROBE_CACHE",
     "PROJECT_ROOT",
     "TOOL_CATALOG",
     "TOOL_MANIFEST_DIR",
+    "LazyToolCatalog",
+    "ProbeCache",
+    "ToolCatalog",
     "ToolDefinition",
     "build_environment_check_command",
     "build_launch_command",
@@ -34,6 +43,7 @@ __all__ = [
     "load_tool_catalog",
     "load_tool_manifest",
     "logs_directory",
+    "prefetch_tool_dependencies",
     "python_executable",
     "tool_groups",
 ]
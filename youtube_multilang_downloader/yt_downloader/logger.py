@@ -1,22 +1,28 @@
 import logging
+import sys
 from pathlib import Path
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 LOGS_DIR = PROJECT_ROOT / "logs"
 
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from myagilekit.core.logging import queue_file_handler  # noqa: E402
+
 
 def log_file_path(filename):
     LOGS_DIR.mkdir(parents=True, exist_ok=True)
     return LOGS_DIR / filename
 
 def setup_logging():
-    logging.basicConfig(
-        filename=log_file_path('debug_log.txt'),
-        level=logging.DEBUG,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        filemode='w'
+    file_handler = queue_file_handler(
+        log_file_path('debug_log.txt'),
+        formatter=logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'),
+        mode='w',
     )
+    logging.basicConfig(level=logging.DEBUG, handlers=[file_handler])
     
     console = logging.StreamHandler()
     console.setLevel(logging.DEBUG)